@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``dict_from_bids_filename`` with DEBUG logging disabled.
+
+Compares the former implementation (nine eagerly formatted
+``log0.debug(f"...")`` calls per filename) with the current one (messages
+built only if DEBUG is enabled).
+
+Usage::
+
+    python benchmarks/bench_bids_filename.py [n_files]
+
+"""
+
+import logging
+import pathlib
+import sys
+import timeit
+
+from nvm.aux_bids import dict_from_bids_filename
+
+
+def dict_from_bids_filename_fstrings(fn0, log0=logging.getLogger("dummy")):
+    """Former implementation (f-strings formatted even with DEBUG off)."""
+    fn0 = pathlib.Path(fn0)
+    log0.debug(f"{fn0 = }")
+    path0 = fn0.parent
+    log0.debug(f"{path0 = }")
+    name0 = fn0.name
+    log0.debug(f"{name0 = }")
+    ext = "".join(fn0.suffixes)
+    log0.debug(f"{ext = }")
+    stem0 = name0.split(".")[0]
+    log0.debug(f"{stem0 = }")
+    parts = [item for item in stem0.split("_") if len(item)]
+    log0.debug(f"{parts = }")
+    props = {item.split("-")[0]: item.split("-")[1] for item in parts if "-" in item}
+    log0.debug(f"{props = }")
+    suff = [item for item in parts if "-" not in item]
+    log0.debug(f"{suff = }")
+    tags0 = list(props.keys())
+    log0.debug(f"{tags0 = }")
+    vals0 = list(props.values())
+    log0.debug(f"{vals0 = }")
+    return dict(props=props, suff=suff, ext=ext)
+
+
+def make_filenames(n_files):
+    return [
+        f"sub-{idx % 1000:04d}/ses-{idx % 3}/func/"
+        f"sub-{idx % 1000:04d}_ses-{idx % 3}_task-rest_run-{idx % 7}_bold.nii.gz"
+        for idx in range(n_files)
+    ]
+
+
+def main(n_files=100_000):
+    filenames = make_filenames(n_files)
+    log0 = logging.getLogger("dummy")
+    log0.setLevel(logging.INFO)
+    for label, func in [
+        ("f-strings", dict_from_bids_filename_fstrings),
+        ("lazy", dict_from_bids_filename),
+    ]:
+        best = min(
+            timeit.repeat(
+                lambda: [func(fn0, log0=log0) for fn0 in filenames],
+                number=1,
+                repeat=3,
+            )
+        )
+        print(f"{label:<10s} {n_files / best:12,.0f} files/s ({best:.3f} s)")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``BidsIndex.scan`` on a synthetic BIDS-like tree.
+
+Compares a ``pathlib.Path.rglob`` loop calling ``dict_from_bids_filename``
+and ``stat`` per file (rows collected into a data frame) with
+``BidsIndex.scan`` using 1 and 8 threads. The page cache is warm, so the
+numbers show CPU cost; on network filesystems the thread pool also
+overlaps directory listing latency. Then the index is saved (SQLite),
+loaded and refreshed after adding a file to 1 % of leaf directories.
+
+Usage::
+
+    python benchmarks/bench_bids_index.py [n_subjects]
+
+"""
+
+import pathlib
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from nvm.aux_bids import BidsIndex
+from nvm.aux_bids import dict_from_bids_filename
+
+
+def make_tree(root, n_subjects):
+    """Create ``n_subjects`` x 3 sessions x 2 datatypes x 10 runs x 2 files."""
+    n_files = 0
+    for sub in range(n_subjects):
+        for ses in range(3):
+            for datatype, suffix in [("func", "bold"), ("anat", "T1w")]:
+                dir0 = root / f"sub-{sub:03d}" / f"ses-{ses}" / datatype
+                dir0.mkdir(parents=True)
+                for run in range(10):
+                    stem = f"sub-{sub:03d}_ses-{ses}_task-rest_run-{run}_{suffix}"
+                    (dir0 / f"{stem}.nii.gz").touch()
+                    (dir0 / f"{stem}.json").touch()
+                    n_files += 2
+    return n_files
+
+
+def rglob_index(root):
+    """Former approach (one ``dict_from_bids_filename`` call per path)."""
+    rows = []
+    for path in root.rglob("*"):
+        if path.is_file():
+            dict0 = dict_from_bids_filename(path)
+            stat = path.stat()
+            rows.append(
+                dict(
+                    dir=path.parent.relative_to(root).as_posix(),
+                    name=path.name,
+                    suffix="_".join(dict0["suff"]),
+                    ext=dict0["ext"],
+                    size=stat.st_size,
+                    mtime=stat.st_mtime,
+                    **dict0["props"],
+                )
+            )
+    return pd.DataFrame(rows)
+
+
+def main(n_subjects=200):
+    with tempfile.TemporaryDirectory() as dir0:
+        root = pathlib.Path(dir0)
+        n_files = make_tree(root, n_subjects)
+        for label, func in [
+            ("rglob", lambda: rglob_index(root)),
+            ("scan 1 thread", lambda: BidsIndex.scan(root, n_workers=1).df),
+            ("scan 8 threads", lambda: BidsIndex.scan(root, n_workers=8).df),
+        ]:
+            start = time.perf_counter()
+            df0 = func()
+            elapsed = time.perf_counter() - start
+            assert len(df0) == n_files
+            memory = df0.memory_usage(deep=True).sum() / 2**20
+            print(
+                f"{label:<16s} {n_files / elapsed:12,.0f} files/s"
+                f" ({elapsed:.3f} s, {memory:.1f} MiB)"
+            )
+
+        index = BidsIndex.scan(root, n_workers=8)
+        db = root.parent / f"{root.name}.sqlite"
+        leaf_dirs = [dir0 for dir0 in index.dirs if dir0.count("/") == 2]
+        for label, func in [
+            ("save", lambda: index.save(db)),
+            ("load", lambda: BidsIndex.load(db)),
+            ("refresh (none)", lambda: index.refresh(n_workers=8)),
+            ("refresh (1 %)", lambda: index.refresh(n_workers=8)),
+        ]:
+            if label == "refresh (1 %)":
+                for dir0 in leaf_dirs[:: len(leaf_dirs) // (len(leaf_dirs) // 100)]:
+                    (root / dir0 / "sub-x_new.json").touch()
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            summary = result if isinstance(result, dict) else ""
+            print(f"{label:<16s} {elapsed:12.3f} s {summary}")
+        db.unlink()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
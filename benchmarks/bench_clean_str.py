@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``clean_str`` throughput for the bundled mappings.
+
+Compares the sequential ``re.sub`` implementation (applying every rule of
+every mapping in turn, as ``clean_str`` did originally) with the compiled
+cleaner used by ``clean_str`` now, for ``CLEAN_STR_MAPPINGS_LARGE`` and
+``CLEAN_STR_MAPPINGS_HUGE``.
+
+Usage::
+
+    python benchmarks/bench_clean_str.py [n_texts]
+
+"""
+
+import re
+import sys
+import timeit
+
+from nvm.aux_str import clean_str
+from nvm.aux_str import compile_clean_str
+from nvm.aux_str import CLEAN_STR_MAPPINGS_LARGE
+from nvm.aux_str import CLEAN_STR_MAPPINGS_HUGE
+
+
+SAMPLE = (
+    "  “Quick” brown fox — jumps over\tthe ‘lazy’ dog…\n"
+    "Ｆｕｌｌｗｉｄｔｈ text, ﬁne ligatures,​ zero‍width and "
+    "‮bidi‬ controls; plain ASCII words make up most of it.  "
+)
+
+
+def clean_str_sequential(text, mappings):
+    """Reference implementation (one ``re.sub`` per rule)."""
+    text = str(text)
+    for item in mappings:
+        for key, val in item.items():
+            for pattern in val:
+                text = re.sub(pattern, key, text)
+
+    text = re.sub(r"\s\s+", " ", text)
+    return text.strip()
+
+
+def throughput(fn, texts, repeat=3):
+    """Get best throughput (MB/s) of ``fn`` applied to all texts."""
+    n_bytes = sum(len(text.encode()) for text in texts)
+    best = min(
+        timeit.repeat(lambda: [fn(text) for text in texts], number=1, repeat=repeat)
+    )
+    return n_bytes / best / 1e6
+
+
+def main(n_texts=2000):
+    texts = [f"{i} {SAMPLE}" for i in range(n_texts)]
+    # sequential reference is very slow for HUGE, use fewer texts
+    texts_small = texts[: max(1, n_texts // 100)]
+
+    for name, mappings in [
+        ("LARGE", CLEAN_STR_MAPPINGS_LARGE),
+        ("HUGE", CLEAN_STR_MAPPINGS_HUGE),
+    ]:
+        n_rules = sum(len(val) for item in mappings for val in item.values())
+        cleaner = compile_clean_str(mappings)
+        sequential = texts if name == "LARGE" else texts_small
+        results = [
+            (
+                "sequential re.sub",
+                throughput(lambda t: clean_str_sequential(t, mappings), sequential),
+            ),
+            ("clean_str", throughput(lambda t: clean_str(t, mappings), texts)),
+            ("compiled", throughput(cleaner, texts)),
+        ]
+        print(f"{name} ({n_rules} rules, {len(cleaner.steps)} compiled steps)")
+        for label, mb_s in results:
+            print(f"    {label:<20s} {mb_s:10.3f} MB/s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``doc_to_dataframe`` against per-token attribute access.
+
+The per-token baseline builds rows through Python attribute access (also
+for extensions, via ``token._``), the same way ``DframCy.to_dataframe``
+does (DframCy itself is not required).
+
+Usage::
+
+    python benchmarks/bench_doc_to_dataframe.py [n_docs]
+
+"""
+
+import sys
+import timeit
+
+import pandas as pd
+import spacy
+from spacy.tokens.underscore import Underscore
+
+from nvm.aux_spacy import doc_to_dataframe
+
+TEXT = (
+    "GoOd. Bad Good WhatEver Awful Marvelous. "
+    "toobad not-marvelous unmarvel goodyear badZ bAD. "
+    "Bad Bad WhatEver Awful Marvelous. "
+)
+
+
+def per_token_dataframe(docs, attrs, extensions):
+    """Rows built with ``getattr`` for every token attribute and extension."""
+    rows = [
+        {
+            **{attr: getattr(token, attr) for attr in attrs},
+            **{ext: getattr(token._, ext) for ext in extensions},
+        }
+        for doc in docs
+        for token in doc
+    ]
+    return pd.DataFrame(rows)
+
+
+def main(n_docs=500, repeat=3):
+    dict0 = {"pos": ["good", "marvel*"], "neg": ["bad", "awful*"]}
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("get_doc_count_of_dict_items", "LEX0", config=dict(dict0=dict0))
+    docs = list(nlp.pipe([TEXT * 4] * n_docs))
+    n_tokens = sum(len(doc) for doc in docs)
+
+    attrs = ["text", "lower_", "shape_", "pos_", "is_alpha", "is_punct", "idx"]
+    extensions = list(Underscore.token_extensions)
+    for label, fn in [
+        ("per-token getattr", per_token_dataframe),
+        ("doc_to_dataframe", doc_to_dataframe),
+    ]:
+        best = min(
+            timeit.repeat(lambda: fn(docs, attrs, extensions), number=1, repeat=repeat)
+        )
+        print(
+            f"{label:<20s} {best * 1e3:10.1f} ms {n_tokens / best / 1e3:10.1f} k tok/s"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
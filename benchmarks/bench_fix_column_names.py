@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``fix_column_names`` on wide frames.
+
+Compares the former five-pass implementation (``.map(lambda ...)`` per
+replacement) with the single-pass normalizer (first and repeated schema).
+
+Usage::
+
+    python benchmarks/bench_fix_column_names.py [n_columns]
+
+"""
+
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from nvm.aux_pandas import aux_pandas
+from nvm.aux_pandas import fix_column_names
+
+
+def fix_column_names_sequential(df0, lowercase=False):
+    """Former implementation (renames columns in place)."""
+    df0.columns = df0.columns.str.strip()
+    df0.columns = df0.columns.map(lambda x: x.replace(" ", "_"))
+    df0.columns = df0.columns.map(lambda x: x.replace("-", "_"))
+    df0.columns = df0.columns.map(lambda x: x.replace(".", "_"))
+    if lowercase:
+        df0.columns = df0.columns.map(str.lower)
+    return df0
+
+
+def make_wide_frame(n_columns):
+    """LIWC x lexicon x window -like feature names."""
+    columns = [
+        f"LIWC.{idx % 73} lex-{idx % 11} win.{idx // 803}" for idx in range(n_columns)
+    ]
+    return pd.DataFrame(np.zeros((10, n_columns)), columns=columns)
+
+
+def main(n_columns=50_000, repeat=5):
+    df0 = make_wide_frame(n_columns)
+
+    def first_schema():
+        aux_pandas._FIXED_COLUMN_NAMES.clear()
+        fix_column_names(df0, lowercase=True)
+
+    for label, fn in [
+        ("five passes", lambda: fix_column_names_sequential(df0.copy(), True)),
+        ("single pass", first_schema),
+        ("cached schema", lambda: fix_column_names(df0, lowercase=True)),
+        ("mapping only", lambda: fix_column_names(df0, return_mapping=True)),
+    ]:
+        best = min(timeit.repeat(fn, number=1, repeat=repeat))
+        print(f"{label:<16s} {best * 1e3:10.1f} ms ({n_columns} columns)")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``import nvm`` (``python -X importtime -c "import nvm"``).
+
+Reports the cumulative import time of ``nvm`` and the slowest imported
+modules, and (for comparison) the wall time of ``import nvm`` followed by
+touching the heavy subpackages.
+
+Usage::
+
+    python benchmarks/bench_import_time.py [n_top]
+
+"""
+
+import subprocess
+import sys
+import timeit
+
+
+def importtime(code):
+    """Get ``(self_us, cumulative_us, module)`` rows from ``-X importtime``."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.split(":", 1)[1].split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def wall_time(code, repeat=5):
+    """Get best wall time (s) of running ``code`` in a fresh interpreter."""
+    return min(
+        timeit.repeat(
+            lambda: subprocess.run([sys.executable, "-c", code], check=True),
+            number=1,
+            repeat=repeat,
+        )
+    )
+
+
+def main(n_top=10):
+    rows = importtime("import nvm")
+    total = {module.strip(): cumulative for _, cumulative, module in rows}
+    print(f"import nvm (cumulative)      {total['nvm'] / 1e3:10.1f} ms")
+    print(f"slowest {n_top} modules (self):")
+    for self_us, _, module in sorted(rows, reverse=True)[:n_top]:
+        print(f"    {self_us / 1e3:10.1f} ms  {module.strip()}")
+
+    for code in [
+        "pass",
+        "import nvm",
+        "import nvm; nvm.clean_str",
+        "import nvm; nvm.aux_pandas; nvm.aux_spacy",
+    ]:
+        print(f"{code:<44s} {wall_time(code) * 1e3:10.1f} ms (wall)")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
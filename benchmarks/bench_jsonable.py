@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""Benchmark ``jsonable`` against the former JSON round-trip implementation.
+
+The bounded walk uses ``max_items`` and ``max_str_len`` limits (large arrays
+are summarized). Note that for NumPy arrays the round-trip produced (truncated) ``repr``
+strings while the direct walk produces lists of numbers.
+
+Usage::
+
+    python benchmarks/bench_jsonable.py [n_docs]
+
+"""
+
+import functools
+import json
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+from nvm.aux_srsly import jsonable
+
+
+def jsonable_round_trip(obj, content=True):
+    """Former implementation (``json.dumps`` followed by ``json.loads``)."""
+
+    def default(o):
+        return f"{o}" if content else f"<<non-serializable: {type(o).__qualname__}>>"
+
+    return json.loads(json.dumps(obj, default=default))
+
+
+def make_summaries(n_docs):
+    """Summary-like dictionaries (counts, ratios and short lists)."""
+    return {
+        f"doc-{idx:06d}": dict(
+            word_count=idx % 500,
+            NOUN_count=idx % 50,
+            ratio=idx / 7.0,
+            sents=["This is the first sentence.", "This is the second one."],
+            meta=dict(sub=f"s{idx % 30:03d}", ses="morning", task="rest"),
+        )
+        for idx in range(n_docs)
+    }
+
+
+def measure(fn, obj, repeat=3):
+    """Get best time (s) and peak memory (MB) of ``fn(obj)``."""
+    best = min(timeit.repeat(lambda: fn(obj), number=1, repeat=repeat))
+    tracemalloc.start()
+    fn(obj)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1e6
+
+
+def main(n_docs=20_000):
+    cases = [
+        ("summaries", make_summaries(n_docs)),
+        ("numpy", dict(arr=np.random.rand(n_docs), ints=np.arange(n_docs))),
+        ("large", dict(arr=np.random.rand(10**6), text="x" * 10**7)),
+    ]
+    for name, obj in cases:
+        print(name)
+        for label, fn in [
+            ("json round-trip", jsonable_round_trip),
+            ("direct walk", jsonable),
+            (
+                "bounded walk",
+                functools.partial(jsonable, max_items=1000, max_str_len=1000),
+            ),
+        ]:
+            seconds, peak_mb = measure(fn, obj)
+            print(f"    {label:<20s} {seconds * 1e3:10.1f} ms {peak_mb:10.1f} MB peak")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
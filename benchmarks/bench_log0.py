@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""Benchmark latency of ``Log0`` logging calls seen by a worker thread.
+
+Every configuration writes DEBUG records to a log file (stream output is
+limited to errors) and the time of each ``log0.debug`` call is measured
+on a worker thread, with and without some processing between calls (with
+no processing the listener thread competes with the worker for the GIL).
+
+Usage::
+
+    python benchmarks/bench_log0.py [n_records]
+
+"""
+
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from nvm.aux_log import Log0
+
+
+def measure(logZ, n_records, work_size):
+    """Get per-call latencies (s) of ``n_records`` calls on a worker thread."""
+    latencies = []
+
+    def work():
+        log0 = logZ.logger
+        clock = time.perf_counter
+        for idx in range(n_records):
+            start = clock()
+            log0.debug("Processed document %d (%s tokens)", idx, idx % 500)
+            latencies.append(clock() - start)
+            sum(range(work_size))  # some processing between logging calls
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    start = time.perf_counter()
+    logZ.close()
+    return latencies, time.perf_counter() - start
+
+
+def main(n_records=100_000):
+    configs = [
+        ("sync", dict()),
+        ("async_io", dict(async_io=True)),
+        ("buffered", dict(buffer_size=1000)),
+        ("jsonl", dict(format="jsonl")),
+        ("jsonl async", dict(format="jsonl", async_io=True)),
+        ("rotating", dict(rotate_bytes=2**20, backup_count=3)),
+        ("rotating gz0", dict(rotate_bytes=2**20, backup_count=3, compress=False)),
+        ("info file", dict(file_lvl="INFO")),
+        ("ring buffer", dict(file_lvl="INFO", ring_buffer=1000)),
+    ]
+    with tempfile.TemporaryDirectory() as dir0:
+        for label, kwargs in configs:
+            for work_size in (0, 2000):
+                logZ = Log0(
+                    dir0=dir0,
+                    fn0=f"{label}-{work_size}.log",
+                    write=True,
+                    stream_lvl="ERROR",
+                    **kwargs,
+                )
+                latencies, close_time = measure(logZ, n_records, work_size)
+                latencies.sort()
+                p99 = latencies[int(0.99 * len(latencies))]
+                print(
+                    f"{label:<12s} work {work_size:5d}"
+                    f"  mean {statistics.mean(latencies) * 1e6:8.2f} us"
+                    f"  p99 {p99 * 1e6:8.2f} us  close {close_time * 1e3:8.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
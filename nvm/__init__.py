@@ -1,46 +1,90 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""Top-level package for NVM."""
+"""Top-level package for NVM.
 
-# fmt: off
-from . import _version
-__version__ = _version.get_versions()['version']
-__version_dict__ = _version.get_versions()
-# fmt: on
+Subpackages (``aux_log``, ``aux_spacy``, ...) and top-level helpers
+(``Log0``, ``clean_str``, ``disp_df``, ...) are imported lazily on first
+access (PEP 562), so ``import nvm`` does not pay for spaCy, pandas, etc.
+spaCy factories are registered when ``nvm.aux_spacy`` is first touched (or
+by spaCy itself through the ``spacy_factories`` entry points).
+
+``__version__`` (and ``__version_dict__``) is computed on first access and
+memoized: in a source checkout versioneer may run ``git describe``, so it
+is never done at import time (built distributions ship a static
+``_version.py`` generated by versioneer).
+
+"""
+
+import functools
+import importlib
 
 __author__ = """cogsys.io"""
 __email__ = """nvm@cogsys.io"""
 
 
-from . import aux_log
-from .aux_log import Log0
+_LAZY_SUBMODULES = frozenset(
+    [
+        "aux_log",
+        "aux_sys",
+        "aux_str",
+        "aux_pandas",
+        "aux_srsly",
+        "aux_spacy",
+        "aux_bids",
+    ]
+)
+
+# Top-level name -> (submodule, attribute)
+_LAZY_ATTRIBUTES = {
+    "Log0": ("aux_log", "Log0"),
+    "chdir": ("aux_sys", "chdir"),
+    "pushdir": ("aux_sys", "pushdir"),
+    "pdir": ("aux_sys", "pushdir"),
+    "clean_str": ("aux_str", "clean_str"),
+    "now": ("aux_str.now", "now"),
+    "disp_df": ("aux_pandas", "disp_df"),
+    "repr_df": ("aux_pandas", "repr_df"),
+    "ddf": ("aux_pandas", "disp_df"),
+    "rdf": ("aux_pandas", "repr_df"),
+    "jsonable": ("aux_srsly", "jsonable"),
+    "yamlstr": ("aux_srsly", "yamlstr"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_versions():
+    from . import _version
+
+    return _version.get_versions()
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        return _get_versions()["version"]
+
+    if name == "__version_dict__":
+        return _get_versions()
 
-from . import aux_sys
-from .aux_sys import chdir
-from .aux_sys import pushdir
-from .aux_sys import pushdir as pdir
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
 
-from . import aux_str
-from .aux_str import clean_str
-from .aux_str.now import now
+    if name in _LAZY_ATTRIBUTES:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(f".{module_name}", __name__), attribute)
+        globals()[name] = value  # resolve only once
+        return value
 
-from . import aux_pandas
-from .aux_pandas import disp_df
-from .aux_pandas import repr_df
-from .aux_pandas import disp_df as ddf
-from .aux_pandas import repr_df as rdf
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from . import aux_srsly
-from .aux_srsly import jsonable
-from .aux_srsly import yamlstr
 
-from . import aux_spacy
-from . import aux_bids
+def __dir__():
+    names = set(globals()) | _LAZY_SUBMODULES | set(_LAZY_ATTRIBUTES)
+    return sorted(names | {"__version__", "__version_dict__"})
 
 
 def get_module_version():
-    return __version__
+    return _get_versions()["version"]
 
 
 # end
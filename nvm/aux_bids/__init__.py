@@ -25,6 +25,15 @@ fn0 = (
 )
 
 
+def __getattr__(name: str):
+    # ``BidsIndex`` (pandas) is imported lazily (PEP 562)
+    if name == "BidsIndex":
+        from .bids_index import BidsIndex
+
+        return BidsIndex
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def dict_from_bids_filename(
     fn0: Union[str, pathlib.Path],
     log0: Optional[logging.Logger] = logging.getLogger("dummy"),
@@ -108,27 +117,29 @@ def dict_from_bids_filename(
 
     """
     fn0 = pathlib.Path(fn0)
-    log0.debug(f"{fn0 = }")
-    path0 = fn0.parent
-    log0.debug(f"{path0 = }")
     name0 = fn0.name
-    log0.debug(f"{name0 = }")
     ext = "".join(fn0.suffixes)
-    log0.debug(f"{ext = }")
     # stem0 = fn0.stem             # NOTE: this fails for complex extensions
     # stem0 = fn0.with_suffix("")  # NOTE: (e.g., for ".tar.gz")
     # stem0 = fn0.name.rstrip("".join(fn0.suffixes))  # WTF
     # stem0 = name0.rstrip(ext)  # WTF
     stem0 = name0.split(".")[0]
-    log0.debug(f"{stem0 = }")
     parts = [item for item in stem0.split("_") if len(item)]
-    log0.debug(f"{parts = }")
     props = {item.split("-")[0]: item.split("-")[1] for item in parts if "-" in item}
-    log0.debug(f"{props = }")
     suff = [item for item in parts if "-" not in item]
-    log0.debug(f"{suff = }")
-    tags0 = list(props.keys())
-    log0.debug(f"{tags0 = }")
-    vals0 = list(props.values())
-    log0.debug(f"{vals0 = }")
+    if log0.isEnabledFor(logging.DEBUG):
+        # NOTE: formatted only with DEBUG enabled (called for every file of a tree)
+        for key0, val0 in [
+            ("fn0", fn0),
+            ("path0", fn0.parent),
+            ("name0", name0),
+            ("ext", ext),
+            ("stem0", stem0),
+            ("parts", parts),
+            ("props", props),
+            ("suff", suff),
+            ("tags0", list(props.keys())),
+            ("vals0", list(props.values())),
+        ]:
+            log0.debug("%s = %r", key0, val0)
     return dict(props=props, suff=suff, ext=ext)
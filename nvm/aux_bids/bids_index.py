@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+
+"""Index of files of a BIDS-like directory tree (see ``BidsIndex``)."""
+
+import collections
+import concurrent.futures
+import contextlib
+import itertools
+import logging
+import os
+import pathlib
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+
+# Columns of the index (entity columns are added after them)
+INDEX_COLUMNS = ["dir", "name", "suffix", "ext", "size", "mtime"]
+
+# Version of the SQLite schema (see ``BidsIndex.save``)
+SCHEMA_VERSION = "1"
+
+# Result of scanning one directory: (dir, files, subdirectories, dir mtime)
+ScanResult = Tuple[str, List[tuple], List[str], int]
+
+
+def _name_ext(name: str) -> str:
+    """Get ``"".join(pathlib.Path(name).suffixes)`` (without ``pathlib``)."""
+    if name.endswith("."):
+        return ""
+    name = name.lstrip(".")
+    idx = name.find(".")
+    return "" if idx < 0 else name[idx:]
+
+
+def _parse_name(name: str) -> Tuple[Dict[str, str], str, str]:
+    """Get entities, suffixes (joined with ``"_"``) and extension of a file name
+    (parsed as by ``dict_from_bids_filename``).
+    """
+    stem0 = name.split(".")[0]
+    parts = [item for item in stem0.split("_") if len(item)]
+    props = {item.split("-")[0]: item.split("-")[1] for item in parts if "-" in item}
+    suff = [item for item in parts if "-" not in item]
+    return props, "_".join(suff), _name_ext(name)
+
+
+def _scan_dir(root: str, rel: str, include_hidden: bool) -> ScanResult:
+    """Get parsed files (``(name, props, suffix, ext, size, mtime)``),
+    subdirectories (relative to ``root``) and mtime (ns) of directory ``rel``.
+    """
+    rows = []
+    subdirs = []
+    path = root if rel == "." else os.path.join(root, rel)
+    mtime_ns = os.stat(path).st_mtime_ns  # before listing (see ``refresh``)
+    with os.scandir(path) as entries:
+        for entry in entries:
+            name = entry.name
+            if not include_hidden and name.startswith("."):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(name if rel == "." else f"{rel}/{name}")
+            elif entry.is_file():
+                stat = entry.stat()
+                rows.append((name, *_parse_name(name), stat.st_size, stat.st_mtime))
+    return rel, rows, subdirs, mtime_ns
+
+
+def _walk(
+    visit: Callable[[str], Tuple[Optional[ScanResult], List[str]]],
+    n_workers: Optional[int],
+    log0: logging.Logger,
+) -> Tuple[List[ScanResult], Set[str]]:
+    """Visit directories from the root (``"."``) down in parallel threads.
+
+    ``visit(rel)`` returns scan result (or ``None``) and subdirectories to be
+    visited. Returns scan results and all visited directories.
+    """
+    results = []
+    visited = set()
+    with concurrent.futures.ThreadPoolExecutor(n_workers) as pool:
+        futures = {pool.submit(visit, "."): "."}
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                rel = futures.pop(future)
+                try:
+                    result, subdirs = future.result()
+                except OSError as err:
+                    if rel == ".":
+                        raise
+                    log0.warning("Skipping directory %r: %s", rel, err)
+                    continue
+
+                visited.add(rel)
+                if result is not None:
+                    results.append(result)
+                for subdir in subdirs:
+                    futures[pool.submit(visit, subdir)] = subdir
+    return results, visited
+
+
+def _to_frame(results: List[ScanResult]) -> pd.DataFrame:
+    """Get index data frame (sorted by directory and name) of scan results."""
+    dirs, names, props, suffixes, exts, sizes, mtimes = [], [], [], [], [], [], []
+    for rel, rows, *_ in sorted(results, key=lambda result: result[0]):
+        for name, props0, suffix, ext, size, mtime in sorted(rows):
+            dirs.append(rel)
+            names.append(name)
+            props.append(props0)
+            suffixes.append(suffix)
+            exts.append(ext)
+            sizes.append(size)
+            mtimes.append(mtime)
+
+    entities = list(dict.fromkeys(key for props0 in props for key in props0))
+    data = dict(
+        dir=pd.Categorical(dirs),
+        name=names,
+        suffix=pd.Categorical(suffixes),
+        ext=pd.Categorical(exts),
+        size=np.array(sizes, dtype=np.int64),
+        mtime=np.array(mtimes, dtype=np.float64),
+    )
+    for key in entities:
+        if key not in INDEX_COLUMNS:
+            data[key] = pd.Categorical([props0.get(key) for props0 in props])
+    return pd.DataFrame(data)
+
+
+def _combine_frames(df0: pd.DataFrame, df1: pd.DataFrame) -> pd.DataFrame:
+    """Concatenate index data frames (keeping categorical columns)."""
+    frames = [df for df in (df0, df1) if len(df)]
+    if not frames:
+        return _to_frame([])
+
+    columns = list(dict.fromkeys(column for df in frames for column in df.columns))
+    data = dict()
+    for column in columns:
+        if column in ("name", "size", "mtime"):
+            data[column] = pd.concat([df[column] for df in frames], ignore_index=True)
+            continue
+
+        # empty categories of the same dtype for frames without the column
+        categories = next(df for df in frames if column in df)[column].cat.categories
+        values = [
+            df[column].array
+            if column in df
+            else pd.Categorical([None] * len(df), categories=categories[:0])
+            for df in frames
+        ]
+        data[column] = pd.api.types.union_categoricals(values, sort_categories=True)
+
+    df2 = pd.DataFrame(data).sort_values(["dir", "name"], ignore_index=True)
+    for column in df2.columns:
+        if isinstance(df2[column].dtype, pd.CategoricalDtype):
+            df2[column] = df2[column].cat.remove_unused_categories()
+    empty = [column for column in df2.columns[6:] if df2[column].isna().all()]
+    return df2.drop(columns=empty)
+
+
+def _parent(rel: str) -> str:
+    return rel.rsplit("/", 1)[0] if "/" in rel else "."
+
+
+class BidsIndex:
+    """Index of files of a BIDS-like directory tree.
+
+    ``df`` has one row per file with columns ``dir`` (directory relative to
+    ``root``, ``"."`` for the root), ``name``, ``suffix`` (suffixes joined
+    with ``"_"``, e.g., ``"bold"``), ``ext`` (e.g., ``".nii.gz"``),
+    ``size`` (bytes), ``mtime`` (seconds since epoch) followed by one
+    column per entity key (e.g., ``sub``, ``ses``, ``task``; missing
+    values are NaN, entity keys clashing with ``INDEX_COLUMNS`` are
+    skipped). Names are parsed as by ``dict_from_bids_filename``, ``dir``,
+    ``suffix``, ``ext`` and entity columns are categorical.
+
+    The index can be saved to (``save``) and loaded from (``load``) an
+    SQLite database and updated with ``refresh`` which re-scans only
+    directories whose mtime changed since the last scan.
+
+    Examples
+    --------
+    >>> from nvm.aux_bids import BidsIndex
+    >>> index = BidsIndex.scan("data/ds001", n_workers=16)
+    >>> df0 = index.df
+    >>> df0[(df0.task == "rest") & (df0.ext == ".nii.gz")].groupby("sub").size()
+    >>> index.paths(df0.suffix == "bold")[:2]
+    >>> index.save("ds001.index.sqlite")
+    >>>
+    >>> # in a later job
+    >>> index = BidsIndex.load("ds001.index.sqlite")
+    >>> index.refresh()  # updates the database as well
+    {'n_dirs': 1203, 'n_dirs_scanned': 2, 'n_dirs_removed': 0, ...}
+
+    """
+
+    def __init__(
+        self,
+        root: Union[str, pathlib.Path],
+        df: pd.DataFrame,
+        dirs: Optional[Dict[str, int]] = None,
+        include_hidden: bool = False,
+        path: Optional[Union[str, pathlib.Path]] = None,
+    ):
+        self.root = pathlib.Path(root)
+        self.df = df
+        self.dirs = dict() if dirs is None else dirs  # directory -> mtime (ns)
+        self.include_hidden = include_hidden
+        self.path = None if path is None else pathlib.Path(path)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self.root)!r}, {len(self)} files)"
+
+    @classmethod
+    def scan(
+        cls,
+        root: Union[str, pathlib.Path],
+        n_workers: Optional[int] = None,
+        include_hidden: bool = False,
+        log0: Optional[logging.Logger] = logging.getLogger("dummy"),
+    ) -> "BidsIndex":
+        """Scan directory tree ``root``.
+
+        Directories are listed with ``os.scandir`` (file types without
+        extra system calls, size and mtime from ``DirEntry.stat``) by a pool
+        of ``n_workers`` threads, each subdirectory being a separate task,
+        so listing and ``stat`` calls of many directories overlap (e.g., on
+        network filesystems).
+
+        Parameters
+        ----------
+        root : Union[str, pathlib.Path]
+            Root directory.
+        n_workers : Optional[int]
+            Number of threads (defaults to ``ThreadPoolExecutor`` default).
+        include_hidden : bool
+            Include files and directories starting with ``"."`` (defaults to
+            ``False``).
+        log0 : Optional[logging.Logger]
+            Logger (optional, unreadable directories are skipped with a
+            warning).
+
+        Returns
+        -------
+        BidsIndex
+            Index of all files of the tree.
+
+        """
+        root0 = os.fspath(root)
+
+        def visit(rel):
+            result = _scan_dir(root0, rel, include_hidden)
+            return result, result[2]
+
+        results, _ = _walk(visit, n_workers, log0)
+        index = cls(
+            root,
+            _to_frame(results),
+            dirs={result[0]: result[3] for result in results},
+            include_hidden=include_hidden,
+        )
+        log0.debug("Indexed %d files in %d directories", len(index), len(results))
+        return index
+
+    def refresh(
+        self,
+        n_workers: Optional[int] = None,
+        log0: Optional[logging.Logger] = logging.getLogger("dummy"),
+    ) -> Dict[str, int]:
+        """Update the index with changes of the directory tree.
+
+        Directories are visited from the root down (in parallel threads, as
+        in ``scan``) but only listed if their mtime changed since they were
+        last scanned (a file or subdirectory was added, removed or renamed),
+        otherwise their known subdirectories are visited. Rows of re-scanned
+        directories are replaced and rows of directories that no longer
+        exist are removed, so the cost is one ``stat`` call per directory
+        plus a listing of changed directories only. If the index was saved
+        (or loaded), the database is updated with the changed rows.
+
+        Files modified in place (without changing their directory) keep
+        their old ``size`` and ``mtime`` until their directory is re-scanned
+        (use ``scan`` to re-index everything).
+
+        Parameters
+        ----------
+        n_workers : Optional[int]
+            Number of threads (see ``scan``).
+        log0 : Optional[logging.Logger]
+            Logger (optional).
+
+        Returns
+        -------
+        Dict[str, int]
+            Numbers of visited, re-scanned and removed directories and of
+            added and removed files.
+
+        """
+        root0 = os.fspath(self.root)
+        children = collections.defaultdict(list)
+        for rel in self.dirs:
+            if rel != ".":
+                children[_parent(rel)].append(rel)
+
+        def visit(rel):
+            path = root0 if rel == "." else os.path.join(root0, rel)
+            if self.dirs.get(rel) == os.stat(path).st_mtime_ns:
+                return None, children[rel]
+            result = _scan_dir(root0, rel, self.include_hidden)
+            return result, result[2]
+
+        results, visited = _walk(visit, n_workers, log0)
+        scanned = {result[0] for result in results}
+        removed = set(self.dirs) - visited
+        affected = scanned | removed
+
+        keep = ~self.df["dir"].isin(affected).to_numpy()
+        n_removed = int((~keep).sum())
+        df1 = _to_frame(results)
+        if affected:
+            self.df = _combine_frames(self.df[keep], df1)
+        for rel in removed:
+            del self.dirs[rel]
+        self.dirs.update({result[0]: result[3] for result in results})
+
+        if self.path is not None and affected:
+            with contextlib.closing(sqlite3.connect(self.path)) as con, con:
+                con.executemany(
+                    "DELETE FROM files WHERE dir = ?", [(rel,) for rel in affected]
+                )
+                con.executemany(
+                    "DELETE FROM dirs WHERE dir = ?", [(rel,) for rel in removed]
+                )
+                self._insert(con, df1, {rel: self.dirs[rel] for rel in scanned})
+
+        summary = dict(
+            n_dirs=len(visited),
+            n_dirs_scanned=len(scanned),
+            n_dirs_removed=len(removed),
+            n_files_added=len(df1),
+            n_files_removed=n_removed,
+        )
+        log0.debug("Refreshed index of %r: %s", str(self.root), summary)
+        return summary
+
+    @staticmethod
+    def _insert(con: sqlite3.Connection, df0: pd.DataFrame, dirs: Dict[str, int]):
+        con.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?)", list(dirs.items()))
+        con.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?)",
+            zip(
+                df0["dir"].tolist(),
+                df0["name"].tolist(),
+                df0["size"].tolist(),
+                df0["mtime"].tolist(),
+            ),
+        )
+
+    def save(self, path: Union[str, pathlib.Path]):
+        """Save the index to SQLite database ``path`` (replacing its tables).
+
+        Tables ``meta`` (root, options), ``dirs`` (directory, mtime) and
+        ``files`` (directory, name, size, mtime) are written, parsed columns
+        are re-created from file names by ``load``. Later ``refresh`` calls
+        update the database.
+        """
+        with contextlib.closing(sqlite3.connect(path)) as con, con:
+            con.executescript(
+                """
+                DROP TABLE IF EXISTS meta;
+                DROP TABLE IF EXISTS dirs;
+                DROP TABLE IF EXISTS files;
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE dirs (dir TEXT PRIMARY KEY, mtime_ns INTEGER);
+                CREATE TABLE files (
+                    dir TEXT, name TEXT, size INTEGER, mtime REAL,
+                    PRIMARY KEY (dir, name)
+                );
+                """
+            )
+            con.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("schema_version", SCHEMA_VERSION),
+                    ("root", str(self.root)),
+                    ("include_hidden", str(int(self.include_hidden))),
+                ],
+            )
+            self._insert(con, self.df, self.dirs)
+        self.path = pathlib.Path(path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, pathlib.Path],
+        root: Optional[Union[str, pathlib.Path]] = None,
+    ) -> "BidsIndex":
+        """Load index saved with ``save``.
+
+        Parameters
+        ----------
+        path : Union[str, pathlib.Path]
+            SQLite database.
+        root : Optional[Union[str, pathlib.Path]]
+            Root directory (defaults to the saved one, e.g., to be replaced
+            for a dataset mounted elsewhere).
+
+        Returns
+        -------
+        BidsIndex
+            Index (``refresh`` updates the database).
+
+        """
+        with contextlib.closing(sqlite3.connect(path)) as con:
+            meta = dict(con.execute("SELECT key, value FROM meta"))
+            if meta.get("schema_version") != SCHEMA_VERSION:
+                raise ValueError(
+                    f"Unsupported index schema version {meta.get('schema_version')!r}"
+                    f" (expected {SCHEMA_VERSION!r})"
+                )
+            dirs = dict(con.execute("SELECT dir, mtime_ns FROM dirs"))
+            rows = con.execute("SELECT dir, name, size, mtime FROM files ORDER BY dir")
+            results = [
+                (
+                    rel,
+                    [
+                        (name, *_parse_name(name), size, mtime)
+                        for _, name, size, mtime in group
+                    ],
+                    [],
+                    dirs.get(rel),
+                )
+                for rel, group in itertools.groupby(rows, key=lambda row: row[0])
+            ]
+        return cls(
+            meta["root"] if root is None else root,
+            _to_frame(results),
+            dirs=dirs,
+            include_hidden=bool(int(meta["include_hidden"])),
+            path=path,
+        )
+
+    def paths(self, mask=None) -> List[pathlib.Path]:
+        """Get full paths of (selected, e.g., by boolean ``mask``) files."""
+        df0 = self.df if mask is None else self.df[mask]
+        return [
+            self.root / name if dir0 == "." else self.root / dir0 / name
+            for dir0, name in zip(df0["dir"], df0["name"])
+        ]
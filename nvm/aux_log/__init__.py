@@ -2,3 +2,6 @@
 
 
 from .aux_log import Log0
+from .filters import DedupFilter
+from .filters import install_dedup_filter
+from .timing import Timings
@@ -2,12 +2,26 @@
 
 """Logger that handles two outputs (stdout and file)."""
 
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
 import pathlib
+import queue
 
 from datetime import datetime as dt
 from pytz import timezone as tz
 
+from .filters import install_dedup_filter
+from .handlers import BufferingHandler
+from .handlers import CompressingRotatingFileHandler
+from .handlers import CompressingTimedRotatingFileHandler
+from .handlers import JsonlFormatter
+from .handlers import ProcessQueueHandler
+from .handlers import RingBufferHandler
+from .handlers import ThreadQueueHandler
+from .timing import Timings
+
 tz0 = tz("Europe/Berlin")
 
 
@@ -17,6 +31,9 @@ tz0 = tz("Europe/Berlin")
 class Log0:
     """Log0: logger that handles two outputs (stdout and file)."""
 
+    # Last created instance (closed when replaced, see ``__init__``)
+    _current = None
+
     def __init__(
         self,
         dir0="logs",
@@ -24,10 +41,72 @@ class Log0:
         write=False,
         stream_lvl="INFO",
         file_lvl="DEBUG",
+        async_io=False,
+        multiprocess=False,
+        format="text",
+        buffer_size=None,
+        flush_interval=1.0,
+        rotate_bytes=None,
+        rotate_when=None,
+        rotate_interval=1,
+        backup_count=7,
+        compress=True,
+        report_interval=None,
+        ring_buffer=0,
+        dedup_window=None,
     ):
         """
         Initialize Log0 class.
 
+        With ``async_io=True`` the logger gets a single queue handler and
+        records are formatted and written by handlers (``handler0``,
+        ``handler1``) on a ``QueueListener`` thread, so a logging call does
+        no formatting and no I/O on the calling thread. The listener is
+        stopped (and the queue flushed) by ``close`` which is called at exit.
+
+        With ``multiprocess=True`` (implies ``async_io``) the queue is a
+        ``multiprocessing.Queue`` and worker processes configured with
+        ``Log0.worker_initializer`` (see ``initargs``) send their records to
+        it, so records from all processes are written by a single listener
+        thread (one file handle, no interleaved lines).
+
+        With ``format="jsonl"`` the log file (``.jsonl``) gets one JSON
+        object per record including ``extra`` fields (see
+        ``JsonlFormatter``), which can be loaded with
+        ``pd.read_json(logZ.of0, lines=True)``. Records for the file are
+        buffered (``BufferingHandler``) and written in batches of
+        ``buffer_size`` records (defaults to 1000 for ``"jsonl"`` and 0, i.e.
+        no buffering, for ``"text"``), at least every ``flush_interval``
+        seconds (by a background thread, also when no other record arrives)
+        and immediately on ERROR. Records buffered when the process is killed
+        (e.g., ``SIGKILL``) are lost, use ``buffer_size=0`` if every record
+        must be written immediately.
+
+        With ``rotate_bytes`` (size in bytes) or ``rotate_when`` (e.g.,
+        ``"midnight"``, ``"H"``, with ``rotate_interval``, see
+        ``TimedRotatingFileHandler``) the log file is rotated and at most
+        ``backup_count`` rotated segments are kept. Rotated segments are
+        compressed with gzip (``compress=True``, ``<name>.1.gz``, ...) on a
+        background thread, so logging calls do not wait for compression.
+
+        Stages of a pipeline can be timed with ``timer`` (context manager or
+        decorator) and counted with ``rate``. Statistics (see ``Timings``)
+        are logged every ``report_interval`` seconds (optional) and returned
+        by ``report``.
+
+        With ``ring_buffer=N`` the last ``N`` records below the level of the
+        file handler (or of the stream handler without a log file), e.g.,
+        DEBUG records, are kept in memory (``RingBufferHandler``, formatted
+        only when dumped) and written to the log file when an ERROR is
+        logged or an exception escapes the ``with Log0(...)`` block.
+
+        With ``dedup_window`` (seconds, optional) repeated WARNING records
+        with the same message template (regardless of arguments, e.g.,
+        replaced spaCy extensions) are logged once per window followed by a
+        "suppressed N messages" summary (see ``DedupFilter``, summaries of
+        the last window are logged by ``close``). Deduplication is off by
+        default (nvm's internal ``"dummy"`` logger has it on).
+
         Examples
         --------
 
@@ -83,6 +162,67 @@ class Log0:
         >>> log0.info(f"logger: {logZ.logging.getLevelName(log0)}")
         >>> # no output expected from log0.info after setting "CRITICAL" logging level
 
+        Asynchronous (background thread) formatting and writing.
+
+        >>> import nvm
+        >>> logZ = nvm.Log0(write=True, async_io=True)
+        >>> log0 = logZ.logger
+        >>> log0.debug("Hot loop record %d", 42)
+        >>> logZ.close()  # optional (called at exit)
+
+        Logging from worker processes.
+
+        >>> import logging
+        >>> import multiprocessing
+        >>> import nvm
+        >>> logZ = nvm.Log0(write=True, multiprocess=True)
+        >>> def work(idx):
+        >>>     logging.getLogger("nvm.aux_log.aux_log").info("Worker job %d", idx)
+        >>> with multiprocessing.Pool(
+        >>>     4, initializer=nvm.Log0.worker_initializer, initargs=logZ.initargs
+        >>> ) as pool:
+        >>>     pool.map(work, range(8))
+        >>>     pool.close()
+        >>>     pool.join()
+
+        JSON lines (e.g., performance logs).
+
+        >>> import nvm
+        >>> import pandas as pd
+        >>> logZ = nvm.Log0(write=True, format="jsonl")
+        >>> log0 = logZ.logger
+        >>> log0.info("Batch done", extra=dict(batch=7, docs_per_s=1234.5))
+        >>> logZ.close()
+        >>> df0 = pd.read_json(logZ.of0, lines=True)
+
+        Rotation (e.g., multi-day runs).
+
+        >>> import nvm
+        >>> logZ = nvm.Log0(write=True, rotate_bytes=100 * 2**20, backup_count=10)
+        >>> logZ = nvm.Log0(write=True, rotate_when="midnight", backup_count=7)
+
+        Timing of pipeline stages.
+
+        >>> import nvm
+        >>> logZ = nvm.Log0(report_interval=60.0)
+        >>> @logZ.timer("parse")
+        >>> def parse(doc):
+        >>>     return doc.split()
+        >>> for batch in [["a b", "c"], ["d e f"]]:
+        >>>     with logZ.timer("batch", n_items=len(batch)):
+        >>>         _ = [parse(doc) for doc in batch]
+        >>>     logZ.rate("docs", len(batch))
+        >>> logZ.report(as_frame=True)[["count", "total", "p50", "p99"]]
+
+        Post-mortem DEBUG records (INFO-level log file).
+
+        >>> import nvm
+        >>> with nvm.Log0(write=True, file_lvl="INFO", ring_buffer=1000) as logZ:
+        >>>     log0 = logZ.logger
+        >>>     for idx in range(10_000):
+        >>>         log0.debug("Processing document %d", idx)  # kept in memory
+        >>>     log0.error("Batch failed")  # dumps the last 1000 DEBUG records
+
         """
         # Loggig levels
         """
@@ -117,12 +257,32 @@ class Log0:
         self.handler0.setLevel(self.stream_lvl)
         self.logger.setLevel(self.handler0.level)
 
+        # Close previous instance (stops its listener and flusher threads)
+        if Log0._current is not None:
+            Log0._current.close()
+            if getattr(Log0._current, "buffer_handler", None) is not None:
+                Log0._current.buffer_handler.close()
+        Log0._current = self
+
         # Detach any old handlers
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
 
-        # Attach new handle
-        self.logger.addHandler(self.handler0)
+        self.dedup_filter = install_dedup_filter(self.logger, window=dedup_window)
+
+        self.timings = Timings(self.logger, report_interval=report_interval)
+        self.handlers = [self.handler0]
+        self.ring_handler = None
+        self.listener = None
+        self.queue = None
+        self.queue_handler = None
+
+        if format not in ("text", "jsonl"):
+            raise ValueError(f"Unknown format {format!r} (expected 'text' or 'jsonl')")
+        if buffer_size is None:
+            buffer_size = 1000 if format == "jsonl" else 0
+        if rotate_bytes and rotate_when:
+            raise ValueError("Use either rotate_bytes or rotate_when (not both)")
 
         if not write:
             self.of0 = None
@@ -131,12 +291,29 @@ class Log0:
             self.fn0 = (
                 str(fn0)
                 if fn0 is not None
-                else f"{dt.now(tz0).strftime('%Y%m%dT%H%M%S')}.log"
+                else f"{dt.now(tz0).strftime('%Y%m%dT%H%M%S')}"
+                f"{'.jsonl' if format == 'jsonl' else '.log'}"
             )
             self.of0 = self.dir0 / self.fn0
             self.dir0.mkdir(mode=0o700, parents=True, exist_ok=True)
             # Setup logging file handler
-            self.handler1 = logging.FileHandler(self.of0)
+            if rotate_bytes:
+                self.handler1 = CompressingRotatingFileHandler(
+                    self.of0,
+                    maxBytes=rotate_bytes,
+                    backupCount=backup_count,
+                    compress=compress,
+                )
+            elif rotate_when:
+                self.handler1 = CompressingTimedRotatingFileHandler(
+                    self.of0,
+                    when=rotate_when,
+                    interval=rotate_interval,
+                    backupCount=backup_count,
+                    compress=compress,
+                )
+            else:
+                self.handler1 = logging.FileHandler(self.of0)
             self.handler1.setFormatter(
                 logging.Formatter(
                     " ".join(
@@ -153,8 +330,133 @@ class Log0:
                 )
             )
 
+            if format == "jsonl":
+                self.handler1.setFormatter(JsonlFormatter())
+
             # Set logging levels
             self.handler1.setLevel(self.file_lvl)
             self.logger.setLevel(min(self.handler0.level, self.handler1.level))
-            # Attach new handle
-            self.logger.addHandler(self.handler1)
+            if buffer_size:
+                self.buffer_handler = BufferingHandler(
+                    self.handler1,
+                    capacity=buffer_size,
+                    flush_interval=flush_interval,
+                )
+                self.handlers.append(self.buffer_handler)
+            else:
+                self.handlers.append(self.handler1)
+
+        if ring_buffer:
+            # Dump to the file (after flushing the buffer) before error record
+            self.ring_handler = RingBufferHandler(
+                self.handlers[-1], capacity=ring_buffer
+            )
+            self.handlers.insert(1, self.ring_handler)
+            self.logger.setLevel("DEBUG")
+
+        if not (async_io or multiprocess):
+            # Attach new handles
+            for handler in self.handlers:
+                self.logger.addHandler(handler)
+        else:
+            # Attach queue handle, the listener thread feeds the handles
+            if multiprocess:
+                self.queue = multiprocessing.Queue(-1)
+                self.queue_handler = ProcessQueueHandler(self.queue)
+            else:
+                self.queue = queue.SimpleQueue()
+                self.queue_handler = ThreadQueueHandler(self.queue)
+            self.listener = logging.handlers.QueueListener(
+                self.queue, *self.handlers, respect_handler_level=True
+            )
+            self.listener.start()
+            self.logger.addHandler(self.queue_handler)
+            atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Log escaping exception (dumps ring buffer, if any) and close."""
+        if exc_type is not None:
+            self.logger.error(
+                "%s escaped Log0 context",
+                exc_type.__name__,
+                exc_info=(exc_type, exc_value, exc_traceback),
+            )
+        self.close()
+        return False
+
+    def timer(self, name, n_items=0):
+        """Get timer of stage ``name`` (context manager or decorator), see
+        ``Timings.timer``.
+        """
+        return self.timings.timer(name, n_items)
+
+    def rate(self, name, n_items=1):
+        """Add ``n_items`` processed items to stage ``name``, see
+        ``Timings.rate``.
+        """
+        self.timings.rate(name, n_items)
+
+    def report(self, as_frame=False):
+        """Get timing statistics of all stages, see ``Timings.report``."""
+        return self.timings.report(as_frame=as_frame)
+
+    @property
+    def initargs(self):
+        """Arguments for ``Log0.worker_initializer`` (``multiprocess`` mode)."""
+        if not isinstance(self.queue_handler, ProcessQueueHandler):
+            raise RuntimeError("Log0 was not created with multiprocess=True")
+        return (self.queue, self.logger.level)
+
+    @staticmethod
+    def worker_initializer(queue, level="DEBUG"):
+        """Configure logging of worker process to send records to ``queue``.
+
+        Handlers of the root logger and of the ``Log0`` logger are replaced
+        with a single queue handler, so records of any logger (propagating
+        to the root logger) are written by the listener of the main process.
+        Use as ``initializer`` of ``multiprocessing.Pool`` (or
+        ``ProcessPoolExecutor``) with ``initargs=logZ.initargs`` or call it
+        at the start of a worker.
+
+        Records are sent by a background thread of the worker, so workers
+        should exit normally (e.g., ``pool.close()`` and ``pool.join()``
+        before leaving ``with multiprocessing.Pool(...)`` which terminates
+        them), otherwise their last records may be lost.
+        """
+        handler = ProcessQueueHandler(queue)
+        for logger in [logging.getLogger(), logging.getLogger(__name__)]:
+            for handler0 in logger.handlers[:]:
+                logger.removeHandler(handler0)
+            logger.addHandler(handler)
+            logger.setLevel(level)
+        logging.getLogger(__name__).propagate = False
+
+    def close(self):
+        """Log summary of suppressed records (if any), stop listener thread
+        (if any, after processing queued records), flush handlers and wait
+        for compression of rotated log files.
+
+        After the listener is stopped the queue handler is replaced with the
+        handlers themselves, so later records are written synchronously.
+        """
+        if self.dedup_filter is not None:
+            self.dedup_filter.flush()
+
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+            atexit.unregister(self.close)
+            if self.queue_handler in self.logger.handlers:
+                self.logger.removeHandler(self.queue_handler)
+                for handler in self.handlers:
+                    self.logger.addHandler(handler)
+
+        for handler in self.handlers:
+            handler.flush()
+
+        handler1 = getattr(self, "handler1", None)
+        if hasattr(handler1, "wait_for_compression"):
+            handler1.wait_for_compression()
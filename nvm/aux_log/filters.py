@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+"""Logging filters used by ``Log0`` and nvm's internal loggers."""
+
+import logging
+import threading
+import time
+
+from typing import (
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+class DedupFilter(logging.Filter):
+    """Suppress repeats of the same message template within a time window.
+
+    Records are keyed by logger name, level and message template
+    (``record.msg`` before merging with arguments, so e.g.
+    ``log0.warning("Doc extension %s was replaced.", key)`` is one key for
+    all extensions). Only ``max_repeats`` records per key pass within
+    ``window`` seconds (from the first one). The number of suppressed
+    records is logged (same logger and level) when the key appears again
+    after the window or, for keys that do not reappear, when a later record
+    arrives more than ``window`` seconds after the last check.
+
+    Only records with levels in ``levels`` (defaults to WARNING) are
+    deduplicated, other records pass unchanged.
+
+    Examples
+    --------
+    >>> import logging
+    >>> from nvm.aux_log import DedupFilter
+    >>> log0 = logging.getLogger("dummy")
+    >>> log0.addFilter(DedupFilter(window=60.0))
+    >>> for key in ["a", "b", "c"]:
+    >>>     log0.warning("Doc extension %s was replaced.", key)  # logged once
+
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        max_repeats: int = 1,
+        levels: Sequence[int] = (logging.WARNING,),
+        name: str = "",
+    ):
+        super().__init__(name)
+        self.window = window
+        self.max_repeats = max_repeats
+        self.levels = frozenset(levels)
+        # key -> [window start, count, suppressed]
+        self._state: Dict[Tuple[str, int, str], list] = dict()
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno not in self.levels or getattr(record, "dedup_summary", False):
+            return True
+
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        summaries = []
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                if state is not None and state[2]:
+                    summaries.append((key, state[2]))
+                self._state[key] = [now, 1, 0]
+                keep = True
+            else:
+                state[1] += 1
+                keep = state[1] <= self.max_repeats
+                if not keep:
+                    state[2] += 1
+            if now - self._last_sweep >= self.window:
+                summaries.extend(self._sweep(now))
+
+        for summary in summaries:
+            self._log_summary(*summary)
+        return keep
+
+    def _sweep(self, now: float):
+        """Drop expired keys (summaries of suppressed records)."""
+        self._last_sweep = now
+        summaries = []
+        for key, state in list(self._state.items()):
+            if now - state[0] >= self.window:
+                del self._state[key]
+                if state[2]:
+                    summaries.append((key, state[2]))
+        return summaries
+
+    def _log_summary(self, key: Tuple[str, int, str], suppressed: int):
+        name, levelno, msg = key
+        logging.getLogger(name).log(
+            levelno,
+            "Suppressed %d repeated message(s) like %r (within %g s)",
+            suppressed,
+            msg,
+            self.window,
+            extra=dict(dedup_summary=True),
+        )
+
+    def flush(self):
+        """Log summaries of all suppressed records and reset the filter."""
+        with self._lock:
+            summaries = []
+            for key, state in self._state.items():
+                if state[2]:
+                    summaries.append((key, state[2]))
+            self._state = dict()
+            self._last_sweep = time.monotonic()
+        for summary in summaries:
+            self._log_summary(*summary)
+
+
+def install_dedup_filter(
+    logger: logging.Logger,
+    window: Optional[float] = 60.0,
+    **kwargs,
+) -> Optional[DedupFilter]:
+    """Add ``DedupFilter`` to ``logger`` (idempotent).
+
+    An existing ``DedupFilter`` of the logger is kept (with ``window``
+    updated), ``window=None`` removes it.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger (e.g., ``logging.getLogger("dummy")``).
+    window : Optional[float]
+        Window in seconds (``None`` to remove the filter).
+    **kwargs
+        Other arguments of ``DedupFilter`` (for a new filter).
+
+    Returns
+    -------
+    Optional[DedupFilter]
+        Filter of the logger (``None`` if removed).
+
+    """
+    for filter0 in logger.filters[:]:
+        if isinstance(filter0, DedupFilter):
+            if window is None:
+                filter0.flush()
+                logger.removeFilter(filter0)
+                return None
+            filter0.window = window
+            return filter0
+
+    if window is None:
+        return None
+
+    filter0 = DedupFilter(window=window, **kwargs)
+    logger.addFilter(filter0)
+    return filter0
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+
+"""Logging handlers used by ``Log0``."""
+
+import collections
+import datetime
+import gzip
+import logging
+import logging.handlers
+import os
+import shutil
+import threading
+import time
+
+from typing import Optional
+
+from ..aux_srsly import jsonable
+from ..aux_srsly.aux_srsly import _json_dumps
+
+
+class ThreadQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler passing records to a listener thread as they are.
+
+    Unlike ``logging.handlers.QueueHandler`` the record is not formatted on
+    the calling thread (``prepare`` is a no-op), all formatting is left to
+    the handlers of ``QueueListener``. Records are not pickled (the queue is
+    shared by threads of one process), so message arguments should not be
+    mutated after the logging call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class ProcessQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler sending picklable records to another process.
+
+    The message is merged with its arguments and the exception (if any) is
+    formatted into ``exc_text`` before the record is put on the queue (e.g.,
+    ``multiprocessing.Queue``), the rest of formatting is left to the
+    handlers of the listener.
+    """
+
+    _formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# Attributes of every ``LogRecord`` (anything else comes from ``extra``)
+_LOG_RECORD_ATTRS = frozenset(
+    list(vars(logging.makeLogRecord(dict()))) + ["message", "asctime", "taskName"]
+)
+
+
+class JsonlFormatter(logging.Formatter):
+    """Formatter producing one JSON object per record (JSON lines).
+
+    Fields: ``time`` (ISO 8601 with local time zone), ``level``, ``name``,
+    ``module``, ``funcName``, ``lineno``, ``process``, ``message``,
+    ``exception`` and ``stack`` (if any) followed by fields passed with
+    ``extra`` (converted with ``jsonable``). Non-finite floats are written
+    as ``NaN``, ``Infinity`` and ``-Infinity``.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> log0.info("Batch done", extra=dict(batch=7, docs_per_s=1234.5))
+    >>> df0 = pd.read_json(logZ.of0, lines=True)
+
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = dict(
+            time=datetime.datetime.fromtimestamp(record.created)
+            .astimezone()
+            .isoformat(timespec="milliseconds"),
+            level=record.levelname,
+            name=record.name,
+            module=record.module,
+            funcName=record.funcName,
+            lineno=record.lineno,
+            process=record.process,
+            message=record.getMessage(),
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exception"] = record.exc_text
+        if record.stack_info:
+            out["stack"] = self.formatStack(record.stack_info)
+
+        extra = {
+            key: val
+            for key, val in record.__dict__.items()
+            if key not in _LOG_RECORD_ATTRS and key not in out
+        }
+        if extra:
+            out.update(jsonable(extra))
+        return _json_dumps(out)
+
+
+class BufferingHandler(logging.handlers.MemoryHandler):
+    """Buffer records and write them to the target handler in batches.
+
+    The buffer is flushed when it holds ``capacity`` records, when a record
+    of ``flush_level`` (or higher) arrives, when a record arrives at least
+    ``flush_interval`` seconds after the last flush and on close. Buffered
+    records are also flushed by a daemon thread every ``flush_interval``
+    seconds (started with the first record), so they are written within
+    ``flush_interval`` seconds even if no other record arrives (records
+    still buffered are lost if the process is killed). For stream
+    (file) targets the whole batch is written with one write and one flush
+    (records for rotating file handlers are written one by one, each after
+    checking rotation, and flushed once per batch).
+    """
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        capacity: int = 1000,
+        flush_interval: Optional[float] = 1.0,
+        flush_level: int = logging.ERROR,
+    ):
+        super().__init__(capacity, flushLevel=flush_level, target=target)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._closed = threading.Event()
+        self._flusher = None
+        self._flusher_pid = None
+
+    def emit(self, record: logging.LogRecord):
+        if self._flusher_pid != os.getpid() and self.flush_interval is not None:
+            # (re)start flusher thread, e.g., in forked process
+            self._flusher_pid = os.getpid()
+            self._flusher = threading.Thread(
+                target=self._flush_periodically, name="BufferingHandler", daemon=True
+            )
+            self._flusher.start()
+        super().emit(record)
+
+    def _flush_periodically(self):
+        while True:
+            interval = self.flush_interval
+            if self._closed.wait(1.0 if interval is None else max(interval, 0.01)):
+                return
+            if interval is not None and self.buffer:
+                self.flush()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return super().shouldFlush(record) or (
+            self.flush_interval is not None
+            and time.monotonic() - self._last_flush >= self.flush_interval
+        )
+
+    def flush(self):
+        self.acquire()
+        try:
+            target, records = self.target, self.buffer
+            if target is not None and records:
+                self.buffer = []
+                if getattr(target, "stream", None) is None:
+                    for record in records:
+                        target.handle(record)
+                else:
+                    self._write(target, records)
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self):
+        self._closed.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        super().close()
+
+    @staticmethod
+    def _write(target: logging.StreamHandler, records):
+        rotating = isinstance(target, logging.handlers.BaseRotatingHandler)
+        target.acquire()
+        try:
+            chunks = []
+            for record in records:
+                if record.levelno < target.level or not target.filter(record):
+                    continue
+                try:
+                    if rotating:
+                        # the size check needs previous records in the stream
+                        if target.shouldRollover(record):
+                            target.doRollover()
+                        target.stream.write(target.format(record) + target.terminator)
+                    else:
+                        chunks.append(target.format(record) + target.terminator)
+                except Exception:
+                    target.handleError(record)
+            target.stream.write("".join(chunks))
+            target.flush()
+        finally:
+            target.release()
+
+
+def _gzip_file(source: str, dest: str):
+    """Compress ``source`` to ``dest`` (written under a temporary name)."""
+    head, tail = os.path.split(dest)
+    part = os.path.join(head, f".{tail}.part")
+    with open(source, "rb") as fh_in, gzip.open(part, "wb") as fh_out:
+        shutil.copyfileobj(fh_in, fh_out)
+    os.replace(part, dest)
+    os.remove(source)
+
+
+class _GzipRotationMixin:
+    """Compress rotated log files with gzip on a background thread.
+
+    The rotated file is renamed (to a hidden temporary name) on the logging
+    thread and compressed by a background thread, so a rollover does not
+    block on compression. A rollover waits only for compression of the
+    previous segment (if still running) before renaming older segments.
+    """
+
+    def __init__(self, *args, compress: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._compression: Optional[threading.Thread] = None
+        if compress:
+            self.namer = self._gzip_namer
+            self.rotator = self._gzip_rotator
+
+    @staticmethod
+    def _gzip_namer(name: str) -> str:
+        return f"{name}.gz"
+
+    def _gzip_rotator(self, source: str, dest: str):
+        head, tail = os.path.split(dest)
+        tmp = os.path.join(head, f".{tail}.tmp")
+        os.rename(source, tmp)
+        self._compression = threading.Thread(
+            target=_gzip_file, args=(tmp, dest), name="Log0-gzip"
+        )
+        self._compression.start()
+
+    def wait_for_compression(self):
+        """Wait for compression of the last rotated file (if any)."""
+        if self._compression is not None:
+            self._compression.join()
+            self._compression = None
+
+    def doRollover(self):
+        self.wait_for_compression()
+        super().doRollover()
+
+    def close(self):
+        self.wait_for_compression()
+        super().close()
+
+
+class CompressingRotatingFileHandler(
+    _GzipRotationMixin, logging.handlers.RotatingFileHandler
+):
+    """``RotatingFileHandler`` (rotation by size, at most ``backupCount``
+    segments ``<name>.1.gz``, ``<name>.2.gz``, ...) compressing rotated
+    files on a background thread (``compress=True``).
+    """
+
+
+class CompressingTimedRotatingFileHandler(
+    _GzipRotationMixin, logging.handlers.TimedRotatingFileHandler
+):
+    """``TimedRotatingFileHandler`` (rotation by time, at most
+    ``backupCount`` segments ``<name>.<timestamp>.gz``) compressing rotated
+    files on a background thread (``compress=True``).
+    """
+
+
+class RingBufferHandler(logging.Handler):
+    """Keep the last ``capacity`` records below the level of ``target`` in
+    memory and write them to ``target`` on demand.
+
+    Records are stored as they are (formatted only when dumped). The buffer
+    is dumped (and cleared) when a record of ``dump_level`` (or higher)
+    arrives or when ``dump`` is called, so e.g. DEBUG records preceding an
+    error reach an INFO-level log file. Records are not copied, so message
+    arguments should not be mutated after the logging call.
+    """
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        capacity: int = 1000,
+        dump_level: int = logging.ERROR,
+    ):
+        super().__init__()
+        self.target = target
+        self.dump_level = dump_level
+        self.buffer = collections.deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord):
+        if record.levelno >= self.dump_level:
+            self.dump(f"before {record.levelname} record")
+        elif record.levelno < self._handler().level:
+            self.buffer.append(record)
+
+    def _handler(self) -> logging.Handler:
+        target = self.target
+        if isinstance(target, logging.handlers.MemoryHandler):
+            target = target.target
+        return target
+
+    def dump(self, reason: str = "on request"):
+        """Write buffered records to ``target`` (bypassing its level)."""
+        self.acquire()
+        try:
+            records = list(self.buffer)
+            self.buffer.clear()
+        finally:
+            self.release()
+        if not records:
+            return
+
+        if isinstance(self.target, logging.handlers.MemoryHandler):
+            self.target.flush()  # keep records in order
+        handler = self._handler()
+        header = logging.makeLogRecord(
+            dict(
+                name=records[0].name,
+                levelno=logging.INFO,
+                levelname="INFO",
+                msg="Dumping last %d buffered records (%s):",
+                args=(len(records), reason),
+                funcName="dump",
+            )
+        )
+        handler.acquire()
+        try:
+            for record in [header] + records:
+                handler.emit(record)
+        finally:
+            handler.release()
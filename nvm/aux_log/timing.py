@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+
+"""Timing and throughput statistics of pipeline stages (see ``Log0.timer``)."""
+
+import contextlib
+import logging
+import math
+import threading
+import time
+
+from contexttimer import Timer
+from typing import (
+    Any,
+    Dict,
+    Optional,
+)
+
+
+class StreamingHistogram:
+    """Histogram of positive values with logarithmic buckets.
+
+    Quantiles are estimated with relative error of at most
+    ``relative_accuracy`` using memory proportional to the logarithm of the
+    range of values (not to the number of values), e.g., about 700 buckets
+    for values from 1 ns to 1 hour with the default accuracy of 1 %.
+
+    Examples
+    --------
+    >>> from nvm.aux_log.timing import StreamingHistogram
+    >>> hist = StreamingHistogram()
+    >>> for value in range(1, 101):
+    >>>     hist.add(value)
+    >>> round(hist.quantile(0.5))
+    50
+
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = dict()
+        self.n_zeros = 0
+        self.count = 0
+
+    def add(self, value: float):
+        self.count += 1
+        if value <= 0:
+            self.n_zeros += 1
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """Get estimate of ``q``-quantile (``0 <= q <= 1``, NaN if empty)."""
+        if not self.count:
+            return math.nan
+
+        rank = q * (self.count - 1)
+        cumulative = self.n_zeros
+        if rank < cumulative:
+            return 0.0
+
+        for key in sorted(self.buckets):
+            cumulative += self.buckets[key]
+            if rank < cumulative:
+                return 2 * self.gamma**key / (self.gamma + 1)
+
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class StageStats:
+    """Statistics of one stage: number of calls, total, minimal and maximal
+    time (s), time quantiles and number of items processed.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.n_items = 0
+        self.histogram = StreamingHistogram()
+        self.first = None
+        self.last = None
+
+    def add(self, elapsed: Optional[float], n_items: int, now: float):
+        if elapsed is not None:
+            self.count += 1
+            self.total += elapsed
+            self.min = min(self.min, elapsed)
+            self.max = max(self.max, elapsed)
+            self.histogram.add(elapsed)
+        self.n_items += n_items
+        if self.first is None:
+            self.first = now - (elapsed or 0.0)
+        self.last = now
+
+    def items_per_s(self) -> float:
+        """Get throughput (items per second of wall time since the first call
+        or, for timed stages, per second of time spent in the stage).
+        """
+        seconds = self.total if self.count else (self.last or 0) - (self.first or 0)
+        return self.n_items / seconds if seconds > 0 else math.nan
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(
+            count=self.count,
+            total=self.total,
+            mean=self.total / self.count if self.count else math.nan,
+            min=self.min if self.count else math.nan,
+            max=self.max if self.count else math.nan,
+            p50=self.histogram.quantile(0.50),
+            p95=self.histogram.quantile(0.95),
+            p99=self.histogram.quantile(0.99),
+            n_items=self.n_items,
+            items_per_s=self.items_per_s(),
+        )
+
+
+class StageTimer(contextlib.ContextDecorator):
+    """Timer of one stage (context manager and decorator, see
+    ``Timings.timer``).
+    """
+
+    def __init__(self, timings: "Timings", name: str, n_items: int = 0):
+        self.timings = timings
+        self.name = name
+        self.n_items = n_items
+        self.timer = None
+
+    def _recreate_cm(self):
+        # a new timer for every call of decorated function (thread-safe)
+        return type(self)(self.timings, self.name, self.n_items)
+
+    def __enter__(self):
+        self.timer = Timer(timer=time.perf_counter)
+        self.timer.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.timer.__exit__(exc_type, exc_value, exc_traceback)
+        self.timings.add(self.name, self.timer.elapsed, self.n_items)
+        return False
+
+    @property
+    def elapsed(self) -> float:
+        return self.timer.elapsed
+
+
+class Timings:
+    """Per-stage timing and throughput statistics.
+
+    Statistics of a stage are updated by ``timer`` (time spent in a block or
+    function) and ``rate`` (number of items processed). Every
+    ``report_interval`` seconds (checked on update, optional) a summary of
+    all stages is logged (INFO) and ``report`` returns the final summary.
+
+    Examples
+    --------
+    >>> import logging
+    >>> from nvm.aux_log.timing import Timings
+    >>> timings = Timings(logging.getLogger("dummy"), report_interval=60.0)
+    >>> with timings.timer("tokenize") as timer:
+    >>>     timer.n_items = 1000
+    >>> timings.rate("read", 1000)
+    >>> timings.report()["tokenize"]["count"]
+    1
+
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        report_interval: Optional[float] = None,
+    ):
+        self.logger = logging.getLogger("dummy") if logger is None else logger
+        self.report_interval = report_interval
+        self.stats: Dict[str, StageStats] = dict()
+        self._lock = threading.Lock()
+        self._last_report = time.perf_counter()
+        self._last_items: Dict[str, int] = dict()
+
+    def timer(self, name: str, n_items: int = 0) -> StageTimer:
+        """Get timer of stage ``name`` (context manager or decorator).
+
+        ``n_items`` (number of items processed per call) can also be set on
+        the timer inside the ``with`` block.
+        """
+        return StageTimer(self, name, n_items)
+
+    def rate(self, name: str, n_items: int = 1):
+        """Add ``n_items`` processed items to stage ``name`` (throughput is
+        computed over wall time since the first call).
+        """
+        self.add(name, None, n_items)
+
+    def add(self, name: str, elapsed: Optional[float], n_items: int = 0):
+        now = time.perf_counter()
+        with self._lock:
+            if name not in self.stats:
+                self.stats[name] = StageStats(name)
+            self.stats[name].add(elapsed, n_items, now)
+            due = (
+                self.report_interval is not None
+                and now - self._last_report >= self.report_interval
+            )
+            if due:
+                lines = self._interval_report(now)
+        if due:
+            self.logger.info("Timings:\n%s", "\n".join(lines))
+
+    def _interval_report(self, now: float):
+        seconds = now - self._last_report
+        self._last_report = now
+        lines = []
+        for name, stats in self.stats.items():
+            n_items = stats.n_items - self._last_items.get(name, 0)
+            self._last_items[name] = stats.n_items
+            line = f"  {name}: {n_items / seconds:.1f} items/s"
+            if stats.count:
+                line += (
+                    f", {stats.count} calls, {stats.total:.3f} s total,"
+                    f" p50 {stats.histogram.quantile(0.5) * 1e3:.3f} ms,"
+                    f" p99 {stats.histogram.quantile(0.99) * 1e3:.3f} ms"
+                )
+            lines.append(line)
+        return lines
+
+    def report(self, as_frame: bool = False):
+        """Get statistics of all stages.
+
+        Parameters
+        ----------
+        as_frame : bool
+            Return ``pd.DataFrame`` (one row per stage) instead of dict
+            (stage name -> dict of statistics, defaults to ``False``).
+
+        """
+        with self._lock:
+            report = {name: stats.to_dict() for name, stats in self.stats.items()}
+        if not as_frame:
+            return report
+
+        import pandas as pd
+
+        return pd.DataFrame.from_dict(report, orient="index").rename_axis("name")
+
+    def reset(self):
+        with self._lock:
+            self.stats = dict()
+            self._last_items = dict()
+            self._last_report = time.perf_counter()
@@ -1,4 +1,13 @@
-from .aux_pandas import wine_df
 from .aux_pandas import disp_df
 from .aux_pandas import repr_df
 from .aux_pandas import fix_column_names
+from .aux_pandas import optimize_df
+
+
+def __getattr__(name: str):
+    # ``wine_df`` is loaded lazily (see ``aux_pandas.__getattr__``)
+    if name == "wine_df":
+        from . import aux_pandas
+
+        return aux_pandas.wine_df
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,345 @@
 #!/usr/bin/env python3
 
+import collections
+import functools
+import io
+import logging
+import os
+import pathlib
+import sys
 import numpy as np
 import pandas as pd
 from contextlib import ExitStack
-from IPython.core.display import display
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from sklearn.datasets import load_wine
 
+@functools.lru_cache(maxsize=None)
+def _load_wine():
+    """Load the wine dataset (scikit-learn is imported on first use)."""
+    from sklearn.datasets import load_wine
 
-wine_ds = load_wine()
-wine_df = pd.DataFrame(
-    data=np.c_[wine_ds["data"], wine_ds["target"]],
-    columns=wine_ds["feature_names"] + ["target"],
-)
+    wine_ds = load_wine()
+    wine_df = pd.DataFrame(
+        data=np.c_[wine_ds["data"], wine_ds["target"]],
+        columns=wine_ds["feature_names"] + ["target"],
+    )
+    return wine_ds, wine_df
+
+
+def __getattr__(name: str):
+    # ``wine_ds`` and ``wine_df`` are loaded lazily (PEP 562)
+    if name == "wine_ds":
+        return _load_wine()[0]
+    if name == "wine_df":
+        return _load_wine()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _display(obj):
+    """Display object in IPython (e.g., notebook), print it otherwise."""
+    ipython = sys.modules.get("IPython")
+    if ipython is None or ipython.get_ipython() is None:
+        print(obj)
+        return
 
+    from IPython.display import display
 
-def fix_column_names(df0, lowercase=False):
-    df0.columns = df0.columns.str.strip()
-    df0.columns = df0.columns.map(lambda x: x.replace(" ", "_"))
-    df0.columns = df0.columns.map(lambda x: x.replace("-", "_"))
-    df0.columns = df0.columns.map(lambda x: x.replace(".", "_"))
+    display(obj)
+
+
+# Normalized column names of recently seen schemas (all-string columns only)
+_FIXED_COLUMN_NAMES = collections.OrderedDict()
+_FIXED_COLUMN_NAMES_MAXSIZE = 32
+
+
+def _fix_column_names(
+    columns: pd.Index, lowercase: bool
+) -> Tuple[List[Any], Dict[Any, List[Any]]]:
+    """Get normalized column names and collisions (new name -> old names)."""
+    key = (lowercase, tuple(columns.tolist()))
+    try:
+        _FIXED_COLUMN_NAMES.move_to_end(key)
+        return _FIXED_COLUMN_NAMES[key]
+    except KeyError:
+        pass
+
+    # NOTE: chained ``str.replace`` is faster than ``str.translate`` here
+    names = [
+        name.strip().replace(" ", "_").replace("-", "_").replace(".", "_")
+        if isinstance(name, str)
+        else name
+        for name in key[1]
+    ]
     if lowercase:
-        df0.columns = df0.columns.map(str.lower)
+        names = [name.lower() if isinstance(name, str) else name for name in names]
+
+    collisions = dict()
+    if len(set(names)) < len(names):
+        sources = collections.defaultdict(set)
+        for old, new in zip(key[1], names):
+            sources[new].add(old)
+        collisions = {
+            new: sorted(old, key=repr) for new, old in sources.items() if len(old) > 1
+        }
+
+    if all(isinstance(name, str) for name in key[1]):
+        _FIXED_COLUMN_NAMES[key] = names, collisions
+        if len(_FIXED_COLUMN_NAMES) > _FIXED_COLUMN_NAMES_MAXSIZE:
+            _FIXED_COLUMN_NAMES.popitem(last=False)
+
+    return names, collisions
+
+
+def fix_column_names(
+    df0: pd.DataFrame,
+    lowercase: bool = False,
+    inplace: bool = False,
+    return_mapping: bool = False,
+    collisions: str = "warn",
+    log0: Optional[logging.Logger] = logging.getLogger("dummy"),
+) -> Union[pd.DataFrame, Dict[Any, Any]]:
+    """Normalize column names (strip, replace ``" "``, ``"-"``, ``"."`` with ``"_"``).
+
+    All names are normalized in a single pass over the column names (no
+    per-replacement passes over the index) and results are cached for recently seen
+    schemas, so repeated calls on very wide frames are cheap. Non-string
+    column names are left untouched.
+
+    Parameters
+    ----------
+    df0 : pd.DataFrame
+        Data frame.
+    lowercase : bool
+        Convert names to lowercase (defaults to ``False``).
+    inplace : bool
+        Rename columns of ``df0`` in place (defaults to ``False``, i.e., a
+        shallow copy, sharing data with ``df0``, is returned).
+    return_mapping : bool
+        Return mapping of changed names (old -> new), e.g., for
+        ``df0.rename(columns=mapping)``, instead of renaming columns
+        (defaults to ``False``).
+    collisions : str
+        What to do if distinct names become the same after normalization:
+        ``"raise"`` (``ValueError``), ``"warn"`` (log warning, default) or
+        ``"ignore"``.
+    log0 : Optional[logging.Logger]
+        Logger (optional).
+
+    Returns
+    -------
+    Union[pd.DataFrame, Dict[Any, Any]]
+        Data frame with normalized column names (or mapping, see
+        ``return_mapping``).
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from nvm.aux_pandas import fix_column_names
+    >>> df0 = pd.DataFrame(columns=[" Word Count", "noun-ratio", "x.y", 42])
+    >>> fix_column_names(df0, lowercase=True).columns.tolist()
+    ['word_count', 'noun_ratio', 'x_y', 42]
+    >>> fix_column_names(df0, return_mapping=True)
+    {' Word Count': 'Word_Count', 'noun-ratio': 'noun_ratio', 'x.y': 'x_y'}
+
+    """
+    if collisions not in ("raise", "warn", "ignore"):
+        raise ValueError(
+            f"Unknown collisions option {collisions!r} "
+            f"(expected 'raise', 'warn' or 'ignore')"
+        )
 
+    names, collided = _fix_column_names(df0.columns, lowercase)
+    if collided and collisions != "ignore":
+        message = f"Column names collide after normalization: {collided!r}"
+        if collisions == "raise":
+            raise ValueError(message)
+        log0.warning(message)
+
+    if return_mapping:
+        return {old: new for old, new in zip(df0.columns.tolist(), names) if old != new}
+
+    if not inplace:
+        df0 = df0.copy(deep=False)
+    df0.columns = pd.Index(names, name=df0.columns.name)
     return df0
 
 
+def _optimized_column(
+    ser: pd.Series,
+    downcast_float: bool,
+    category_max_ratio: float,
+    downcast_unsigned: bool = False,
+) -> pd.Series:
+    """Get column converted to a smaller dtype (or the column itself)."""
+    dtype = ser.dtype
+    if not isinstance(dtype, np.dtype):
+        if pd.api.types.is_string_dtype(dtype) and not isinstance(
+            dtype, pd.CategoricalDtype
+        ):
+            return _categorical_column(ser, category_max_ratio)
+        return ser  # extension dtypes (categorical, nullable, ...)
+
+    if dtype.kind in "iu":
+        if not len(ser):
+            return ser
+        # signed by default (differences of counts must not wrap around)
+        unsigned = dtype.kind == "u" or (downcast_unsigned and ser.min() >= 0)
+        downcast = "unsigned" if unsigned else "integer"
+        return pd.to_numeric(ser, downcast=downcast)
+
+    if dtype.kind == "f":
+        if downcast_float and dtype.itemsize > 4:
+            return ser.astype(np.float32)
+        return ser
+
+    if dtype.kind == "O":
+        return _categorical_column(ser, category_max_ratio)
+
+    return ser
+
+
+def _categorical_column(ser: pd.Series, category_max_ratio: float) -> pd.Series:
+    if not len(ser):
+        return ser
+
+    try:
+        n_unique = ser.nunique(dropna=False)
+    except TypeError:  # unhashable values (e.g., lists)
+        return ser
+
+    if n_unique > category_max_ratio * len(ser):
+        return ser
+
+    return ser.astype("category")
+
+
+def optimize_df(
+    df0: pd.DataFrame,
+    downcast_float: Union[bool, Iterable[Any]] = True,
+    category_max_ratio: float = 0.5,
+    downcast_unsigned: bool = False,
+    inplace: bool = False,
+    report: bool = False,
+    log0: Optional[logging.Logger] = logging.getLogger("dummy"),
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Reduce memory usage of data frame by converting columns to smaller dtypes.
+
+    - integer columns are downcast to the smallest signed integer type
+      holding their values (unsigned only if ``downcast_unsigned`` or the
+      column is unsigned already),
+    - float columns are converted to ``float32`` (if allowed, see
+      ``downcast_float``),
+    - low-cardinality string columns (e.g., BIDS ``sub``/``ses``/``task``
+      values or lexicon names) are converted to categoricals.
+
+    Columns are converted one at a time, so at most one extra column (never
+    a second full copy of the frame) is held in memory.
+
+    Parameters
+    ----------
+    df0 : pd.DataFrame
+        Data frame.
+    downcast_float : Union[bool, Iterable[Any]]
+        Convert float columns to ``float32``: ``True`` (all columns, default),
+        ``False`` (none) or names of columns where it is allowed.
+    category_max_ratio : float
+        Convert string column to categorical if its number of unique values
+        is at most ``category_max_ratio`` times its length (defaults to
+        ``0.5``).
+    downcast_unsigned : bool
+        Downcast non-negative integer columns to unsigned types (defaults to
+        ``False``, note that arithmetic of unsigned columns wraps around,
+        e.g., ``uint8`` difference ``1 - 2`` is ``255``).
+    inplace : bool
+        Replace columns of ``df0`` in place (defaults to ``False``, i.e., a
+        shallow copy sharing unchanged columns with ``df0`` is returned).
+    report : bool
+        Also return a report (data frame) with dtypes and memory usage (in
+        bytes) of every column before and after (defaults to ``False``).
+    log0 : Optional[logging.Logger]
+        Logger (optional).
+
+    Returns
+    -------
+    Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+        Optimized data frame (and report, see ``report``).
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from nvm.aux_pandas import optimize_df
+    >>> df0 = pd.DataFrame(
+    >>>     dict(sub=["01", "01", "02", "02"], count=[1, 2, 3, 4], ratio=[0.5] * 4)
+    >>> )
+    >>> df1, df1_report = optimize_df(df0, report=True)
+    >>> df1_report[["column", "dtype_before", "dtype_after"]]
+      column dtype_before dtype_after
+    0    sub       object    category
+    1  count        int64        int8
+    2  ratio      float64     float32
+
+    """
+    if not inplace:
+        df0 = df0.copy(deep=False)
+
+    if not isinstance(downcast_float, bool):
+        downcast_float = set(downcast_float)
+
+    rows = []
+    for idx, column in enumerate(df0.columns):
+        ser = df0.iloc[:, idx]
+        allowed = (
+            downcast_float
+            if isinstance(downcast_float, bool)
+            else column in downcast_float
+        )
+        new = _optimized_column(ser, allowed, category_max_ratio, downcast_unsigned)
+        if report:
+            rows.append(
+                dict(
+                    column=column,
+                    dtype_before=str(ser.dtype),
+                    dtype_after=str(new.dtype),
+                    memory_before=ser.memory_usage(index=False, deep=True),
+                    memory_after=new.memory_usage(index=False, deep=True),
+                )
+            )
+        if new is not ser:
+            if hasattr(df0, "isetitem"):  # pandas>=1.5
+                df0.isetitem(idx, new)
+            else:
+                df0[column] = new
+        del ser, new
+
+    if not report:
+        return df0
+
+    df0_report = pd.DataFrame(
+        rows,
+        columns=[
+            "column",
+            "dtype_before",
+            "dtype_after",
+            "memory_before",
+            "memory_after",
+        ],
+    )
+    log0.info(
+        f"Memory usage: {df0_report.memory_before.sum() / 2**20:.2f} MiB -> "
+        f"{df0_report.memory_after.sum() / 2**20:.2f} MiB"
+    )
+    return df0, df0_report
+
+
 def _context_pandas(
     max_columns=222,
     max_colwidth=44,
@@ -43,9 +357,194 @@ def _context_pandas(
     ]
 
 
-def disp_df(df0, **opt):
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def _read_tail_lines(path: pathlib.Path, n_lines: int, block_size: int = 2**16):
+    """Read last lines of file by seeking backwards from its end.
+
+    Returns the lines and ``True`` if the whole file was read.
+    """
+    with open(path, "rb") as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0 and data.rstrip(b"\r\n").count(b"\n") <= n_lines:
+            step = min(block_size, pos)
+            pos -= step
+            fh.seek(pos)
+            data = fh.read(step) + data
+
+    lines = data.rstrip(b"\r\n").split(b"\n")
+    if pos > 0:
+        lines = lines[1:]  # first line may be partial
+    return lines[-n_lines:] if n_lines else [], pos == 0
+
+
+def _count_lines(path: pathlib.Path, block_size: int = 2**20) -> int:
+    """Count lines (newline characters, no CSV parsing) of a file."""
+    count, last = 0, b"\n"
+    with open(path, "rb") as fh:
+        for block in iter(functools.partial(fh.read, block_size), b""):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count + (last != b"\n")
+
+
+def _preview_csv(
+    path: pathlib.Path, n_rows: int, count_rows: bool, read_kwargs: Mapping
+) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[int]]:
+    if path.suffix.lower() == ".tsv":
+        read_kwargs = dict(dict(sep="\t"), **read_kwargs)
+
+    head = pd.read_csv(path, nrows=n_rows, **read_kwargs)
+    lines, whole = _read_tail_lines(path, n_rows)
+    if whole:
+        df0 = pd.read_csv(path, **read_kwargs)
+        return df0.head(n_rows), df0.iloc[n_rows:].tail(n_rows), len(df0)
+
+    tail = pd.read_csv(
+        io.BytesIO(b"\n".join(lines)),
+        header=None,
+        names=head.columns,
+        **{key: val for key, val in read_kwargs.items() if key != "header"},
+    )
+    n_total = _count_lines(path) - 1 if count_rows else None
+    return head, tail, n_total
+
+
+def _preview_parquet(
+    path: pathlib.Path, n_rows: int
+) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[int]]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as err:
+        raise ImportError("Reading Parquet files requires pyarrow") from err
+
+    pf = pq.ParquetFile(path)
+    n_total = pf.metadata.num_rows
+    if n_total <= 2 * n_rows:
+        df0 = pf.read().to_pandas()
+        return df0.head(n_rows), df0.iloc[n_rows:], n_total
+
+    head = next(pf.iter_batches(batch_size=n_rows)).to_pandas()
+    tables, n_tail = [], 0
+    for idx in reversed(range(pf.num_row_groups)):
+        tables.insert(0, pf.read_row_group(idx))
+        n_tail += tables[0].num_rows
+        if n_tail >= n_rows:
+            break
+    tail = pa.concat_tables(tables).slice(n_tail - n_rows).to_pandas()
+    return head, tail, n_total
+
+
+def _preview_chunks(
+    chunks: Iterable[pd.DataFrame], n_rows: int
+) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[int]]:
+    head, tail, n_total = None, None, 0
+    for chunk in chunks:
+        n_total += len(chunk)
+        if head is None:
+            head = chunk.head(n_rows)
+            chunk = chunk.iloc[n_rows:]
+        elif len(head) < n_rows:
+            n_missing = n_rows - len(head)
+            head = pd.concat([head, chunk.head(n_missing)])
+            chunk = chunk.iloc[n_missing:]
+        tail = chunk.tail(n_rows) if tail is None else pd.concat([tail, chunk])
+        tail = tail.tail(n_rows)
+
+    if head is None:
+        return pd.DataFrame(), pd.DataFrame(), 0
+    return head, tail, n_total
+
+
+def _preview(
+    obj: Any, n_rows: int, count_rows: bool, read_kwargs: Optional[Mapping]
+) -> Tuple[pd.DataFrame, str]:
+    """Get head and tail (single frame) of file or chunks and its description."""
+    read_kwargs = dict() if read_kwargs is None else read_kwargs
+    if isinstance(obj, (str, os.PathLike)):
+        path = pathlib.Path(obj)
+        source = str(path)
+        if path.suffix.lower() in _PARQUET_SUFFIXES:
+            head, tail, n_total = _preview_parquet(path, n_rows)
+        else:
+            head, tail, n_total = _preview_csv(path, n_rows, count_rows, read_kwargs)
+    else:
+        source = type(obj).__name__
+        head, tail, n_total = _preview_chunks(obj, n_rows)
+
+    head = head.set_axis(range(len(head)), axis=0)
+    if n_total is None:
+        tail = tail.set_axis(range(-len(tail), 0), axis=0)
+    else:
+        tail = tail.set_axis(range(n_total - len(tail), n_total), axis=0)
+    preview = pd.concat([head, tail]) if len(tail) else head
+
+    dtypes = pd.DataFrame({"dtype": preview.dtypes.astype(str)}).T
+    description = (
+        f"{source}: {'?' if n_total is None else n_total} rows "
+        f"x {preview.shape[1]} columns\n{dtypes}"
+    )
+    return preview, description
+
+
+def _is_preview_source(obj: Any) -> bool:
+    """Check if object is a file path or an iterator of chunks.
+
+    Strings are paths only if such file exists, other iterables (arrays,
+    lists, dicts, group-by objects etc.) are displayed as they are.
+    """
+    if isinstance(obj, os.PathLike):
+        return True
+    if isinstance(obj, str):
+        return os.path.isfile(obj)
+    if isinstance(obj, pd.io.parsers.TextFileReader):
+        return True
+    return not isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)) and hasattr(
+        obj, "__next__"
+    )
+
+
+def disp_df(
+    df0,
+    n_rows: int = 5,
+    count_rows: bool = False,
+    read_kwargs: Optional[Mapping] = None,
+    **opt,
+):
     """Display DF using custom formatting context.
 
+    Uses IPython ``display`` when running in IPython (e.g., in a notebook)
+    and plain ``print`` otherwise.
+
+    Besides a data frame ``df0`` can be a path to CSV (TSV) or Parquet file
+    or an iterator of data frame chunks (e.g., ``pd.read_csv(...,
+    chunksize=...)`` or a generator). Then only the first and the last
+    ``n_rows`` rows are displayed together with the number of rows and
+    column dtypes. Files are not read in full: the tail of CSV file is read
+    by seeking from its end and Parquet files are read by row groups
+    (``pyarrow`` is required). Chunks are consumed one by one keeping only
+    the head and the tail. Other objects (including strings which are not
+    paths of existing files) are displayed unchanged.
+
+    Parameters
+    ----------
+    df0 : Union[pd.DataFrame, str, os.PathLike, Iterable[pd.DataFrame]]
+        Data frame, path to file or iterator of chunks.
+    n_rows : int
+        Number of the first and the last rows to be shown for files and
+        chunks (defaults to ``5``).
+    count_rows : bool
+        Count rows of CSV file (scans the file for newlines, without
+        parsing, defaults to ``False``). If not counted the tail rows are
+        indexed from ``-n_rows``.
+    read_kwargs : Optional[Mapping]
+        Extra arguments for ``pd.read_csv`` (e.g., ``sep``).
+    **opt
+        Formatting options (see ``_context_pandas``).
+
     Examples
     --------
     >>> import numpy as np
@@ -53,16 +552,32 @@ def disp_df(df0, **opt):
     >>> from nvm import disp_df
     >>> from nvm.aux_pandas import wine_df
     >>> disp_df(df0)
+    >>> disp_df("scores.csv", n_rows=3)
+    >>> disp_df(pd.read_csv("scores.csv", chunksize=100_000))
 
     """
     with ExitStack() as stack:
         _ = [stack.enter_context(cont) for cont in _context_pandas(**opt)]
-        display(df0)
+        if not _is_preview_source(df0):
+            _display(df0)
+            return
+
+        preview, description = _preview(df0, n_rows, count_rows, read_kwargs)
+        print(description)
+        _display(preview)
 
 
-def repr_df(df0, **opt):
+def repr_df(
+    df0,
+    n_rows: int = 5,
+    count_rows: bool = False,
+    read_kwargs: Optional[Mapping] = None,
+    **opt,
+):
     """Get DF repr using custom formatting context.
 
+    Accepts file paths and iterators of chunks, see ``disp_df``.
+
     Examples
     --------
     >>> import numpy as np
@@ -70,8 +585,13 @@ def repr_df(df0, **opt):
     >>> from nvm import disp_df
     >>> from nvm.aux_pandas import wine_df
     >>> print(repr_df(df0))
+    >>> print(repr_df("scores.parquet"))
 
     """
     with ExitStack() as stack:
         _ = [stack.enter_context(cont) for cont in _context_pandas(**opt)]
-        return str(df0)
+        if not _is_preview_source(df0):
+            return str(df0)
+
+        preview, description = _preview(df0, n_rows, count_rows, read_kwargs)
+        return f"{description}\n{preview}"
@@ -7,6 +7,13 @@
 
 from .set_container_extensions import set_container_extensions_from_dict
 
+from .clean_str_tokenizer import CleanStrTokenizer
+from .clean_str_tokenizer import set_clean_str_tokenizer
+from .clean_str_tokenizer import get_clean_str_offsets
+from .clean_str_tokenizer import get_raw_char_span
+
+from .doc_to_dataframe import doc_to_dataframe
+
 from .factories.get_doc_word_count import get_doc_word_count_component
 from .factories.get_doc_basic_metrics import get_doc_basic_metrics_component
 from .factories.get_doc_count_of_dict_items import get_doc_count_of_dict_items_component
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+
+import logging
+import numpy as np
+from spacy.language import Language
+from spacy.tokens import Doc, Span, Token
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from ..aux_str import CLEAN_STR_MAPPINGS_TINY
+from ..aux_str import CleanStrCache
+from ..aux_str import compile_clean_str
+from .set_container_extensions import set_container_extensions_from_dict
+
+
+CLEAN_STR_OFFSETS_KEY = "clean_str_offsets"
+
+
+def get_clean_str_offsets(doc: Doc) -> Optional[np.ndarray]:
+    """Get offsets aligning ``doc.text`` (clean text) with the raw text.
+
+    Parameters
+    ----------
+    doc : Doc
+        Document created by ``CleanStrTokenizer``.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        Array (``int32``) such that ``offsets[i]`` is the position in the raw
+        text of ``doc.text[i]`` (the extra last element maps the end of
+        ``doc.text``), or ``None`` if the document was not cleaned.
+
+    """
+    return doc.user_data.get(CLEAN_STR_OFFSETS_KEY)
+
+
+def get_raw_char_span(doc: Doc, start_char: int, end_char: int) -> Tuple[int, int]:
+    """Map character span of ``doc.text`` (clean text) to the raw text.
+
+    Parameters
+    ----------
+    doc : Doc
+        Document created by ``CleanStrTokenizer``.
+    start_char : int
+        Start (character index) in ``doc.text``.
+    end_char : int
+        End (character index, exclusive) in ``doc.text``.
+
+    Returns
+    -------
+    Tuple[int, int]
+        Start and end (exclusive) of the corresponding span of the raw text.
+        The input span is returned if the document was not cleaned.
+
+    """
+    offsets = get_clean_str_offsets(doc)
+    if offsets is None:
+        return start_char, end_char
+
+    return int(offsets[start_char]), int(offsets[end_char])
+
+
+def _token_raw_idx(token: Token) -> int:
+    offsets = get_clean_str_offsets(token.doc)
+    return token.idx if offsets is None else int(offsets[token.idx])
+
+
+def _span_raw_char_span(span: Span) -> Tuple[int, int]:
+    return get_raw_char_span(span.doc, span.start_char, span.end_char)
+
+
+class CleanStrTokenizer:
+    """Tokenizer wrapper cleaning text with ``clean_str`` before tokenization.
+
+    Cleaning happens inside ``nlp.make_doc``, i.e., within the ``nlp.pipe``
+    batch loop, so no separate cleaning pass (and no extra copy of the corpus)
+    is needed. Offsets aligning the clean text (``doc.text``) with the raw text
+    are kept in ``doc.user_data`` as a compact ``int32`` array (see
+    ``get_clean_str_offsets``) and exposed through ``Token._.raw_idx`` and
+    ``Span._.raw_char_span`` extensions.
+
+    Parameters
+    ----------
+    tokenizer : Callable[[str], Doc]
+        Tokenizer to be wrapped (usually ``nlp.tokenizer``).
+    mappings : List[Dict[str, List[Union[str, Pattern[str]]]]]
+        Mappings, see ``nvm.aux_str.clean_str`` (defaults to
+        ``CLEAN_STR_MAPPINGS_TINY``).
+    cache : Union[None, bool, int, CleanStrCache]
+        Optional cache, see ``nvm.aux_str.compile_clean_str``.
+    offsets : bool
+        Keep offsets alignment (defaults to ``True``).
+    log0 : Optional[logging.Logger]
+        Logger (optional).
+
+    Examples
+    --------
+    >>> import spacy
+    >>> from nvm.aux_str import CLEAN_STR_MAPPINGS_LARGE
+    >>> from nvm.aux_spacy import set_clean_str_tokenizer
+    >>>
+    >>> nlp = spacy.blank("en")
+    >>> set_clean_str_tokenizer(nlp, mappings=CLEAN_STR_MAPPINGS_LARGE)
+    >>>
+    >>> raw = "  Good\\u00A0news —\\n\\tgood   news!  "
+    >>> for doc in nlp.pipe([raw]):
+    >>>     print(doc.text)
+    >>>     start, end = doc[3:5]._.raw_char_span
+    >>>     print(repr(raw[start:end]))
+    Good news - good news!
+    'good   news'
+
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        mappings: List[
+            Dict[str, List[Union[str, Pattern[str]]]]
+        ] = CLEAN_STR_MAPPINGS_TINY,
+        cache: Union[None, bool, int, CleanStrCache] = None,
+        offsets: bool = True,
+        log0: Optional[logging.Logger] = logging.getLogger("dummy"),
+    ):
+        self.tokenizer = tokenizer
+        self.cleaner = compile_clean_str(mappings, cache=cache)
+        self.offsets = offsets
+
+        set_container_extensions_from_dict(
+            Token, dict(raw_idx=_token_raw_idx), log0=log0
+        )
+        set_container_extensions_from_dict(
+            Span, dict(raw_char_span=_span_raw_char_span), log0=log0
+        )
+
+    def __call__(self, text: str) -> Doc:
+        if not self.offsets:
+            return self.tokenizer(self.cleaner(text))
+
+        text, offsets = self.cleaner.clean_with_offsets(text)
+        doc = self.tokenizer(text)
+        doc.user_data[CLEAN_STR_OFFSETS_KEY] = np.frombuffer(offsets, dtype=np.int32)
+        return doc
+
+    # Serialization is delegated to the wrapped tokenizer (``nlp.to_disk``, etc.)
+    def to_bytes(self, **kwargs):
+        return self.tokenizer.to_bytes(**kwargs)
+
+    def from_bytes(self, bytes_data, **kwargs):
+        self.tokenizer.from_bytes(bytes_data, **kwargs)
+        return self
+
+    def to_disk(self, path, **kwargs):
+        return self.tokenizer.to_disk(path, **kwargs)
+
+    def from_disk(self, path, **kwargs):
+        self.tokenizer.from_disk(path, **kwargs)
+        return self
+
+
+def set_clean_str_tokenizer(
+    nlp: Language,
+    mappings: List[Dict[str, List[Union[str, Pattern[str]]]]] = CLEAN_STR_MAPPINGS_TINY,
+    cache: Union[None, bool, int, CleanStrCache] = None,
+    offsets: bool = True,
+    log0: Optional[logging.Logger] = logging.getLogger("dummy"),
+) -> CleanStrTokenizer:
+    """Make ``nlp`` clean texts with ``clean_str`` before tokenization.
+
+    Replaces ``nlp.tokenizer`` with ``CleanStrTokenizer`` wrapping the current
+    tokenizer (see ``CleanStrTokenizer`` for details and parameters).
+
+    Returns
+    -------
+    CleanStrTokenizer
+        The new tokenizer.
+
+    Examples
+    --------
+    >>> import spacy
+    >>> from nvm.aux_spacy import set_clean_str_tokenizer
+    >>> nlp = spacy.blank("en")
+    >>> set_clean_str_tokenizer(nlp)
+    >>> doc = nlp("  one\\t\\ttwo  ")
+    >>> doc.text
+    'one two'
+    >>> doc[1]._.raw_idx
+    7
+
+    """
+    tokenizer = nlp.tokenizer
+    if isinstance(tokenizer, CleanStrTokenizer):
+        tokenizer = tokenizer.tokenizer
+
+    nlp.tokenizer = CleanStrTokenizer(
+        tokenizer,
+        mappings=mappings,
+        cache=cache,
+        offsets=offsets,
+        log0=log0,
+    )
+    return nlp.tokenizer
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import pandas as pd
+from spacy.attrs import IDS
+from spacy.tokens import Doc, Token
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+
+# Token attributes stored as string hashes (name -> attribute ID)
+_STRING_ATTRS = {
+    "text": IDS["ORTH"],
+    "orth_": IDS["ORTH"],
+    "lemma_": IDS["LEMMA"],
+    "norm_": IDS["NORM"],
+    "lower_": IDS["LOWER"],
+    "shape_": IDS["SHAPE"],
+    "prefix_": IDS["PREFIX"],
+    "suffix_": IDS["SUFFIX"],
+    "pos_": IDS["POS"],
+    "tag_": IDS["TAG"],
+    "dep_": IDS["DEP"],
+    "ent_type_": IDS["ENT_TYPE"],
+    "ent_id_": IDS["ENT_ID"],
+    "ent_kb_id_": IDS["ENT_KB_ID"],
+    "lang_": IDS["LANG"],
+}
+
+# Boolean token attributes (name -> attribute ID)
+_FLAG_ATTRS = {
+    name.lower(): IDS[name]
+    for name in [
+        "IS_ALPHA",
+        "IS_ASCII",
+        "IS_DIGIT",
+        "IS_LOWER",
+        "IS_UPPER",
+        "IS_TITLE",
+        "IS_PUNCT",
+        "IS_SPACE",
+        "IS_STOP",
+        "IS_BRACKET",
+        "IS_QUOTE",
+        "IS_LEFT_PUNCT",
+        "IS_RIGHT_PUNCT",
+        "IS_CURRENCY",
+        "LIKE_NUM",
+        "LIKE_URL",
+        "LIKE_EMAIL",
+    ]
+}
+
+# Integer token attributes (name -> attribute ID)
+_INT_ATTRS = {"idx": IDS["IDX"]}
+
+
+def _sent_start_values(values: np.ndarray) -> np.ndarray:
+    """Convert ``SENT_START`` values (1, -1, 0) to ``is_sent_start``."""
+    out = np.full(len(values), None, dtype=object)
+    out[values == 1] = True
+    out[values == -1] = False
+    return out
+
+
+def _extension_getter(name: str) -> Callable[[Token], Any]:
+    """Get function evaluating token extension (calling its getter directly)."""
+    default, method, getter, setter = Token.get_extension(name)
+    if getter is not None:
+        return getter
+
+    if method is not None:
+        return lambda token: getattr(token._, name)
+
+    # attribute extensions are stored in ``doc.user_data``
+    def get_attribute(token: Token) -> Any:
+        return token.doc.user_data.get(("._.", name, token.idx, None), default)
+
+    return get_attribute
+
+
+def doc_to_dataframe(
+    doc_or_docs: Union[Doc, Iterable[Doc]],
+    attrs: Sequence[str] = ("text", "lemma_", "pos_", "tag_"),
+    extensions: Optional[Sequence[str]] = None,
+    doc_index: str = "doc",
+) -> pd.DataFrame:
+    """Get data frame of token attributes (one row per token).
+
+    Built-in attributes are read with ``Doc.to_array`` (all of them at once,
+    per document), string attributes are mapped from hashes to strings with
+    a single vocabulary lookup per unique value (over all documents) and
+    token extensions are evaluated by calling their getters directly (no
+    ``token._`` proxy per value). Attributes that ``Doc.to_array`` does not
+    provide (e.g., ``i``, ``ent_iob_`` or ``sent``) are read token by token.
+
+    Parameters
+    ----------
+    doc_or_docs : Union[Doc, Iterable[Doc]]
+        Document or documents (e.g., ``nlp.pipe(texts)``).
+    attrs : Sequence[str]
+        Token attributes (e.g., ``"text"``, ``"lemma_"``, ``"is_alpha"``,
+        ``"is_sent_start"``, defaults to text, lemma, POS and tag).
+    extensions : Optional[Sequence[str]]
+        Token extensions (e.g., ``list(Underscore.token_extensions)``).
+    doc_index : str
+        Name of the column with document index (added for multiple
+        documents only, defaults to ``"doc"``).
+
+    Returns
+    -------
+    pd.DataFrame
+        Data frame with ``attrs`` and ``extensions`` columns.
+
+    Examples
+    --------
+    >>> import spacy
+    >>> from spacy.tokens.underscore import Underscore
+    >>> from nvm import disp_df
+    >>> from nvm.aux_spacy import doc_to_dataframe
+    >>>
+    >>> dict0 = {"pos": ["good", "marvel*"], "neg": ["bad", "awful*"]}
+    >>> nlp = spacy.load("en_core_web_sm")
+    >>> nlp.add_pipe("get_doc_count_of_dict_items", "LEX0", config=dict(dict0=dict0))
+    >>>
+    >>> tok_exts = list(Underscore.token_extensions.keys())
+    >>> doc = nlp("GoOd. Bad Good WhatEver Awful Marvelous.")
+    >>> df0 = doc_to_dataframe(
+    >>>     doc,
+    >>>     attrs=["text", "lemma_", "pos_", "tag_"],
+    >>>     extensions=tok_exts[:12],
+    >>> )
+    >>> disp_df(df0)
+    >>>
+    >>> texts = ["Good news.", "Bad news!"]
+    >>> df1 = doc_to_dataframe(nlp.pipe(texts), attrs=["text", "is_alpha"])
+    >>> df1.doc.tolist()
+    [0, 0, 0, 1, 1, 1]
+
+    """
+    single = isinstance(doc_or_docs, Doc)
+    docs = [doc_or_docs] if single else list(doc_or_docs)
+    extensions = [] if extensions is None else list(extensions)
+    getters = {name: _extension_getter(name) for name in extensions}
+
+    attr_ids = dict()
+    for name in attrs:
+        for table in (_STRING_ATTRS, _FLAG_ATTRS, _INT_ATTRS):
+            if name in table:
+                attr_ids[name] = table[name]
+        if name == "is_sent_start":
+            attr_ids[name] = IDS["SENT_START"]
+    array_ids = list(dict.fromkeys(attr_ids.values()))
+
+    arrays = []
+    columns: Dict[str, List[Any]] = {
+        name: [] for name in list(attrs) + extensions if name not in attr_ids
+    }
+    for doc in docs:
+        if array_ids:
+            arrays.append(doc.to_array(array_ids).reshape(len(doc), len(array_ids)))
+        for name in columns:
+            if name in getters:
+                getter = getters[name]
+                columns[name].extend([getter(token) for token in doc])
+            else:
+                columns[name].extend([getattr(token, name) for token in doc])
+
+    data = dict()
+    if not single:
+        data[doc_index] = np.repeat(
+            np.arange(len(docs)), [len(doc) for doc in docs]
+        ).astype(np.int64)
+
+    values = (
+        np.concatenate(arrays)
+        if arrays
+        else np.zeros((0, len(array_ids)), dtype=np.uint64)
+    )
+    for name in attrs:
+        if name not in attr_ids:
+            data[name] = columns[name]
+            continue
+
+        column = values[:, array_ids.index(attr_ids[name])]
+        if name in _STRING_ATTRS:
+            uniq, inverse = np.unique(column, return_inverse=True)
+            lookup = np.array(
+                [docs[0].vocab.strings[int(key)] for key in uniq], dtype=object
+            )
+            data[name] = lookup[inverse.reshape(-1)]
+        elif name in _FLAG_ATTRS:
+            data[name] = column.astype(bool)
+        elif name == "is_sent_start":
+            data[name] = _sent_start_values(column.astype(np.int64))
+        else:
+            data[name] = column.astype(np.int64)
+
+    for name in extensions:
+        data[name] = columns[name]
+
+    return pd.DataFrame(data, columns=list(data))
@@ -24,24 +24,24 @@ def get_doc_basic_metrics_component(
     Examples
     --------
     >>> import spacy
-    >>> from dframcy import DframCy
+    >>> from spacy.tokens.underscore import Underscore
     >>>
     >>> from nvm import disp_df
+    >>> from nvm.aux_spacy import doc_to_dataframe
     >>> from nvm.aux_spacy import get_doc_basic_metrics_component
     >>>
     >>> nlp = spacy.load("en_core_web_sm")
     >>> nlp.add_pipe("get_doc_basic_metrics", "BASIC")
     >>>
-    >>> dframcy = DframCy(nlp)
-    >>>
-    >>> doc = dframcy.nlp(
+    >>> doc = nlp(
     >>>     "This sentence contains two verbs and this is how many verbs should be found."
     >>> )
     >>>
-    >>> df0 = dframcy.to_dataframe(
+    >>> tok_exts = list(Underscore.token_extensions.keys())
+    >>> df0 = doc_to_dataframe(
     >>>     doc,
-    >>>     columns=["text", "lemma_", "is_alpha", "pos_", "tag_", "is_sent_start"],
-    >>>     custom_attributes=tok_exts[:12],
+    >>>     attrs=["text", "lemma_", "is_alpha", "pos_", "tag_", "is_sent_start"],
+    >>>     extensions=tok_exts[:12],
     >>> )
     >>> disp_df(df0)
 
@@ -11,6 +11,7 @@ from typing import (
     Dict,
 )
 
+from ...aux_srsly import yamlstr
 from ..set_container_extensions import set_container_extensions_from_dict
 
 
@@ -64,9 +65,8 @@ class CountDictItemsComponent:
     >>> import spacy
     >>> from spacy.tokens.underscore import Underscore
     >>>
-    >>> from dframcy import DframCy
-    >>>
     >>> from nvm import jsonable
+    >>> from nvm.aux_spacy import doc_to_dataframe
     >>> from nvm.aux_spacy import get_doc_count_of_dict_items_component
     >>> from nvm.aux_spacy import get_doc_summary_dict_component
     >>>
@@ -85,9 +85,7 @@ class CountDictItemsComponent:
     >>> nlp.add_pipe("get_doc_count_of_dict_items", "LEX1", config=config1)
     >>> nlp.add_pipe("get_doc_summary_dict", "SUMMARY")
     >>>
-    >>> dframcy = DframCy(nlp)
-    >>>
-    >>> doc = dframcy.nlp(
+    >>> doc = nlp(
     >>>     "GoOd. Bad Good WhatEver Awful Marvelous."
     >>>     "toobad not-marvelous unmarvel goodyear badZ bAD."
     >>>     "Bad Bad WhatEver Awful Marvelous."
@@ -96,10 +94,10 @@ class CountDictItemsComponent:
     >>> tok_exts = list(Underscore.token_extensions.keys())
     >>> doc_exts = list(Underscore.doc_extensions.keys())
     >>>
-    >>> df0 = dframcy.to_dataframe(
+    >>> df0 = doc_to_dataframe(
     >>>     doc,
-    >>>     columns=["text", "lemma_", "pos_", "tag_"],
-    >>>     custom_attributes=tok_exts[:12],
+    >>>     attrs=["text", "lemma_", "pos_", "tag_"],
+    >>>     extensions=tok_exts[:12],
     >>> )
     >>> disp_df(df0)
     >>>
@@ -166,7 +164,7 @@ class CountDictItemsComponent:
             for key0, val0 in dict0.items()
         }
         """
-        log0.debug(tok_re_dict)
+        log0.debug("%s", yamlstr.lazy(tok_re_dict, prefix="tok_re_dict:\n"))
 
         # WARNING: the `key=key' and `val=val' statements below are used to alleviate
         # problems that result from argument mutability (DO NOT REMOVE).
@@ -194,7 +192,7 @@ class CountDictItemsComponent:
             for key_tok_re, val_tok_re in tok_re_dict.items()
         }
         """
-        log0.debug(tok_fn_dict)
+        log0.debug("%s", yamlstr.lazy(tok_fn_dict, prefix="tok_fn_dict:\n"))
 
         # Produce a dictionary of doc functions
         doc_fn_dict = dict()
@@ -220,7 +218,7 @@ class CountDictItemsComponent:
             for key0 in tok_re_dict.keys()
         }
         """
-        log0.debug(tok_fn_dict)
+        log0.debug("%s", yamlstr.lazy(doc_fn_dict, prefix="doc_fn_dict:\n"))
 
         # Update Token extensions
         set_container_extensions_from_dict(Token, fn_dict=tok_fn_dict)
@@ -45,9 +45,9 @@ class DocWordCountComponent:
         log0: logging.Logger = logging.getLogger("dummy"),
     ):
         extension = "word_count"
-        log0.debug(f"Adding doc extension {extension}")
+        log0.debug("Adding doc extension %s", extension)
         if Doc.has_extension(extension):
-            log0.warning(f"Doc extension {extension} was replaced.")
+            log0.warning("Doc extension %s was replaced.", extension)
             Doc.remove_extension(extension)
 
         Doc.set_extension(extension, default=None, force=True)
@@ -4,6 +4,12 @@ import logging
 from spacy.tokens import Doc, Span, Token
 from typing import Callable, Optional, Dict, Union
 
+from ..aux_log.filters import install_dedup_filter
+
+# Repeated "extension ... was replaced" warnings (e.g., pipelines rebuilt in
+# loops) are logged once per minute by nvm's default logger
+install_dedup_filter(logging.getLogger("dummy"))
+
 # TODOs:
 # from typing import Union
 # from sklearn.utils import Bunch
@@ -104,9 +110,9 @@ def set_container_extensions_from_dict(
 
     """
     for key1, val1 in fn_dict.items():
-        log0.debug(f"Adding {container!r} extension {key1!r}")
+        log0.debug("Adding %r extension %r", container, key1)
         if container.has_extension(key1):
-            log0.warning(f"{container!r} extension {key1!r} was replaced.")
+            log0.warning("%r extension %r was replaced.", container, key1)
             container.remove_extension(key1)
 
         container.set_extension(key1, getter=val1)
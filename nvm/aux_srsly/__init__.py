@@ -3,3 +3,8 @@
 from .aux_srsly import json_serializable_or_repr
 from .aux_srsly import json_serializable_or_repr as jsonable
 from .aux_srsly import yamlstr
+from .aux_srsly import LazyYamlStr
+from .streams import write_jsonl_stream
+from .streams import read_jsonl_stream
+from .streams import write_msgpack_stream
+from .streams import read_msgpack_stream
@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 
+import collections.abc
+import datetime
+import itertools
 import json
+import pathlib
 import srsly
+import sys
 import textwrap
 
 from typing import (
+    Any,
+    Callable,
     Dict,
+    Iterable,
+    List,
     Mapping,
     Optional,
 )
@@ -16,6 +25,7 @@ def yamlstr(
     prefix: str = "got:\n",
     indent: int = 5,
     kwargs: Optional[Mapping] = None,
+    limits: Optional[Mapping] = None,
 ):
     """Get indented yaml string from mapping.
 
@@ -36,6 +46,9 @@ def yamlstr(
         Extra arguments for ``srsly.yaml_dumps``.
         For example: ``indent_mapping``, ``indent_sequence``,
         ``indent_offset`` and ``sort_keys``.
+    limits : Mapping
+        Size limits for ``json_serializable_or_repr``, i.e., ``max_items``,
+        ``max_str_len`` and ``max_depth`` (optional).
 
 
     Returns
@@ -56,39 +69,441 @@ def yamlstr(
            d: 4
            e: 5
 
+    For logging use ``yamlstr.lazy`` (same arguments) that renders the string
+    only if the log record is actually emitted (pass it as an argument, not
+    inside an f-string):
+
+    >>> log0.debug("%s", yamlstr.lazy(dict0))
+
     """
     if kwargs is None:
         kwargs = dict()
+    if limits is None:
+        limits = dict()
 
     return prefix + textwrap.indent(
         srsly.yaml_dumps(
-            json_serializable_or_repr(dict(obj)),
+            json_serializable_or_repr(dict(obj), **limits),
             **kwargs,
         ),
         indent * " ",
     )
 
 
-def json_serializable_or_repr(obj: Mapping, content=True) -> Dict:
-    """Return dictionary without JSON non-serializable items.
+class LazyYamlStr:
+    """Deferred ``yamlstr`` (rendered by ``str()``), see ``yamlstr.lazy``.
+
+    Examples
+    --------
+    >>> from nvm.aux_srsly import yamlstr
+    >>> dict0 = dict(a=1, b=2)
+    >>> log0.debug("%s", yamlstr.lazy(dict0, prefix="dict0:\\n"))
+
+    """
+
+    __slots__ = ("obj", "prefix", "indent", "kwargs", "limits")
+
+    def __init__(
+        self,
+        obj: Mapping,
+        prefix: str = "got:\n",
+        indent: int = 5,
+        kwargs: Optional[Mapping] = None,
+        limits: Optional[Mapping] = None,
+    ):
+        self.obj = obj
+        self.prefix = prefix
+        self.indent = indent
+        self.kwargs = kwargs
+        self.limits = limits
+
+    def __str__(self) -> str:
+        return yamlstr(
+            self.obj,
+            prefix=self.prefix,
+            indent=self.indent,
+            kwargs=self.kwargs,
+            limits=self.limits,
+        )
+
+
+yamlstr.lazy = LazyYamlStr
+
+
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON string (``srsly.json_dumps``) allowing NaN and infinity.
+
+    Non-finite floats (and integers too large for ``ujson``) are written by
+    ``json.dumps`` as ``NaN``, ``Infinity`` and ``-Infinity`` (accepted by
+    ``json.loads`` and ``pd.read_json``).
+    """
+    try:
+        return srsly.json_dumps(obj)
+    except OverflowError:
+        return json.dumps(obj, allow_nan=True, separators=(",", ":"))
+
+
+def _default(obj: Any, content: bool) -> str:
+    """Representation of JSON non-serializable object."""
+    return f"{obj}" if content else f"<<non-serializable: {type(obj).__qualname__}>>"
+
+
+def _json_key(key: Any, content: bool) -> str:
+    """Convert mapping key to string (the same way as ``json.dumps`` does)."""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return _JSON_FLOAT_KEYS.get(float.__repr__(key), float.__repr__(key))
+    if hasattr(key, "item") and hasattr(key, "dtype"):  # numpy scalars
+        return _json_key(key.item(), content)
+    return f"{key}"
+
+
+_JSON_FLOAT_KEYS = {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}
+
+# Types returned as they are (exact types, not subclasses)
+_JSON_ATOMIC_TYPES = frozenset([str, int, float, bool, type(None)])
+
+
+class _JsonableWalker:
+    """Recursive converter of objects to JSON-safe structures."""
+
+    def __init__(self, content: bool = True):
+        self.content = content
+        self._stack = set()  # ids of containers being converted (cycles)
+
+    def __call__(self, obj: Any) -> Any:
+        cls = type(obj)
+        if cls in _JSON_ATOMIC_TYPES:
+            return obj
+        return _get_jsonable_converter(cls)(self, obj)
+
+    def _enter(self, obj: Any) -> int:
+        key = id(obj)
+        if key in self._stack:
+            raise ValueError("Circular reference detected")
+        self._stack.add(key)
+        return key
+
+    def mapping(self, obj: Mapping) -> Dict[str, Any]:
+        key = self._enter(obj)
+        try:
+            return {
+                k
+                if type(k) is str
+                else _json_key(k, self.content): (
+                    v if type(v) in _JSON_ATOMIC_TYPES else self(v)
+                )
+                for k, v in obj.items()
+            }
+        finally:
+            self._stack.discard(key)
+
+    def sequence(self, obj: Iterable) -> List[Any]:
+        key = self._enter(obj)
+        try:
+            return [
+                item if type(item) in _JSON_ATOMIC_TYPES else self(item) for item in obj
+            ]
+        finally:
+            self._stack.discard(key)
+
+    def unordered(self, obj: Iterable) -> List[Any]:
+        try:
+            obj = sorted(obj)
+        except TypeError:
+            pass
+        return self.sequence(obj)
+
+    def string(self, obj: str) -> str:
+        return str.__str__(obj)
+
+    def array(self, obj: Any) -> Any:
+        if obj.ndim == 0:
+            return self(obj.item())
+        return self.sequence(obj.tolist())
+
+    def listlike(self, obj: Any) -> List[Any]:
+        return self.sequence(obj.tolist())
+
+    def frame(self, obj: Any) -> Dict[str, Any]:
+        return self.mapping(obj.to_dict(orient="list"))
+
+    def series(self, obj: Any) -> Dict[str, Any]:
+        return self.mapping(obj.to_dict())
+
+    def default(self, obj: Any) -> str:
+        return _default(obj, self.content)
+
+
+def _array_summary(obj: Any) -> Dict[str, Any]:
+    """Compact summary of NumPy array (without converting its items)."""
+    import numpy as np
+
+    summary = dict(shape=list(obj.shape), dtype=str(obj.dtype))
+    if obj.size and (
+        np.issubdtype(obj.dtype, np.integer)
+        or np.issubdtype(obj.dtype, np.floating)
+        or np.issubdtype(obj.dtype, np.bool_)
+    ):
+        summary.update(
+            min=obj.min().item(),
+            max=obj.max().item(),
+            mean=obj.mean().item(),
+        )
+    return summary
+
+
+class _BoundedJsonableWalker(_JsonableWalker):
+    """Converter of objects to JSON-safe structures with size limits."""
+
+    def __init__(
+        self,
+        content: bool = True,
+        max_items: Optional[int] = None,
+        max_str_len: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ):
+        super().__init__(content=content)
+        self.max_items = max_items
+        self.max_str_len = max_str_len
+        self.max_depth = max_depth
+        self._depth = 0
+
+    def __call__(self, obj: Any) -> Any:
+        cls = type(obj)
+        if cls is str:
+            return self.string(obj)
+        if cls in _JSON_ATOMIC_TYPES:
+            return obj
+        return _get_jsonable_converter(cls)(self, obj)
+
+    def _too_many(self, size: int) -> bool:
+        return self.max_items is not None and size > self.max_items
+
+    def _more(self, size: int) -> str:
+        return f"<{size - self.max_items} more items>"
+
+    def _placeholder(self, obj: Any) -> str:
+        return f"<{type(obj).__qualname__} with {len(obj)} items>"
+
+    def mapping(self, obj: Mapping) -> Dict[str, Any]:
+        if self.max_depth is not None and self._depth >= self.max_depth:
+            return self._placeholder(obj)
+
+        key = self._enter(obj)
+        self._depth += 1
+        try:
+            items = obj.items()
+            if self._too_many(len(obj)):
+                items = itertools.islice(items, self.max_items)
+            out = {
+                k if type(k) is str else _json_key(k, self.content): self(v)
+                for k, v in items
+            }
+            if self._too_many(len(obj)):
+                out["..."] = self._more(len(obj))
+            return out
+        finally:
+            self._depth -= 1
+            self._stack.discard(key)
+
+    def sequence(self, obj: Iterable) -> List[Any]:
+        if self.max_depth is not None and self._depth >= self.max_depth:
+            return self._placeholder(obj)
+
+        key = self._enter(obj)
+        self._depth += 1
+        try:
+            items = obj
+            if self._too_many(len(obj)):
+                items = itertools.islice(obj, self.max_items)
+            out = [self(item) for item in items]
+            if self._too_many(len(obj)):
+                out.append(self._more(len(obj)))
+            return out
+        finally:
+            self._depth -= 1
+            self._stack.discard(key)
+
+    def string(self, obj: str) -> str:
+        if self.max_str_len is not None and len(obj) > self.max_str_len:
+            return f"{str.__str__(obj[: self.max_str_len])}... <{len(obj)} chars>"
+        return str.__str__(obj)
+
+    def array(self, obj: Any) -> Any:
+        if obj.ndim == 0:
+            return self(obj.item())
+        if self._too_many(obj.size):
+            return self.mapping(_array_summary(obj))
+        return self.sequence(obj.tolist())
+
+    def listlike(self, obj: Any) -> List[Any]:
+        if self._too_many(len(obj)):
+            out = self.sequence(obj[slice(self.max_items)].tolist())
+            return out + [self._more(len(obj))]
+        return self.sequence(obj.tolist())
+
+    def frame(self, obj: Any) -> Dict[str, Any]:
+        if self._too_many(len(obj)):
+            return self.mapping(
+                dict(shape=list(obj.shape), head=obj.head(self.max_items))
+            )
+        return self.mapping(obj.to_dict(orient="list"))
+
+    def series(self, obj: Any) -> Any:
+        if self._too_many(len(obj)):
+            return self.array(obj.to_numpy())
+        return self.mapping(obj.to_dict())
+
+    def default(self, obj: Any) -> str:
+        return self.string(_default(obj, self.content))
+
+
+def _register_numpy_converters() -> None:
+    import numpy as np
+
+    _JSONABLE_DISPATCH[np.generic] = lambda walk, obj: walk(obj.item())
+    _JSONABLE_DISPATCH[np.ndarray] = lambda walk, obj: walk.array(obj)
+
+
+def _register_pandas_converters() -> None:
+    import pandas as pd
+
+    _JSONABLE_DISPATCH[pd.DataFrame] = lambda walk, obj: walk.frame(obj)
+    _JSONABLE_DISPATCH[pd.Series] = lambda walk, obj: walk.series(obj)
+    _JSONABLE_DISPATCH[pd.Index] = lambda walk, obj: walk.listlike(obj)
+    _JSONABLE_DISPATCH[pd.Categorical] = lambda walk, obj: walk.listlike(obj)
+
+
+def _default_converter(walk: _JsonableWalker, obj: Any) -> str:
+    return walk.default(obj)
+
+
+# Type dispatch table: type -> converter(walker, obj)
+_JSONABLE_DISPATCH = {
+    str: lambda walk, obj: walk.string(obj),
+    bool: lambda walk, obj: obj,
+    int: lambda walk, obj: int(obj),
+    float: lambda walk, obj: float(obj),
+    type(None): lambda walk, obj: obj,
+    dict: lambda walk, obj: walk.mapping(obj),
+    list: lambda walk, obj: walk.sequence(obj),
+    tuple: lambda walk, obj: walk.sequence(obj),
+    set: lambda walk, obj: walk.unordered(obj),
+    frozenset: lambda walk, obj: walk.unordered(obj),
+    datetime.datetime: lambda walk, obj: obj.isoformat(),
+    datetime.date: lambda walk, obj: obj.isoformat(),
+    datetime.time: lambda walk, obj: obj.isoformat(),
+    datetime.timedelta: lambda walk, obj: obj.total_seconds(),
+    pathlib.PurePath: lambda walk, obj: str(obj),
+    collections.abc.Mapping: lambda walk, obj: walk.mapping(obj),
+}
+
+# Converters for types from optional dependencies are registered on the first
+# lookup after the module is imported (checked in ``sys.modules``).
+_JSONABLE_OPTIONAL = {
+    "numpy": _register_numpy_converters,
+    "pandas": _register_pandas_converters,
+}
+
+# Resolved converters (including subclasses of types in dispatch table)
+_JSONABLE_CONVERTERS = dict()
+
+
+def _get_jsonable_converter(cls: type) -> Callable[[_JsonableWalker, Any], Any]:
+    """Get converter for type (walking its MRO)."""
+    try:
+        return _JSONABLE_CONVERTERS[cls]
+    except KeyError:
+        pass
+
+    # a subclass (from any module) of NumPy/pandas type implies the import
+    for module in [module for module in _JSONABLE_OPTIONAL if module in sys.modules]:
+        _JSONABLE_OPTIONAL.pop(module)()
+        _JSONABLE_CONVERTERS.clear()
+
+    for base in cls.__mro__:
+        if base in _JSONABLE_DISPATCH:
+            converter = _JSONABLE_DISPATCH[base]
+            break
+    else:
+        if isinstance(cls, type) and issubclass(cls, collections.abc.Mapping):
+            converter = _JSONABLE_DISPATCH[
+                collections.abc.Mapping
+            ]  # virtual subclasses
+        else:
+            converter = _default_converter
+
+    _JSONABLE_CONVERTERS[cls] = converter
+    return converter
+
+
+def json_serializable_or_repr(
+    obj: Any,
+    content: bool = True,
+    max_items: Optional[int] = None,
+    max_str_len: Optional[int] = None,
+    max_depth: Optional[int] = None,
+) -> Any:
+    """Return JSON-safe copy of the object (e.g., dictionary).
+
+    The object is walked recursively and converted to JSON-safe structures
+    (``dict`` with ``str`` keys, ``list``, ``str``, ``int``, ``float``,
+    ``bool`` and ``None``) directly, without JSON round-trip:
+
+    - mappings become dictionaries (keys are converted to strings the same way
+      as ``json.dumps`` does), tuples and sets become lists,
+    - NumPy scalars and arrays become numbers and (nested) lists,
+    - pandas ``DataFrame`` becomes dictionary of column lists, ``Series``
+      becomes dictionary, ``Index`` becomes list,
+    - ``datetime``, ``date`` and ``time`` become ISO strings, ``timedelta``
+      becomes number of seconds, paths become strings.
+
+    Any other object is replaced with its string representation (or type
+    description if ``content`` is ``False``).
+
+    Optional limits bound the size of the result (and the cost of the walk):
+    containers are truncated to ``max_items`` items (followed by a
+    ``"<N more items>"`` marker), NumPy arrays (and pandas ``Series``) with
+    more than ``max_items`` elements are replaced with a summary (``shape``,
+    ``dtype``, ``min``, ``max`` and ``mean``), data frames with more than
+    ``max_items`` rows with their ``shape`` and ``head``, strings are
+    truncated to ``max_str_len`` characters and containers nested deeper
+    than ``max_depth`` are replaced with a short description.
 
     Parameters
     ----------
-    obj : Mapping
-        Mapping (e.g., dictionary or dict-like object) to be parsed.
+    obj : Any
+        Object (e.g., dictionary or dict-like object) to be parsed.
     content : bool
         Replace unserializable data with its string representation.
         If ``False`` use type description instead.
+    max_items : Optional[int]
+        Maximum number of items of containers (optional).
+    max_str_len : Optional[int]
+        Maximum length of strings (optional).
+    max_depth : Optional[int]
+        Maximum nesting depth of containers (optional).
 
     Returns
     -------
-    Dict
-        Parsed dictionary.
+    Any
+        Parsed object (e.g., dictionary).
 
     Examples
     --------
 
     >>> from nvm.aux_srsly import json_serializable_or_repr as jsonable
+    >>> import re
     >>> import numpy as np
     >>> import srsly
     >>> import textwrap
@@ -96,7 +511,8 @@ def json_serializable_or_repr(obj: Mapping, content=True) -> Dict:
     >>> dict0 = dict(
     >>>     check="yes",
     >>>     items=list([1, 2, 3, "a", "b", "c"]),
-    >>>     test=np.linspace(42, 44, 10),
+    >>>     test=np.linspace(42, 44, 3),
+    >>>     regex=re.compile("[a-z]+"),
     >>>     )
     >>> print(
     >>>     f"METADATA:\\n{textwrap.indent(srsly.yaml_dumps(jsonable(dict0)), '   ')}"
@@ -110,8 +526,11 @@ def json_serializable_or_repr(obj: Mapping, content=True) -> Dict:
          - a
          - b
          - c
-       test: "[42. 42.22222222 42.44444444 42.66666667 42.88888889 43.11111111\\n\\
-         \\ 43.33333333 43.55555556 43.77777778 44.]"
+       test:
+         - 42.0
+         - 43.0
+         - 44.0
+       regex: re.compile('[a-z]+')
     >>>
     >>> content = False
     >>> print(
@@ -126,12 +545,23 @@ def json_serializable_or_repr(obj: Mapping, content=True) -> Dict:
          - a
          - b
          - c
-       test: '<<non-serializable: ndarray>>'
-
+       test:
+         - 42.0
+         - 43.0
+         - 44.0
+       regex: '<<non-serializable: Pattern>>'
+    >>>
+    >>> jsonable(dict(arr=np.arange(10**6), text="x" * 100), max_items=100, max_str_len=10)
+    {'arr': {'shape': [1000000], 'dtype': 'int64', 'min': 0, 'max': 999999, 'mean': 499999.5},
+     'text': 'xxxxxxxxxx... <100 chars>'}
 
     """
+    if max_items is None and max_str_len is None and max_depth is None:
+        return _JsonableWalker(content=content)(obj)
 
-    def default(o):
-        return f"{o}" if content else f"<<non-serializable: {type(o).__qualname__}>>"
-
-    return json.loads(json.dumps(obj, default=default))
+    return _BoundedJsonableWalker(
+        content=content,
+        max_items=max_items,
+        max_str_len=max_str_len,
+        max_depth=max_depth,
+    )(obj)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+import bz2
+import gzip
+import json
+import lzma
+import mmap
+import pathlib
+import srsly
+
+from typing import (
+    Any,
+    BinaryIO,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+from .aux_srsly import _json_dumps
+from .aux_srsly import json_serializable_or_repr
+
+
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+_COMPRESSION_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+def _get_compression(
+    path: Union[str, pathlib.Path], compression: Optional[str]
+) -> Optional[str]:
+    if compression == "infer":
+        return COMPRESSION_SUFFIXES.get(pathlib.Path(path).suffix.lower())
+
+    if compression is not None and compression not in _COMPRESSION_OPENERS:
+        raise ValueError(
+            f"Unknown compression {compression!r} "
+            f"(expected one of {sorted(_COMPRESSION_OPENERS)}, 'infer' or None)"
+        )
+
+    return compression
+
+
+def _open_binary(
+    path: Union[str, pathlib.Path], mode: str, compression: Optional[str]
+) -> BinaryIO:
+    if compression is None:
+        return open(path, mode)
+
+    return _COMPRESSION_OPENERS[compression](path, mode)
+
+
+def _write_stream(
+    path: Union[str, pathlib.Path],
+    records: Iterable[Any],
+    dumps,
+    compression: Optional[str],
+    append: bool,
+    content: bool,
+    flush_every: Optional[int],
+) -> int:
+    count = 0
+    mode = "ab" if append else "wb"
+    with _open_binary(path, mode, _get_compression(path, compression)) as fh:
+        for record in records:
+            fh.write(dumps(json_serializable_or_repr(record, content=content)))
+            count += 1
+            if flush_every and count % flush_every == 0:
+                fh.flush()
+
+    return count
+
+
+def _jsonl_dumps(obj: Any) -> bytes:
+    return (_json_dumps(obj) + "\n").encode("utf-8")
+
+
+def _jsonl_loads(line: bytes) -> Any:
+    try:
+        return srsly.json_loads(line)
+    except ValueError:
+        return json.loads(line)  # NaN and Infinity (see ``_json_dumps``)
+
+
+def write_jsonl_stream(
+    path: Union[str, pathlib.Path],
+    records: Iterable[Any],
+    compression: Optional[str] = "infer",
+    append: bool = False,
+    content: bool = True,
+    flush_every: Optional[int] = None,
+) -> int:
+    """Write records (e.g., a generator of summary dicts) to a JSONL file.
+
+    Records are converted with ``jsonable`` and written one at a time, so the
+    whole sequence is never held in memory. Non-finite floats are written as
+    ``NaN``, ``Infinity`` and ``-Infinity`` (read back as floats).
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Output file.
+    records : Iterable[Any]
+        Records to be written (consumed lazily).
+    compression : Optional[str]
+        ``"gzip"``, ``"bz2"``, ``"xz"``, ``None`` (no compression) or
+        ``"infer"`` (from the file suffix, default).
+    append : bool
+        Append to an existing file (defaults to ``False``).
+    content : bool
+        Passed to ``jsonable``.
+    flush_every : Optional[int]
+        Flush the file every ``flush_every`` records (optional), so that
+        partial results of long-running jobs reach the disk.
+
+    Returns
+    -------
+    int
+        Number of records written.
+
+    Examples
+    --------
+    >>> from nvm.aux_srsly import write_jsonl_stream, read_jsonl_stream
+    >>> records = (dict(idx=idx, score=idx / 10) for idx in range(3))
+    >>> write_jsonl_stream("scores.jsonl.gz", records)
+    3
+    >>> list(read_jsonl_stream("scores.jsonl.gz"))
+    [{'idx': 0, 'score': 0.0}, {'idx': 1, 'score': 0.1}, {'idx': 2, 'score': 0.2}]
+
+    """
+    return _write_stream(
+        path, records, _jsonl_dumps, compression, append, content, flush_every
+    )
+
+
+def read_jsonl_stream(
+    path: Union[str, pathlib.Path],
+    compression: Optional[str] = "infer",
+    skip_invalid: bool = False,
+) -> Iterator[Any]:
+    """Read records from a JSONL file (see ``write_jsonl_stream``) lazily.
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Input file.
+    compression : Optional[str]
+        See ``write_jsonl_stream``.
+    skip_invalid : bool
+        Skip invalid lines (e.g., the last line of an interrupted job)
+        instead of raising ``ValueError`` (defaults to ``False``).
+
+    Yields
+    ------
+    Any
+        Records.
+
+    """
+    with _open_binary(path, "rb", _get_compression(path, compression)) as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                yield _jsonl_loads(line)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+
+
+def write_msgpack_stream(
+    path: Union[str, pathlib.Path],
+    records: Iterable[Any],
+    compression: Optional[str] = "infer",
+    append: bool = False,
+    content: bool = True,
+    flush_every: Optional[int] = None,
+) -> int:
+    """Write records to a msgpack file (a stream of concatenated objects).
+
+    See ``write_jsonl_stream`` for parameters and return value.
+
+    Examples
+    --------
+    >>> from nvm.aux_srsly import write_msgpack_stream, read_msgpack_stream
+    >>> records = (dict(idx=idx, score=idx / 10) for idx in range(3))
+    >>> write_msgpack_stream("scores.msgpack", records)
+    3
+    >>> [record["idx"] for record in read_msgpack_stream("scores.msgpack")]
+    [0, 1, 2]
+
+    """
+    return _write_stream(
+        path, records, srsly.msgpack_dumps, compression, append, content, flush_every
+    )
+
+
+def read_msgpack_stream(
+    path: Union[str, pathlib.Path],
+    compression: Optional[str] = "infer",
+    use_mmap: bool = True,
+) -> Iterator[Any]:
+    """Read records from a msgpack file (see ``write_msgpack_stream``) lazily.
+
+    Parameters
+    ----------
+    path : Union[str, pathlib.Path]
+        Input file.
+    compression : Optional[str]
+        See ``write_jsonl_stream``.
+    use_mmap : bool
+        Memory-map uncompressed files (defaults to ``True``), so records are
+        decoded straight from the page cache without reading the file into
+        memory first. Ignored for compressed files.
+
+    Yields
+    ------
+    Any
+        Records.
+
+    """
+    compression = _get_compression(path, compression)
+    with _open_binary(path, "rb", compression) as fh:
+        if compression is not None or not use_mmap:
+            yield from srsly.msgpack.Unpacker(fh, raw=False)
+            return
+
+        if pathlib.Path(path).stat().st_size == 0:
+            return
+
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from srsly.msgpack.Unpacker(mm, raw=False)
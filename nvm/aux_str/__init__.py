@@ -5,10 +5,13 @@ from .aux_str import is_ascii_alt
 
 from .aux_str import clean_str
 
+from .clean_str_compiled import compile_clean_str
+from .clean_str_compiled import CompiledCleanStr
+from .clean_str_compiled import CleanStrCache
+
 from .clean_str_mappings import (
     CLEAN_STR_MAPPINGS_TINY,
     CLEAN_STR_MAPPINGS_LARGE,
-    CLEAN_STR_MAPPINGS_HUGE,
     CLEAN_STR_MAPPINGS_SPACE,
     CLEAN_STR_MAPPINGS_DROP_HASHTAGS,
 )
@@ -16,3 +19,13 @@ from .clean_str_mappings import (
 from .regex import (
     REGEX_ABC_DASH_XYZ_ASTERISK,
 )
+
+
+def __getattr__(name: str):
+    # CLEAN_STR_MAPPINGS_HUGE is built on first access (PEP 562)
+    if name == "CLEAN_STR_MAPPINGS_HUGE":
+        from . import clean_str_mappings
+
+        return clean_str_mappings.CLEAN_STR_MAPPINGS_HUGE
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 
-import re
 from typing import (
     List,
     Dict,
@@ -13,9 +12,9 @@ from .clean_str_mappings import (  # noqa: F401
     CLEAN_STR_MAPPINGS_DROP_HASHTAGS,
     CLEAN_STR_MAPPINGS_TINY,
     CLEAN_STR_MAPPINGS_LARGE,
-    CLEAN_STR_MAPPINGS_HUGE,
     CLEAN_STR_MAPPINGS_SPACE,
 )
+from .clean_str_compiled import _get_compiled_clean_str
 
 
 def is_ascii(s: str) -> bool:
@@ -191,6 +190,11 @@ def clean_str(
     ]
 
 
+    Note that mappings are compiled on first use and the compiled version is
+    reused for subsequent calls with mappings of the same content (mappings
+    modified in place are compiled again, except for the built-in
+    ``CLEAN_STR_MAPPINGS_*`` which should not be modified).
+
     Note that we used |json_dumps|_ function from the |srsly|_ library
     to get indented JSON output.
 
@@ -205,6 +209,15 @@ def clean_str(
     "two three #3443 ... five comose text"
 
 
+    To clean many texts with the same mappings use the compiled cleaner
+    (optionally with LRU cache of results for repetitive corpora):
+
+    >>> from nvm.aux_str import compile_clean_str
+    >>> cleaner = compile_clean_str(mappings=map0, cache=True)
+    >>> df0[text_field] = cleaner.batch(df0[text_field])
+    >>> cleaner.cache_info()
+
+
     .. |srsly| replace:: ``srsly``
     .. _srsly: https://github.com/explosion/srsly
 
@@ -212,19 +225,11 @@ def clean_str(
     .. _json_dumps: https://github.com/explosion/srsly/blob/136eb677604e65fd4f00ce9594c6f558b1fc2d3c/srsly/_json_api.py#L10  ## noqa: E501
 
     """
-    # make sure that the text input is str
-    text = str(text)
-    # substitute each undesired str with the desired one
-    for item in mappings:
-        for key, val in item.items():
-            for pattern in val:
-                text = re.sub(pattern, key, text)
-
-    # Finally remove repeated whitespace characters
-    text = re.sub(r"\s\s+", " ", text)
-    # and strip whitespace at the beginning and end of the output
-    text = text.strip()
-    return text
+    # substitute each undesired str with the desired one (in order), then
+    # remove repeated whitespace characters and strip whitespace at the
+    # beginning and end of the output; mappings are compiled once and reused
+    # (single character replacements are merged into a translate table)
+    return _get_compiled_clean_str(mappings)(text)
 
 
 def _temp_test_awkward_mappings():
@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+
+"""Compiled (reusable) version of the ``nvm.aux_str.clean_str`` function.
+
+``clean_str`` compiles (or looks up in the ``re`` module cache) every pattern
+of every mapping each time it is called. When the same mappings are applied to
+many texts it is cheaper to compile them once and reuse the result.
+Optionally, the compiled cleaner can memoize its results in a bounded LRU
+cache, which pays off for highly repetitive corpora (retweets, templated
+survey answers, ``"N/A"``, etc.).
+
+Examples
+--------
+>>> from nvm.aux_str import compile_clean_str
+>>> from nvm.aux_str import CLEAN_STR_MAPPINGS_LARGE
+>>> cleaner = compile_clean_str(CLEAN_STR_MAPPINGS_LARGE, cache=10_000)
+>>> cleaner("  one two  three\\t \\n\\n\\r four...  ")
+'one two three four...'
+>>> cleaner.batch(["N/A", " N/A", "N/A", "N/A "])
+['N/A', 'N/A', 'N/A', 'N/A']
+>>> cleaner.cache_info()
+CleanStrCacheInfo(hits=1, misses=3, skipped=0, maxsize=10000, currsize=3)
+>>> cleaner.cache_info().hit_rate
+0.25
+
+"""
+
+import functools
+import re
+import time
+from array import array
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Match,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from .clean_str_mappings import CLEAN_STR_MAPPINGS_TINY
+from .clean_str_mappings import _is_builtin_mappings
+
+
+_RE_REPEATED_WHITESPACE = re.compile(r"\s\s+")
+
+
+class CleanStrCacheInfo(NamedTuple):
+    """Statistics of ``CleanStrCache`` (similar to ``functools.lru_cache``)."""
+
+    hits: int
+    misses: int
+    skipped: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of cacheable lookups that were served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CleanStrCache:
+    """Bounded LRU cache for compiled ``clean_str`` cleaners.
+
+    Entries are keyed by the identity of the mappings and the text, so one
+    cache instance can be shared by several compiled cleaners.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached entries (defaults to ``4096``).
+    max_entry_len : int
+        Texts longer than this (in characters) are never cached
+        (defaults to ``1024``).
+
+    """
+
+    def __init__(self, maxsize: int = 4096, max_entry_len: int = 1024):
+        if maxsize < 1:
+            raise ValueError(f"Expecting positive cache maxsize (got {maxsize!r})")
+        self.maxsize = int(maxsize)
+        self.max_entry_len = int(max_entry_len)
+        self._data = OrderedDict()
+        # Pin mappings objects used as keys so that their ids are not reused.
+        self._mappings = dict()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+    def mappings_key(self, mappings: Any) -> int:
+        """Get (and pin) cache key for mappings object."""
+        key = id(mappings)
+        self._mappings.setdefault(key, mappings)
+        return key
+
+    def lookup(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Get cached value (``None`` if missing), updating statistics."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def store(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Store value, evicting the least recently used entry if needed."""
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def info(self) -> CleanStrCacheInfo:
+        """Get cache statistics."""
+        return CleanStrCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            skipped=self.skipped,
+            maxsize=self.maxsize,
+            currsize=len(self._data),
+        )
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self._data.clear()
+        self._mappings.clear()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+# Larger tables of single character replacements are applied by str.translate
+_MAX_CHARSET_SIZE = 256
+
+
+def _literal_rule(
+    pattern: Union[str, Pattern[str]],
+    key: str,
+) -> Optional[Tuple[str, str]]:
+    """Get (character, replacement) if rule is a single character replacement.
+
+    Returns ``None`` if the rule needs the regex engine.
+
+    """
+    if not isinstance(pattern, str) or len(pattern) != 1:
+        return None
+    if pattern in _REGEX_SPECIAL_CHARS:
+        return None
+    if "\\" in key:
+        try:
+            # expand escapes of the replacement template (e.g., "\\\\")
+            key = re.sub("x", key, "x")
+        except re.error:  # group references
+            return None
+    return pattern, key
+
+
+class _TranslateTable:
+    """``str.translate`` table equivalent to sequence of single char rules."""
+
+    def __init__(self):
+        self.table = dict()
+        # characters -> table keys whose values contain them
+        self._index = dict()
+
+    def _set(self, codepoint: int, value: str) -> None:
+        self.table[codepoint] = value
+        for char in set(value):
+            self._index.setdefault(char, set()).add(codepoint)
+
+    def add(self, char: str, value: str) -> None:
+        """Compose table with rule replacing ``char`` with ``value``."""
+        for codepoint in self._index.pop(char, ()):
+            self._set(codepoint, self.table[codepoint].replace(char, value))
+        if ord(char) not in self.table:
+            self._set(ord(char), value)
+
+    def step(self) -> Tuple[Optional[Pattern[str]], Any]:
+        """Get compiled (pattern, replacement) step.
+
+        Small tables are applied by the regex engine (a character class
+        pattern with replacement looked up in the table), which is faster than
+        ``str.translate`` when only few characters match. Large tables are
+        applied by ``str.translate`` (pattern is ``None``).
+
+        """
+        if len(self.table) > _MAX_CHARSET_SIZE:
+            return None, self.table
+
+        chars = "".join(re.escape(chr(codepoint)) for codepoint in self.table)
+        return re.compile(f"[{chars}]"), functools.partial(_replace_char, self.table)
+
+
+def _replace_char(table: Dict[int, str], match: Match[str]) -> str:
+    return table[ord(match.group())]
+
+
+def _compile_steps(
+    mappings: List[Dict[str, List[Union[str, Pattern[str]]]]],
+) -> List[Tuple[Optional[Pattern[str]], Any]]:
+    """Turn ``clean_str`` mappings into a list of (pattern, replacement) steps.
+
+    Steps are applied sequentially in the same order as ``clean_str`` applies
+    the mappings. Consecutive single character replacements are merged into
+    one ``str.translate``-like table (see ``_TranslateTable.step``). Step
+    replacement is a template string or callable for ``pattern.sub`` or
+    a ``str.translate`` table (if pattern is ``None``).
+
+    """
+    steps = []
+    table = None
+    for item in mappings:
+        for key, val in item.items():
+            for pattern in val:
+                literal = _literal_rule(pattern, key)
+                if literal is not None:
+                    if table is None:
+                        table = _TranslateTable()
+                    table.add(*literal)
+                    continue
+                if table is not None:
+                    steps.append(table.step())
+                    table = None
+                steps.append((re.compile(pattern), key))
+
+    if table is not None:
+        steps.append(table.step())
+
+    return steps
+
+
+def _sub_with_offsets(
+    pattern: Optional[Pattern[str]],
+    repl: Any,
+    text: str,
+    offsets: array,
+) -> Tuple[str, array]:
+    """Apply compiled step (see ``_compile_steps``) keeping offsets aligned.
+
+    ``offsets[i]`` is the position in the original text of ``text[i]`` (the last
+    element is the end of the original text). Replacement characters inherit the
+    original position of the start of the match they replaced.
+
+    """
+    if pattern is None:
+        if text.translate(repl) == text:
+            return text, offsets
+        matches = (
+            (pos, pos + 1, repl[ord(char)])
+            for pos, char in enumerate(text)
+            if ord(char) in repl
+        )
+    elif callable(repl):
+        matches = (match.span() + (repl(match),) for match in pattern.finditer(text))
+    elif "\\" in repl:
+        matches = (
+            match.span() + (match.expand(repl),) for match in pattern.finditer(text)
+        )
+    else:
+        matches = (match.span() + (repl,) for match in pattern.finditer(text))
+
+    pieces = []
+    new_offsets = array(offsets.typecode)
+    pos = 0
+    for start, end, value in matches:
+        pieces.append(text[pos:start])
+        new_offsets.extend(offsets[pos:start])
+        pieces.append(value)
+        new_offsets.extend(array(offsets.typecode, [offsets[start]]) * len(value))
+        pos = end
+
+    if not pieces:
+        return text, offsets
+
+    pieces.append(text[pos:])
+    new_offsets.extend(offsets[pos:])
+    return "".join(pieces), new_offsets
+
+
+class CompiledCleanStr:
+    """Compiled ``clean_str`` cleaner (see ``compile_clean_str``)."""
+
+    _WHITESPACE_RULE = (None, " ", _RE_REPEATED_WHITESPACE)
+
+    def __init__(
+        self,
+        mappings: List[
+            Dict[str, List[Union[str, Pattern[str]]]]
+        ] = CLEAN_STR_MAPPINGS_TINY,
+        cache: Union[None, bool, int, CleanStrCache] = None,
+        max_entry_len: int = 1024,
+        stats: bool = False,
+    ):
+        self.mappings = mappings
+        self.steps = _compile_steps(mappings)
+
+        # Instrumentation: rules are applied one by one (no merging) and
+        # [hits, bytes_changed, time] are collected for each rule
+        self.rules = None
+        self._rule_stats = None
+        if stats:
+            self.rules = [
+                (idx, key, re.compile(pattern))
+                for idx, item in enumerate(mappings)
+                for key, val in item.items()
+                for pattern in val
+            ] + [self._WHITESPACE_RULE]
+            self.reset_stats()
+
+        if cache is None or cache is False:
+            self.cache = None
+        elif isinstance(cache, CleanStrCache):
+            self.cache = cache
+        elif cache is True:
+            self.cache = CleanStrCache(max_entry_len=max_entry_len)
+        else:
+            self.cache = CleanStrCache(maxsize=cache, max_entry_len=max_entry_len)
+
+        self._key = None if self.cache is None else self.cache.mappings_key(mappings)
+
+    def _clean_with_stats(self, text: str) -> str:
+        for (_, key, pattern), rule_stats in zip(self.rules, self._rule_stats):
+            start = time.perf_counter()
+            new_text, hits = pattern.subn(key, text)
+            rule_stats[2] += time.perf_counter() - start
+            if hits:
+                rule_stats[0] += hits
+                rule_stats[1] += sum(
+                    len(match.group().encode()) for match in pattern.finditer(text)
+                )
+            text = new_text
+
+        return text.strip()
+
+    def _clean(self, text: str) -> str:
+        if self._rule_stats is not None:
+            return self._clean_with_stats(text)
+
+        for pattern, repl in self.steps:
+            if pattern is None:
+                text = text.translate(repl)
+            else:
+                text = pattern.sub(repl, text)
+
+        text = _RE_REPEATED_WHITESPACE.sub(" ", text)
+        return text.strip()
+
+    def __call__(self, text: str) -> str:
+        """Clean single text (same as ``clean_str(text, mappings)``)."""
+        # make sure that the text input is str
+        text = str(text)
+        cache = self.cache
+        if cache is None:
+            return self._clean(text)
+
+        if len(text) > cache.max_entry_len:
+            cache.skipped += 1
+            return self._clean(text)
+
+        key = (self._key, text)
+        value = cache.lookup(key)
+        if value is None:
+            value = self._clean(text)
+            cache.store(key, value)
+
+        return value
+
+    def _clean_with_offsets(self, text: str) -> Tuple[str, array]:
+        offsets = array("i", range(len(text) + 1))
+        for pattern, key in self.steps:
+            text, offsets = _sub_with_offsets(pattern, key, text, offsets)
+
+        text, offsets = _sub_with_offsets(_RE_REPEATED_WHITESPACE, " ", text, offsets)
+        start = len(text) - len(text.lstrip())
+        end = len(text.rstrip())
+        stop = end + 1  # keep offset of the end of text
+        return text[start:end], offsets[start:stop]
+
+    def clean_with_offsets(self, text: str) -> Tuple[str, array]:
+        """Clean single text and get alignment with the original text.
+
+        Parameters
+        ----------
+        text : str
+            Text to be cleaned.
+
+        Returns
+        -------
+        Tuple[str, array.array]
+            Clean text and compact (``array.array("i")``) offsets such that
+            ``offsets[i]`` is the position in ``text`` of the i-th character of
+            the clean text. The extra last element maps the end of the clean
+            text, so the span ``clean[a:b]`` corresponds to
+            ``text[offsets[a]:offsets[b]]``. Do not modify returned offsets
+            if caching is enabled (they can be shared between calls).
+
+        Examples
+        --------
+        >>> from nvm.aux_str import compile_clean_str
+        >>> cleaner = compile_clean_str()
+        >>> text = "  one\\t\\ttwo  "
+        >>> clean, offsets = cleaner.clean_with_offsets(text)
+        >>> clean
+        'one two'
+        >>> text[offsets[4] : offsets[7]]
+        'two'
+
+        """
+        text = str(text)
+        cache = self.cache
+        if cache is None:
+            return self._clean_with_offsets(text)
+
+        if len(text) > cache.max_entry_len:
+            cache.skipped += 1
+            return self._clean_with_offsets(text)
+
+        key = (self._key, text, "offsets")
+        value = cache.lookup(key)
+        if value is None:
+            value = self._clean_with_offsets(text)
+            cache.store(key, value)
+
+        return value
+
+    def batch(self, texts: Iterable[str]):
+        """Clean many texts.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            Texts to be cleaned. A ``pandas.Series`` is mapped and returned
+            as a ``pandas.Series`` (with the same index).
+
+        Returns
+        -------
+        Union[List[str], pandas.Series]
+            Clean texts.
+
+        """
+        if hasattr(texts, "index") and hasattr(texts, "map"):  # pandas.Series
+            return texts.map(self)
+
+        return [self(text) for text in texts]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Get per-rule statistics (requires ``stats=True``).
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One row per rule (in the order of application) with:
+            ``mapping`` (index of the dictionary in mappings, ``None`` for the
+            final removal of repeated whitespace), ``replacement``,
+            ``pattern``, ``hits`` (number of matches), ``bytes_changed``
+            (UTF-8 bytes of matched text), ``time`` (seconds) and
+            ``time_share`` (fraction of the time spent in all rules).
+            Use ``pandas.DataFrame(cleaner.stats())`` to get a table.
+
+        """
+        if self._rule_stats is None:
+            raise RuntimeError("Statistics are disabled (use stats=True)")
+
+        total_time = sum(rule_stats[2] for rule_stats in self._rule_stats)
+        return [
+            dict(
+                mapping=idx,
+                replacement=key,
+                pattern=pattern.pattern,
+                hits=hits,
+                bytes_changed=bytes_changed,
+                time=rule_time,
+                time_share=rule_time / total_time if total_time else 0.0,
+            )
+            for (idx, key, pattern), (hits, bytes_changed, rule_time) in zip(
+                self.rules, self._rule_stats
+            )
+        ]
+
+    def reset_stats(self) -> None:
+        """Reset per-rule statistics (requires ``stats=True``)."""
+        if self.rules is None:
+            raise RuntimeError("Statistics are disabled (use stats=True)")
+
+        self._rule_stats = [[0, 0, 0.0] for _ in self.rules]
+
+    def used_mappings(self) -> List[Dict[str, List[Union[str, Pattern[str]]]]]:
+        """Get mappings without rules that never matched (requires ``stats=True``).
+
+        Returns
+        -------
+        List[Dict[str, List[Union[str, Pattern[str]]]]]
+            Copy of mappings keeping only patterns with at least one hit
+            (empty dictionaries are dropped).
+
+        """
+        if self._rule_stats is None:
+            raise RuntimeError("Statistics are disabled (use stats=True)")
+
+        hits = iter(rule_stats[0] for rule_stats in self._rule_stats)
+        used = []
+        for item in self.mappings:
+            new_item = dict()
+            for key, val in item.items():
+                patterns = [pattern for pattern in val if next(hits)]
+                if patterns:
+                    new_item[key] = patterns
+            if new_item:
+                used.append(new_item)
+
+        return used
+
+    def cache_info(self) -> Optional[CleanStrCacheInfo]:
+        """Get cache statistics (``None`` if caching is disabled)."""
+        return None if self.cache is None else self.cache.info()
+
+    def cache_clear(self) -> None:
+        """Clear cache (if any)."""
+        if self.cache is not None:
+            self.cache.clear()
+            self._key = self.cache.mappings_key(self.mappings)
+
+
+# Recently used cleaners for ``clean_str``: id(mappings) -> (mappings, copy of
+# mappings content at compile time or None for built-in mappings, cleaner)
+_RECENTLY_COMPILED = OrderedDict()
+_RECENTLY_COMPILED_MAXSIZE = 32
+
+
+def _copy_mappings(
+    mappings: List[Dict[str, List[Union[str, Pattern[str]]]]],
+) -> List[Dict[str, List[Union[str, Pattern[str]]]]]:
+    return [{key: list(val) for key, val in item.items()} for item in mappings]
+
+
+def _get_compiled_clean_str(
+    mappings: List[Dict[str, List[Union[str, Pattern[str]]]]],
+) -> CompiledCleanStr:
+    """Get compiled cleaner for mappings (reusing recently compiled ones).
+
+    Built-in mappings (``CLEAN_STR_MAPPINGS_*``) are treated as immutable.
+    Other mappings are reused only if their content equals the content at
+    compile time (checked on every call, the cost is proportional to the
+    number of patterns), so mappings modified in place are compiled again.
+
+    """
+    key = id(mappings)
+    entry = _RECENTLY_COMPILED.get(key)
+    if (
+        entry is not None
+        and entry[0] is mappings
+        and (entry[1] is None or entry[1] == mappings)
+    ):
+        _RECENTLY_COMPILED.move_to_end(key)
+        return entry[2]
+
+    cleaner = CompiledCleanStr(mappings)
+    snapshot = None if _is_builtin_mappings(mappings) else _copy_mappings(mappings)
+    _RECENTLY_COMPILED[key] = (mappings, snapshot, cleaner)
+    _RECENTLY_COMPILED.move_to_end(key)
+    if len(_RECENTLY_COMPILED) > _RECENTLY_COMPILED_MAXSIZE:
+        _RECENTLY_COMPILED.popitem(last=False)
+    return cleaner
+
+
+def compile_clean_str(
+    mappings: List[Dict[str, List[Union[str, Pattern[str]]]]] = CLEAN_STR_MAPPINGS_TINY,
+    cache: Union[None, bool, int, CleanStrCache] = None,
+    max_entry_len: int = 1024,
+    stats: bool = False,
+) -> CompiledCleanStr:
+    """Compile ``clean_str`` mappings into a reusable cleaner.
+
+    Parameters
+    ----------
+    mappings : List[Dict[str, List[Union[str, Pattern[str]]]]]
+        Mappings, see ``nvm.aux_str.clean_str`` (defaults to
+        ``CLEAN_STR_MAPPINGS_TINY``). Mappings are treated as immutable, do
+        not modify them after compilation.
+    cache : Union[None, bool, int, CleanStrCache]
+        Optional LRU cache for results. Use ``True`` for a cache with default
+        size, an ``int`` for a cache of given size, or an existing
+        ``CleanStrCache`` instance to share it between cleaners.
+        Defaults to ``None`` (no caching).
+    max_entry_len : int
+        Texts longer than this are not cached (defaults to ``1024``).
+        Ignored if an existing ``CleanStrCache`` instance is passed.
+    stats : bool
+        Instrumentation mode (defaults to ``False``). Rules are applied one by
+        one (no merging, slower) and number of matches, changed bytes and time
+        are collected per rule, see ``CompiledCleanStr.stats``. Texts served
+        from the cache are not counted.
+
+    Returns
+    -------
+    CompiledCleanStr
+        Callable cleaner. Use ``cleaner(text)`` for single texts,
+        ``cleaner.batch(texts)`` for many texts and
+        ``cleaner.cache_info()`` to get cache statistics.
+
+    Examples
+    --------
+    >>> from nvm.aux_str import compile_clean_str
+    >>> cleaner = compile_clean_str(cache=True)
+    >>> df0["text"] = cleaner.batch(df0["text"])
+    >>> print(cleaner.cache_info().hit_rate)
+
+    Find out which rules fire on a corpus (and drop the ones that do not):
+
+    >>> import pandas as pd
+    >>> from nvm.aux_str import CLEAN_STR_MAPPINGS_LARGE
+    >>> cleaner = compile_clean_str(CLEAN_STR_MAPPINGS_LARGE, stats=True)
+    >>> _ = cleaner.batch(df0["text"])
+    >>> stats_df = pd.DataFrame(cleaner.stats())
+    >>> stats_df.sort_values("time_share", ascending=False)
+    >>> mappings = cleaner.used_mappings()
+
+    """
+    return CompiledCleanStr(
+        mappings=mappings,
+        cache=cache,
+        max_entry_len=max_entry_len,
+        stats=stats,
+    )
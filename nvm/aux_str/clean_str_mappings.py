@@ -44,8 +44,32 @@ Examples
 >>> print(text_clean)
 "one two three four..."
 
+
+``CLEAN_STR_MAPPINGS_HUGE`` extends ``CLEAN_STR_MAPPINGS_LARGE`` with a
+comprehensive Unicode normalization (several thousands of single character
+replacements generated from ``unicodedata`` categories, see
+``_unicode_normalization_table``). It is built on first access. Single
+character replacements are merged into a ``str.translate`` table by
+``nvm.aux_str.compile_clean_str`` (and thus by ``clean_str``), so even this
+large mapping can be applied quickly:
+
+>>> from nvm.aux_str import clean_str
+>>> from nvm.aux_str import CLEAN_STR_MAPPINGS_HUGE
+>>> clean_str("“Ｆｕｌｌ”\\u200b\\u202eﬁle — №\\u00a01", mappings=CLEAN_STR_MAPPINGS_HUGE)
+'"Full" file - No 1'
+
 """
 
+import functools
+import itertools
+import unicodedata
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+
+
 CLEAN_STR_MAPPINGS_SPACE = [
     {
         " ": [  # Unicode Character 'SPACE' (U+0020)
@@ -113,4 +137,109 @@ CLEAN_STR_MAPPINGS_LARGE = CLEAN_STR_MAPPINGS_TINY + [
     },
 ]
 
-CLEAN_STR_MAPPINGS_HUGE = CLEAN_STR_MAPPINGS_LARGE + []  # TODO
+
+def _unicode_normalization_table() -> Dict[int, str]:
+    """Build ``str.translate`` table for comprehensive Unicode normalization.
+
+    The table is generated from ``unicodedata`` categories and covers:
+
+    - space separators (``Zs``, ``Zl``, ``Zp``) and whitespace control
+      characters (``Cc``), mapped to ``" "``,
+    - format characters (``Cf``, e.g., zero-width and bidi control
+      characters, soft hyphen) and non-whitespace control characters
+      (``Cc``), removed,
+    - dash punctuation (``Pd``), mapped to ``"-"``,
+    - quotation marks, apostrophes and primes, mapped to ``"'"`` or ``'"'``,
+    - characters with compatibility decomposition (NFKC-style folding, e.g.,
+      ligatures, fullwidth and circled forms), except spacing modifiers
+      (``Sk``).
+
+    ASCII characters other than control characters are left as they are.
+    Planes 2-3 (CJK ideographs only) and 15-16 (private use) are skipped.
+
+    """
+    table = dict()
+    planes = (0, 1, 14)  # BMP, SMP and SSP (tags)
+    codepoints = itertools.chain.from_iterable(
+        range(plane << 16, (plane + 1) << 16) for plane in planes
+    )
+    for codepoint in codepoints:
+        char = chr(codepoint)
+        category = unicodedata.category(char)
+        if category in ("Cn", "Co", "Cs"):  # unassigned, private use, surrogates
+            continue
+
+        if category == "Cc":
+            table[codepoint] = " " if char.isspace() else ""
+            continue
+
+        if codepoint < 128:
+            continue
+
+        if category in ("Zs", "Zl", "Zp"):
+            table[codepoint] = " "
+        elif category == "Cf":
+            table[codepoint] = ""
+        elif category == "Pd":
+            table[codepoint] = "-"
+        else:
+            name = unicodedata.name(char, "")
+            if "QUOTATION MARK" in name or "APOSTROPHE" in name:
+                single = "SINGLE" in name or "APOSTROPHE" in name
+                table[codepoint] = "'" if single else '"'
+            elif name.endswith("PRIME") and not ("TRIPLE" in name or "QUAD" in name):
+                table[codepoint] = '"' if "DOUBLE" in name else "'"
+            elif category != "Sk" and unicodedata.decomposition(char).startswith("<"):
+                folded = unicodedata.normalize("NFKC", char)
+                if folded != char:
+                    table[codepoint] = folded
+
+    # Make sure that folded characters are normalized as well
+    for _ in range(3):
+        folded = {key: val.translate(table) for key, val in table.items()}
+        if folded == table:
+            break
+        table = folded
+
+    return table
+
+
+def _mappings_from_translate_table(
+    table: Dict[int, str],
+) -> List[Dict[str, List[str]]]:
+    """Express ``str.translate`` table as ``clean_str`` mappings."""
+    mapping = dict()
+    for codepoint, val in table.items():
+        # replacements are regex templates (escape backslashes)
+        mapping.setdefault(val.replace("\\", "\\\\"), []).append(chr(codepoint))
+
+    return [mapping]
+
+
+@functools.lru_cache(maxsize=None)
+def _clean_str_mappings_huge() -> List[Dict[str, List[str]]]:
+    return CLEAN_STR_MAPPINGS_LARGE + _mappings_from_translate_table(
+        _unicode_normalization_table()
+    )
+
+
+def _is_builtin_mappings(mappings: Any) -> bool:
+    """Check if object is one of the ``CLEAN_STR_MAPPINGS_*`` constants."""
+    builtins = [
+        CLEAN_STR_MAPPINGS_SPACE,
+        CLEAN_STR_MAPPINGS_DROP_HASHTAGS,
+        CLEAN_STR_MAPPINGS_TINY,
+        CLEAN_STR_MAPPINGS_LARGE,
+    ]
+    if _clean_str_mappings_huge.cache_info().currsize:
+        builtins.append(_clean_str_mappings_huge())
+    return any(mappings is builtin for builtin in builtins)
+
+
+def __getattr__(name: str):
+    # Scanning all Unicode code points takes a while, so
+    # CLEAN_STR_MAPPINGS_HUGE is built on first access (PEP 562).
+    if name == "CLEAN_STR_MAPPINGS_HUGE":
+        return _clean_str_mappings_huge()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
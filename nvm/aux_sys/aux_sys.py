@@ -47,13 +47,13 @@ def chdir(
     """
     hostname = str(socket.gethostname())
     username = str(pwd.getpwuid(os.getuid()).pw_name)
-    log0.debug(f"{hostname = }")
-    log0.debug(f"{username = }")
+    log0.debug("hostname = %r", hostname)
+    log0.debug("username = %r", username)
     # TODO: add warning if mach is found for hostname or username
     if hostname in locations.keys():
         if username in locations[hostname].keys():
             os.chdir(pathlib.Path.home() / locations[hostname][username])
-            log0.info(f"{os.getcwd() = }")
+            log0.info("os.getcwd() = %r", os.getcwd())
 
     return pathlib.Path.cwd()
 
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+import logging
+import pathlib
+import shutil
+import pytest  # noqa: F401
+from nvm import nvm  # noqa: F401
+
+import pandas as pd
+
+from nvm.aux_bids import BidsIndex
+from nvm.aux_bids import dict_from_bids_filename
+from nvm.aux_bids.bids_index import INDEX_COLUMNS
+
+
+FN0 = (
+    "../../data/"
+    "data-001/sub-s001__ses-morning_"
+    "insert_task-rest_space-T1w_desc-preproc_bold_info"
+    ".the.funky_ext.nii.gz"
+)
+
+NAMES = [
+    "sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_bold.nii.gz",
+    "sub-01/ses-1/func/sub-01_ses-1_task-rest_run-1_events.tsv",
+    "sub-01/anat/sub-01_T1w.nii",
+    "sub-02/anat/sub-02_acq-x-y__T1w_defaced..json",
+    "sub-02/README",
+    "dataset_description.json",
+    "sub-02/.hidden/sub-02_bold.nii",
+]
+
+
+def make_tree(root):
+    for idx, name in enumerate(NAMES):
+        path = pathlib.Path(root) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * idx)
+    return root
+
+
+class TestAuxBids:
+    def test_dict_from_bids_filename(self):
+        assert dict_from_bids_filename(FN0) == dict(
+            props=dict(
+                sub="s001", ses="morning", task="rest", space="T1w", desc="preproc"
+            ),
+            suff=["insert", "bold", "info"],
+            ext=".the.funky_ext.nii.gz",
+        )
+
+    def test_dict_from_bids_filename_debug(self, caplog):
+        log0 = logging.getLogger("test_aux_bids")
+        with caplog.at_level(logging.INFO, logger="test_aux_bids"):
+            dict_from_bids_filename(FN0, log0=log0)
+        assert not caplog.records
+
+        with caplog.at_level(logging.DEBUG, logger="test_aux_bids"):
+            dict_from_bids_filename(FN0, log0=log0)
+        assert len(caplog.records) == 10
+        assert caplog.records[0].msg == "%s = %r"
+        assert (
+            caplog.messages[-1]
+            == "vals0 = ['s001', 'morning', 'rest', 'T1w', 'preproc']"
+        )
+
+    @pytest.mark.parametrize("n_workers", [1, 4])
+    def test_bids_index_scan(self, tmp_path, n_workers):
+        index = BidsIndex.scan(make_tree(tmp_path), n_workers=n_workers)
+        df0 = index.df
+        assert len(index) == len(NAMES) - 1  # hidden directory is skipped
+        assert list(df0.columns[:6]) == [
+            "dir",
+            "name",
+            "suffix",
+            "ext",
+            "size",
+            "mtime",
+        ]
+        assert set(df0.columns[6:]) == {"sub", "ses", "task", "run", "acq"}
+        for column in ["dir", "suffix", "ext", "sub", "task"]:
+            assert isinstance(df0[column].dtype, pd.CategoricalDtype)
+
+        for path, row in zip(index.paths(), df0.itertuples()):
+            dict0 = dict_from_bids_filename(path)
+            assert row.suffix == "_".join(dict0["suff"]) and row.ext == dict0["ext"]
+            props = {key: getattr(row, key) for key in dict0["props"]}
+            assert props == dict0["props"]
+            assert (
+                row.size
+                == path.stat().st_size
+                == NAMES.index(path.relative_to(tmp_path).as_posix())
+            )
+
+        bold = df0[df0.suffix == "bold"]
+        assert bold.dir.tolist() == ["sub-01/ses-1/func"] and bold.run.tolist() == ["1"]
+        assert pd.isna(df0.set_index("name").loc["README", "sub"])
+        assert len(BidsIndex.scan(tmp_path, include_hidden=True)) == len(NAMES)
+
+    def test_bids_index_save_load_refresh(self, tmp_path):
+        root = make_tree(tmp_path / "ds")
+        index = BidsIndex.scan(root)
+        index.save(tmp_path / "index.sqlite")
+        loaded = BidsIndex.load(tmp_path / "index.sqlite")
+        pd.testing.assert_frame_equal(loaded.df, index.df)
+        assert loaded.dirs == index.dirs and loaded.root == root
+
+        summary = loaded.refresh()
+        assert summary["n_dirs_scanned"] == 0 and summary["n_dirs"] == len(index.dirs)
+
+        shutil.rmtree(root / "sub-02")
+        (root / "sub-01/anat/sub-01_acq-new_T2w.nii").write_bytes(b"xyz")
+        (root / "sub-03/anat").mkdir(parents=True)
+        (root / "sub-03/anat/sub-03_echo-1_T1w.nii").touch()
+        summary = loaded.refresh(n_workers=2)
+        assert summary == dict(
+            n_dirs=7,
+            n_dirs_scanned=4,  # root, sub-01/anat, sub-03, sub-03/anat
+            n_dirs_removed=2,  # sub-02, sub-02/anat
+            n_files_added=4,
+            n_files_removed=4,
+        )
+
+        expected = BidsIndex.scan(root)
+        for df0 in [loaded.df, BidsIndex.load(tmp_path / "index.sqlite").df]:
+            pd.testing.assert_frame_equal(
+                df0.sort_index(axis=1), expected.df.sort_index(axis=1)
+            )
+        assert loaded.dirs == expected.dirs
+
+    def test_bids_index_refresh_removed_only(self, tmp_path):
+        for name in ["sub-01/anat/sub-01_T1w.nii", "sub-02/anat/sub-02_T1w.nii"]:
+            (tmp_path / name).parent.mkdir(parents=True)
+            (tmp_path / name).touch()
+        index = BidsIndex.scan(tmp_path)
+        shutil.rmtree(tmp_path / "sub-02")
+        assert index.refresh()["n_files_removed"] == 1
+        assert index.df["sub"].tolist() == ["01"]
+        shutil.rmtree(tmp_path / "sub-01")
+        index.refresh()
+        assert len(index) == 0 and list(index.df.columns) == INDEX_COLUMNS
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+
+import gzip
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import pytest  # noqa: F401
+from nvm import nvm  # noqa: F401
+
+import numpy as np
+import pandas as pd
+
+from nvm.aux_log import DedupFilter
+from nvm.aux_log import Log0
+from nvm.aux_log.timing import StreamingHistogram
+
+
+def mp_work(idx):
+    log0 = logging.getLogger("nvm.aux_log.aux_log")
+    for jdx in range(50):
+        log0.debug("job %d record %d", idx, jdx)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log0.exception("job %d failed", idx)
+
+
+def read_log(logZ):
+    return logZ.of0.read_text().splitlines()
+
+
+class TestAuxLog:
+    def test_log0_sync(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, fn0="sync.log", write=True, stream_lvl="ERROR")
+        logZ.logger.debug("record %d", 1)
+        logZ.close()
+        lines = read_log(logZ)
+        assert len(lines) == 1 and lines[0].endswith("test_log0_sync    record 1")
+
+    def test_log0_async_io(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, fn0="async.log", write=True, async_io=True)
+        assert logZ.logger.handlers == [logZ.queue_handler]
+        logZ.handler0.setLevel("CRITICAL")
+
+        def work(idx):
+            for jdx in range(100):
+                logZ.logger.debug("worker %d record %d", idx, jdx)
+
+        threads = [threading.Thread(target=work, args=(idx,)) for idx in range(4)]
+        _ = [thread.start() for thread in threads]
+        _ = [thread.join() for thread in threads]
+        logZ.close()
+        lines = read_log(logZ)
+        assert len(lines) == 400
+        assert all(" D: work " in line for line in lines)
+        assert sum(line.endswith("worker 3 record 99") for line in lines) == 1
+        logZ.close()  # idempotent
+
+    def test_log0_multiprocess(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, fn0="mp.log", write=True, multiprocess=True)
+        logZ.handler0.setLevel("CRITICAL")
+        logZ.logger.info("main")
+        with multiprocessing.Pool(
+            2, initializer=Log0.worker_initializer, initargs=logZ.initargs
+        ) as pool:
+            pool.map(mp_work, range(4))
+            pool.close()
+            pool.join()  # let workers flush their queues (exit terminates them)
+        logZ.close()
+        lines = read_log(logZ)
+        assert sum(" D: mp_work " in line for line in lines) == 4 * 50
+        assert sum(" E: mp_work " in line for line in lines) == 4
+        assert sum(line.endswith("job 3 record 49") for line in lines) == 1
+        assert sum(line == "ZeroDivisionError: division by zero" for line in lines) == 4
+
+    def test_log0_initargs_requires_multiprocess(self):
+        with pytest.raises(RuntimeError):
+            Log0().initargs
+
+    def test_log0_jsonl(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, write=True, stream_lvl="CRITICAL", format="jsonl")
+        assert logZ.of0.suffix == ".jsonl"
+        log0 = logZ.logger
+        log0.info("batch %d", 1, extra=dict(batch=1, rate=np.float32(2.5)))
+        log0.debug("plain")
+        assert logZ.of0.read_text() == ""  # buffered
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log0.exception("failed")  # ERROR flushes the buffer
+        records = [json.loads(line) for line in read_log(logZ)]
+        assert [record["message"] for record in records] == [
+            "batch 1",
+            "plain",
+            "failed",
+        ]
+        assert records[0]["batch"] == 1 and records[0]["rate"] == 2.5
+        assert records[0]["funcName"] == "test_log0_jsonl"
+        assert "batch" not in records[1]
+        assert records[2]["exception"].endswith("ZeroDivisionError: division by zero")
+        df0 = pd.read_json(logZ.of0, lines=True)
+        assert df0.level.tolist() == ["INFO", "DEBUG", "ERROR"]
+
+    def test_log0_jsonl_non_finite(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, write=True, stream_lvl="CRITICAL", format="jsonl")
+        logZ.logger.info("nan", extra=dict(rate=float("nan")))
+        logZ.logger.info("inf", extra=dict(rate=float("inf"), p50=np.float64("-inf")))
+        logZ.close()
+        records = [json.loads(line) for line in read_log(logZ)]
+        assert [record["message"] for record in records] == ["nan", "inf"]
+        assert np.isnan(records[0]["rate"]) and records[1]["rate"] == float("inf")
+        df0 = pd.read_json(logZ.of0, lines=True)
+        assert df0.p50.tolist()[1] == float("-inf")
+
+    def test_log0_buffer_capacity_and_interval(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, fn0="buf.log", write=True, buffer_size=3)
+        logZ.handler0.setLevel("CRITICAL")
+        logZ.buffer_handler.flush_interval = None
+        for idx in range(5):
+            logZ.logger.info("record %d", idx)
+        assert len(read_log(logZ)) == 3
+        logZ.buffer_handler.flush_interval = 0.0
+        logZ.logger.info("record 5")
+        assert len(read_log(logZ)) == 6
+
+    def test_log0_buffer_flushed_without_new_records(self, tmp_path):
+        logZ = Log0(
+            dir0=tmp_path,
+            fn0="buf.jsonl",
+            write=True,
+            format="jsonl",
+            flush_interval=0.1,
+        )
+        logZ.handler0.setLevel("CRITICAL")
+        logZ.logger.info("record 0")
+        assert read_log(logZ) == []
+        deadline = time.monotonic() + 5.0
+        while not read_log(logZ) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(read_log(logZ)) == 1
+        Log0()
+        assert not logZ.buffer_handler._flusher.is_alive()
+
+    @pytest.mark.parametrize("buffer_size", [0, 10])
+    def test_log0_rotate_bytes(self, tmp_path, buffer_size):
+        logZ = Log0(
+            dir0=tmp_path,
+            fn0="rot.log",
+            write=True,
+            stream_lvl="ERROR",
+            rotate_bytes=1000,
+            backup_count=2,
+            buffer_size=buffer_size,
+        )
+        for idx in range(100):
+            logZ.logger.debug("record %03d", idx)
+        logZ.close()
+        names = sorted(path.name for path in tmp_path.iterdir())
+        assert names == ["rot.log", "rot.log.1.gz", "rot.log.2.gz"]
+        lines = gzip.decompress((tmp_path / "rot.log.1.gz").read_bytes()).decode()
+        lines = lines.splitlines() + read_log(logZ)
+        assert lines[-1].endswith("record 099")
+        assert [int(line[-3:]) for line in lines] == list(range(100 - len(lines), 100))
+
+    def test_log0_rotate_when(self, tmp_path):
+        logZ = Log0(
+            dir0=tmp_path,
+            fn0="rot.log",
+            write=True,
+            stream_lvl="ERROR",
+            rotate_when="S",
+        )
+        logZ.logger.debug("record 1")
+        logZ.handler1.rolloverAt = 0
+        logZ.logger.debug("record 2")
+        logZ.close()
+        (path,) = [path for path in tmp_path.iterdir() if path.suffix == ".gz"]
+        assert gzip.decompress(path.read_bytes()).decode().endswith("record 1\n")
+        assert read_log(logZ)[0].endswith("record 2")
+
+    def test_log0_rotate_both(self, tmp_path):
+        with pytest.raises(ValueError):
+            Log0(dir0=tmp_path, write=True, rotate_bytes=10, rotate_when="H")
+
+    def test_log0_timer_and_rate(self, tmp_path, caplog):
+        logZ = Log0(report_interval=0.0)
+        logZ.handler0.setLevel("CRITICAL")
+
+        @logZ.timer("double", n_items=1)
+        def double(value):
+            return 2 * value
+
+        assert [double(idx) for idx in range(10)] == list(range(0, 20, 2))
+        with logZ.timer("block") as timer:
+            timer.n_items = 5
+        with pytest.raises(ZeroDivisionError), logZ.timer("block"):
+            1 / 0
+        logZ.rate("docs", 100)
+        logZ.rate("docs", 100)
+
+        report = logZ.report()
+        assert report["double"]["count"] == 10 and report["double"]["n_items"] == 10
+        assert report["block"]["count"] == 2 and report["block"]["n_items"] == 5
+        assert report["docs"]["count"] == 0 and report["docs"]["n_items"] == 200
+        stats = report["double"]
+        assert stats["min"] <= stats["p50"] <= stats["p99"] <= stats["max"] * 1.01
+        df0 = logZ.report(as_frame=True)
+        assert df0.index.tolist() == ["double", "block", "docs"]
+        assert "Timings:" in caplog.text
+
+    def test_streaming_histogram(self):
+        hist = StreamingHistogram()
+        values = np.random.default_rng(0).lognormal(size=10_000)
+        for value in values:
+            hist.add(value)
+        for q in [0.5, 0.95, 0.99]:
+            expected = np.quantile(values, q)
+            assert abs(hist.quantile(q) - expected) / expected < 0.02
+
+    @pytest.mark.parametrize(
+        "kwargs", [dict(), dict(buffer_size=100), dict(async_io=True)]
+    )
+    def test_log0_ring_buffer(self, tmp_path, kwargs):
+        logZ = Log0(
+            dir0=tmp_path,
+            fn0="ring.log",
+            write=True,
+            stream_lvl="CRITICAL",
+            file_lvl="INFO",
+            ring_buffer=5,
+            **kwargs,
+        )
+        for idx in range(20):
+            logZ.logger.debug("record %d", idx)
+        logZ.logger.info("info")
+        logZ.logger.error("failed")
+        logZ.logger.debug("record 20")
+        logZ.close()
+        lines = read_log(logZ)
+        assert len(lines) == 8
+        assert lines[0].endswith("info") and lines[-1].endswith("failed")
+        assert "Dumping last 5 buffered records" in lines[1]
+        assert [line[-2:] for line in lines[2:7]] == ["15", "16", "17", "18", "19"]
+
+    def test_log0_context_dumps_ring_buffer(self, tmp_path):
+        with pytest.raises(ZeroDivisionError):
+            with Log0(
+                dir0=tmp_path,
+                fn0="ctx.log",
+                write=True,
+                stream_lvl="CRITICAL",
+                file_lvl="INFO",
+                ring_buffer=10,
+            ) as logZ:
+                logZ.logger.debug("dividing")
+                1 / 0
+        text = logZ.of0.read_text()
+        assert "dividing" in text and "ZeroDivisionError escaped Log0 context" in text
+        assert "Traceback" in text
+
+    def test_dedup_filter(self, caplog):
+        log0 = logging.getLogger("test_dedup_filter")
+        log0.addFilter(DedupFilter(window=0.2))
+        with caplog.at_level(logging.INFO, logger="test_dedup_filter"):
+            for key in ["a", "b", "c"]:
+                log0.warning("Doc extension %s was replaced.", key)
+                log0.info("Added %s", key)  # not deduplicated
+            log0.warning("Other warning")
+            time.sleep(0.25)
+            log0.warning("Doc extension %s was replaced.", "d")
+        assert caplog.messages == [
+            "Doc extension a was replaced.",
+            "Added a",
+            "Added b",
+            "Added c",
+            "Other warning",
+            "Suppressed 2 repeated message(s) like 'Doc extension %s was replaced.'"
+            " (within 0.2 s)",
+            "Doc extension d was replaced.",
+        ]
+
+    def test_log0_dedup_window(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, fn0="plain.log", write=True, stream_lvl="CRITICAL")
+        assert logZ.dedup_filter is None and logZ.logger.filters == []
+        for fn0 in ["a.txt", "b.txt", "c.txt"]:
+            logZ.logger.warning("Could not parse %s", fn0)
+        logZ.close()
+        assert len(read_log(logZ)) == 3
+
+        logZ = Log0(
+            dir0=tmp_path,
+            fn0="dedup.log",
+            write=True,
+            stream_lvl="CRITICAL",
+            dedup_window=60.0,
+        )
+        for idx in range(100):
+            logZ.logger.warning("extension %d was replaced", idx)
+        logZ.close()
+        lines = read_log(logZ)
+        assert len(lines) == 2 and "Suppressed 99 repeated" in lines[1]
+        assert Log0().logger.filters == []
+
+    def test_log0_async_io_after_close(self, tmp_path):
+        with Log0(dir0=tmp_path, fn0="a.log", write=True, async_io=True) as logZ:
+            logZ.handler0.setLevel("CRITICAL")
+            logZ.logger.info("in context")
+        logZ.logger.info("after close")
+        assert logZ.logger.handlers == logZ.handlers
+        assert read_log(logZ)[-1].endswith("after close")
+
+    def test_log0_replaced_instance_is_closed(self, tmp_path):
+        logZ = Log0(dir0=tmp_path, fn0="a.log", write=True, async_io=True)
+        listener = logZ.listener
+        logZ.logger.info("first")
+        logZ1 = Log0(dir0=tmp_path, fn0="b.log", write=True, stream_lvl="CRITICAL")
+        assert logZ.listener is None and listener._thread is None
+        assert logZ1.logger.handlers == logZ1.handlers
+        logZ1.logger.info("second")
+        assert read_log(logZ)[-1].endswith("first")
+        assert read_log(logZ1)[-1].endswith("second")
+
+    def test_log0_rotate_bytes_buffered_segment_size(self, tmp_path):
+        logZ = Log0(
+            dir0=tmp_path,
+            fn0="rot.jsonl",
+            write=True,
+            stream_lvl="CRITICAL",
+            format="jsonl",
+            rotate_bytes=10_000,
+            backup_count=3,
+            compress=False,
+        )
+        for idx in range(3000):
+            logZ.logger.debug("record %d", idx)
+        logZ.close()
+        paths = sorted(tmp_path.iterdir())
+        assert len(paths) == 4
+        assert all(path.stat().st_size <= 10_000 for path in paths)
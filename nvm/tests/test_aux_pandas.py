@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+import logging
+import pytest  # noqa: F401
+from nvm import nvm  # noqa: F401
+
+import numpy as np
+import pandas as pd
+
+from nvm.aux_pandas import fix_column_names
+from nvm.aux_pandas import optimize_df
+from nvm.aux_pandas import disp_df
+from nvm.aux_pandas import repr_df
+
+
+def fix_column_names_sequential(df0, lowercase=False):
+    """Former implementation (five passes, string columns only)."""
+    columns = df0.columns.str.strip()
+    columns = columns.map(lambda x: x.replace(" ", "_"))
+    columns = columns.map(lambda x: x.replace("-", "_"))
+    columns = columns.map(lambda x: x.replace(".", "_"))
+    if lowercase:
+        columns = columns.map(str.lower)
+    return columns.tolist()
+
+
+class TestAuxPandas:
+    @pytest.mark.parametrize("lowercase", [False, True])
+    def test_fix_column_names_same_as_sequential(self, lowercase):
+        columns = [" Word Count ", "noun-ratio", "x.y", "LIWC.a-b c", "ok"]
+        df0 = pd.DataFrame([range(len(columns))], columns=columns)
+        df1 = fix_column_names(df0, lowercase=lowercase)
+        assert df1.columns.tolist() == fix_column_names_sequential(df0, lowercase)
+        assert df0.columns.tolist() == columns
+        assert df1.values.tolist() == df0.values.tolist()
+
+    def test_fix_column_names_inplace(self):
+        df0 = pd.DataFrame(columns=["a b", "c"])
+        assert fix_column_names(df0, inplace=True) is df0
+        assert df0.columns.tolist() == ["a_b", "c"]
+
+    def test_fix_column_names_non_str_untouched(self):
+        df0 = pd.DataFrame(columns=["a b", 1, ("x y", 2)])
+        assert fix_column_names(df0).columns.tolist() == ["a_b", 1, ("x y", 2)]
+
+    def test_fix_column_names_mapping(self):
+        df0 = pd.DataFrame(columns=["a b", "c", "D-e"])
+        mapping = fix_column_names(df0, lowercase=True, return_mapping=True)
+        assert mapping == {"a b": "a_b", "D-e": "d_e"}
+        assert df0.rename(columns=mapping).columns.tolist() == ["a_b", "c", "d_e"]
+
+    def test_fix_column_names_collisions(self, caplog):
+        df0 = pd.DataFrame(columns=["a b", "a-b", "c"])
+        with pytest.raises(ValueError, match="collide"):
+            fix_column_names(df0, collisions="raise")
+        log0 = logging.getLogger("test_fix_column_names")
+        with caplog.at_level(logging.WARNING, logger=log0.name):
+            fix_column_names(df0, log0=log0)
+        assert "'a_b': ['a b', 'a-b']" in caplog.text
+        assert fix_column_names(df0, collisions="ignore").columns.tolist() == [
+            "a_b",
+            "a_b",
+            "c",
+        ]
+
+    def test_fix_column_names_wide(self):
+        columns = [f"feat.{idx} x-{idx % 7}" for idx in range(20_000)]
+        df0 = pd.DataFrame([range(len(columns))], columns=columns)
+        got = fix_column_names(df0, lowercase=True).columns.tolist()
+        assert got == fix_column_names_sequential(df0, lowercase=True)
+        assert fix_column_names(df0, lowercase=True).columns.tolist() == got
+
+    def test_optimize_df(self):
+        df0 = pd.DataFrame(
+            dict(
+                sub=["01", "01", "02", "02"] * 10,
+                word=[f"w{idx}" for idx in range(40)],
+                count=range(40),
+                delta=range(-20, 20),
+                big=[2**40] * 40,
+                ratio=[0.5] * 40,
+                flag=[True, False] * 20,
+            )
+        )
+        df1, df1_report = optimize_df(df0, report=True)
+        assert isinstance(df1["sub"].dtype, pd.CategoricalDtype)
+        assert not isinstance(df1["word"].dtype, pd.CategoricalDtype)
+        assert df1["count"].dtype == "int8"
+        assert df1["delta"].dtype == "int8"
+        assert df1["big"].dtype == "int64"
+        assert df1["ratio"].dtype == "float32"
+        assert df1["flag"].dtype == "bool"
+        assert df1.astype(df0.dtypes.to_dict()).equals(df0)
+        assert df0["count"].dtype == "int64"
+        assert df1_report.column.tolist() == df0.columns.tolist()
+        assert (df1_report.memory_after <= df1_report.memory_before).all()
+        assert df1_report.memory_after.sum() < df1_report.memory_before.sum()
+
+    def test_optimize_df_options(self):
+        df0 = pd.DataFrame(dict(a=[0.1, 0.2], b=[0.3, 0.4], c=[1, 2]))
+        df1 = optimize_df(df0, downcast_float=["b"], inplace=True)
+        assert df1 is df0
+        assert df0.dtypes.astype(str).tolist() == ["float64", "float32", "int8"]
+
+    def test_optimize_df_unsigned(self):
+        df0 = pd.DataFrame(
+            dict(n_words=[2, 5, 1], n_nouns=[3, 2, 3], u=np.array([1, 2, 3], "uint64"))
+        )
+        df1 = optimize_df(df0)
+        assert df1.dtypes.astype(str).tolist() == ["int8", "int8", "uint8"]
+        assert (df1.n_words - df1.n_nouns).tolist() == [-1, 3, -2]
+        df1 = optimize_df(df0, downcast_unsigned=True)
+        assert df1.dtypes.astype(str).tolist() == ["uint8", "uint8", "uint8"]
+
+    @pytest.mark.parametrize("n_total", [3, 8, 20_000])
+    def test_repr_df_csv(self, tmp_path, n_total):
+        df0 = pd.DataFrame(
+            dict(a=range(n_total), b=[f"x{idx}" for idx in range(n_total)])
+        )
+        path = tmp_path / "df0.csv"
+        df0.to_csv(path, index=False)
+        got = repr_df(path, n_rows=5, count_rows=True)
+        expected = pd.concat([df0.head(5), df0.iloc[5:].tail(5)])
+        assert got.startswith(f"{path}: {n_total} rows x 2 columns\n")
+        assert got.endswith(str(expected))
+
+    def test_repr_df_csv_tail_without_count(self, tmp_path):
+        df0 = pd.DataFrame(dict(a=range(50_000), b=0.5))
+        path = tmp_path / "df0.tsv"
+        df0.to_csv(path, index=False, sep="\t")
+        got = repr_df(str(path), n_rows=2)
+        assert got.startswith(f"{path}: ? rows x 2 columns\n")
+        tail = df0.tail(2).set_axis([-2, -1], axis=0)
+        assert got.endswith(str(pd.concat([df0.head(2), tail])))
+
+    def test_disp_df_chunks(self, tmp_path, capsys):
+        df0 = pd.DataFrame(dict(a=range(1000), b=1.5))
+        path = tmp_path / "df0.csv"
+        df0.to_csv(path, index=False)
+        disp_df(pd.read_csv(path, chunksize=7), n_rows=4)
+        out = capsys.readouterr().out
+        assert out.startswith("TextFileReader: 1000 rows x 2 columns\n")
+        assert out.endswith(str(pd.concat([df0.head(4), df0.tail(4)])) + "\n")
+        chunks = (df0.iloc[slice(idx, idx + 2)] for idx in range(0, 7, 2))
+        assert repr_df(chunks, n_rows=3).endswith(
+            str(df0.head(8).iloc[[0, 1, 2, 5, 6, 7]])
+        )
+
+    def test_repr_df_parquet(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        df0 = pd.DataFrame(dict(a=range(1000), b=1.5))
+        path = tmp_path / "df0.parquet"
+        df0.to_parquet(path, row_group_size=64)
+        got = repr_df(path, n_rows=3)
+        assert got.startswith(f"{path}: 1000 rows x 2 columns\n")
+        assert got.endswith(str(pd.concat([df0.head(3), df0.tail(3)])))
+
+    def test_repr_df_other_objects(self, capsys):
+        df0 = pd.DataFrame(dict(a=[1, 1, 2], b=[3, 4, 5]))
+        objs = [np.arange(3), [1, 2, 3], {"a": 1}, df0.groupby("a"), "no such file"]
+        for obj in objs:
+            assert repr_df(obj) == str(obj)
+            disp_df(obj)
+            assert capsys.readouterr().out == f"{obj}\n"
+        assert repr_df(df0) == str(df0)
@@ -11,6 +11,9 @@ from nvm.aux_spacy import (  # noqa: F401
     get_doc_sentences_as_list_component,
     get_doc_word_count_component,
     get_doc_basic_metrics_component,
+    set_clean_str_tokenizer,
+    get_clean_str_offsets,
+    doc_to_dataframe,
 )
 
 
@@ -177,3 +180,53 @@ class TestAuxSpacy:
 
         doc = nlp("One two thee four.")
         assert doc._.VB_count_without_be_and_have == 0
+
+    def test_set_clean_str_tokenizer(self):
+        nlp = spacy.blank("en")
+        set_clean_str_tokenizer(nlp)
+        raw = "  One\t\ttwo —\n three  "
+        docs = list(nlp.pipe([raw, raw]))
+        for doc in docs:
+            assert doc.text == "One two - three"
+            assert len(get_clean_str_offsets(doc)) == len(doc.text) + 1
+            assert [raw[tk._.raw_idx] for tk in doc] == ["O", "t", "—", "t"]
+            start, end = doc[1:4]._.raw_char_span
+            assert raw[start:end] == "two —\n three"
+
+    def test_set_clean_str_tokenizer_without_offsets(self):
+        nlp = spacy.blank("en")
+        set_clean_str_tokenizer(nlp, offsets=False)
+        doc = nlp("  One\t\ttwo  ")
+        assert doc.text == "One two"
+        assert get_clean_str_offsets(doc) is None
+        assert doc[1]._.raw_idx == doc[1].idx
+
+    def test_doc_to_dataframe(self):
+        Token.set_extension(
+            "is_nvm_test_x", getter=lambda token: token.text == "x", force=True
+        )
+        Token.set_extension("nvm_test_attr", default=0, force=True)
+
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        docs = list(nlp.pipe(["Hello x world. Again!", "", "x y"]))
+        docs[0][1]._.nvm_test_attr = 7
+
+        attrs = ["text", "lower_", "pos_", "is_alpha", "is_sent_start", "idx", "i"]
+        extensions = ["is_nvm_test_x", "nvm_test_attr"]
+        df0 = doc_to_dataframe(docs, attrs=attrs, extensions=extensions)
+        assert df0.columns.tolist() == ["doc"] + attrs + extensions
+        assert df0.doc.tolist() == [0] * 6 + [2] * 2
+        rows = [
+            [doc_idx]
+            + [getattr(token, attr) for attr in attrs]
+            + [getattr(token._, ext) for ext in extensions]
+            for doc_idx, doc in enumerate(docs)
+            for token in doc
+        ]
+        assert df0.values.tolist() == rows
+
+        df1 = doc_to_dataframe(docs[2])
+        assert df1.columns.tolist() == ["text", "lemma_", "pos_", "tag_"]
+        assert df1.text.tolist() == ["x", "y"]
+        assert doc_to_dataframe([]).shape == (0, 5)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+import json
+import pathlib
+import datetime
+import logging
+import pytest  # noqa: F401
+from nvm import nvm  # noqa: F401
+
+import numpy as np
+import pandas as pd
+
+from nvm.aux_srsly import jsonable
+from nvm.aux_srsly import yamlstr
+from nvm.aux_srsly import read_jsonl_stream
+from nvm.aux_srsly import read_msgpack_stream
+from nvm.aux_srsly import write_jsonl_stream
+from nvm.aux_srsly import write_msgpack_stream
+
+
+class MyArr(np.ndarray):
+    """NumPy array subclass defined outside of NumPy."""
+
+
+class MyFrame(pd.DataFrame):
+    """Data frame subclass defined outside of pandas."""
+
+
+class TestAuxSrsly:
+    def test_jsonable_same_as_json_round_trip(self):
+        dict0 = dict(
+            check="yes",
+            items=[1, 2.5, None, True, "a", ("b", "c")],
+            nested={1: {"x": [{}]}, None: [], 2.5: "f", False: 0},
+        )
+        assert jsonable(dict0) == json.loads(json.dumps(dict0))
+
+    def test_jsonable_native_conversions(self):
+        dict0 = dict(
+            arr=np.arange(3),
+            scalar=np.float32(1.5),
+            count=np.int64(7),
+            df=pd.DataFrame(dict(a=[1, 2], b=["x", "y"])),
+            ser=pd.Series([1.0, 2.0], index=["i", "j"]),
+            path=pathlib.Path("data") / "file.csv",
+            when=datetime.datetime(2023, 2, 1, 7, 8, 9),
+            day=datetime.date(2023, 2, 1),
+            tags={"b", "a"},
+        )
+        assert jsonable(dict0) == dict(
+            arr=[0, 1, 2],
+            scalar=1.5,
+            count=7,
+            df=dict(a=[1, 2], b=["x", "y"]),
+            ser=dict(i=1.0, j=2.0),
+            path="data/file.csv",
+            when="2023-02-01T07:08:09",
+            day="2023-02-01",
+            tags=["a", "b"],
+        )
+        assert type(jsonable(dict0)["count"]) is int
+
+    def test_jsonable_non_serializable(self):
+        dict0 = dict(obj=complex(1, 2))
+        assert jsonable(dict0) == dict(obj="(1+2j)")
+        assert jsonable(dict0, content=False) == dict(
+            obj="<<non-serializable: complex>>"
+        )
+
+    def test_jsonable_circular_reference(self):
+        list0 = []
+        list0.append(list0)
+        with pytest.raises(ValueError):
+            jsonable(dict(a=list0))
+
+    def test_yamlstr(self):
+        dict0 = dict(a=1, b=2, c=dict(d=4, e=np.int64(5)))
+        assert (
+            yamlstr(dict0)
+            == "got:\n     a: 1\n     b: 2\n     c:\n       d: 4\n       e: 5\n"
+        )
+
+    def test_yamlstr_lazy(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "nvm.aux_srsly.aux_srsly.json_serializable_or_repr",
+            lambda obj: calls.append(obj) or obj,
+        )
+        dict0 = dict(a=1, b=dict(c=2))
+        log0 = logging.getLogger("test_yamlstr_lazy")
+        log0.setLevel(logging.INFO)
+        log0.debug("%s", yamlstr.lazy(dict0))
+        assert calls == []
+        assert str(yamlstr.lazy(dict0, prefix="x:\n")) == yamlstr(dict0, prefix="x:\n")
+        assert len(calls) == 2
+
+    @pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz", ".jsonl.bz2"])
+    def test_jsonl_stream(self, tmp_path, suffix):
+        path = tmp_path / f"records{suffix}"
+        records = (dict(idx=idx, arr=np.arange(idx)) for idx in range(4))
+        assert write_jsonl_stream(path, records) == 4
+        assert write_jsonl_stream(path, [dict(idx=4)], append=True) == 1
+        got = list(read_jsonl_stream(path))
+        assert [record["idx"] for record in got] == [0, 1, 2, 3, 4]
+        assert got[3]["arr"] == [0, 1, 2]
+
+    def test_jsonl_stream_non_finite(self, tmp_path):
+        path = tmp_path / "scores.jsonl"
+        records = [dict(score=float("nan")), dict(score=np.inf), dict(score=-np.inf)]
+        assert write_jsonl_stream(path, records + [dict(score=0.5)]) == 4
+        got = [record["score"] for record in read_jsonl_stream(path)]
+        assert np.isnan(got[0]) and got[1:] == [np.inf, -np.inf, 0.5]
+
+    def test_jsonl_stream_skip_invalid(self, tmp_path):
+        path = tmp_path / "records.jsonl"
+        write_jsonl_stream(path, [dict(idx=0), dict(idx=1)])
+        with open(path, "a") as fh:
+            fh.write('{"idx": 2, "trunc')
+        with pytest.raises(ValueError):
+            list(read_jsonl_stream(path))
+        assert list(read_jsonl_stream(path, skip_invalid=True)) == [
+            dict(idx=0),
+            dict(idx=1),
+        ]
+
+    @pytest.mark.parametrize(
+        "suffix, use_mmap",
+        [(".msgpack", True), (".msgpack", False), (".msgpack.xz", True)],
+    )
+    def test_msgpack_stream(self, tmp_path, suffix, use_mmap):
+        path = tmp_path / f"records{suffix}"
+        records = (dict(idx=idx, when=datetime.date(2020, 1, 1)) for idx in range(3))
+        assert write_msgpack_stream(path, records) == 3
+        got = list(read_msgpack_stream(path, use_mmap=use_mmap))
+        assert got == [dict(idx=idx, when="2020-01-01") for idx in range(3)]
+
+    def test_msgpack_stream_empty(self, tmp_path):
+        path = tmp_path / "records.msgpack"
+        assert write_msgpack_stream(path, iter([])) == 0
+        assert list(read_msgpack_stream(path)) == []
+
+    def test_jsonable_limits(self):
+        dict0 = dict(
+            arr=np.arange(10**6),
+            small=np.arange(3),
+            text="x" * 100,
+            items=list(range(10)),
+            nested=dict(a=dict(b=dict(c=1))),
+            ser=pd.Series(np.linspace(0, 1, 21)),
+            df=pd.DataFrame(dict(a=range(20))),
+        )
+        got = jsonable(dict0, max_items=5, max_str_len=10, max_depth=3)
+        assert got["arr"] == dict(
+            shape=[10**6], dtype="int64", min=0, max=10**6 - 1, mean=499999.5
+        )
+        assert got["small"] == [0, 1, 2]
+        assert got["text"] == "xxxxxxxxxx... <100 chars>"
+        assert got["items"] == [0, 1, 2, 3, 4, "<5 more items>"]
+        assert got["nested"] == dict(a=dict(b="<dict with 1 items>"))
+        assert list(got) == ["arr", "small", "text", "items", "nested", "..."]
+        assert got["..."] == "<2 more items>"
+
+        got = jsonable(dict0, max_items=15)
+        assert got["ser"]["shape"] == [21] and got["ser"]["mean"] == 0.5
+        assert got["df"] == dict(shape=[20, 1], head=dict(a=list(range(15))))
+
+    def test_jsonable_limits_zero_dim_array(self):
+        obj = dict(a=np.array(3.0), b=[np.array("x" * 20)])
+        got = jsonable(obj, max_items=5, max_str_len=10, max_depth=2)
+        assert got == dict(a=3.0, b=["xxxxxxxxxx... <20 chars>"])
+        assert jsonable(np.array(5), max_items=0) == 5
+
+    def test_yamlstr_limits(self):
+        got = yamlstr(dict(text="y" * 50), limits=dict(max_str_len=5))
+        assert "yyyyy... <50 chars>" in got
+
+    def test_jsonable_subclasses_of_optional_types(self, monkeypatch):
+        from nvm.aux_srsly import aux_srsly
+
+        monkeypatch.setattr(
+            aux_srsly, "_JSONABLE_DISPATCH", dict(aux_srsly._JSONABLE_DISPATCH)
+        )
+        monkeypatch.setattr(
+            aux_srsly,
+            "_JSONABLE_OPTIONAL",
+            dict(
+                numpy=aux_srsly._register_numpy_converters,
+                pandas=aux_srsly._register_pandas_converters,
+            ),
+        )
+        monkeypatch.setattr(aux_srsly, "_JSONABLE_CONVERTERS", dict())
+        for dispatch_type in [np.generic, np.ndarray, pd.DataFrame, pd.Series]:
+            aux_srsly._JSONABLE_DISPATCH.pop(dispatch_type, None)
+
+        obj = dict(a=np.arange(3).view(MyArr), b=MyFrame(dict(c=[1, 2])))
+        assert jsonable(obj) == dict(a=[0, 1, 2], b=dict(c=[1, 2]))
+        assert jsonable(np.arange(3)) == [0, 1, 2]
+        assert jsonable(obj) == dict(a=[0, 1, 2], b=dict(c=[1, 2]))
+
+    def test_jsonable_zero_dim_array(self):
+        obj = dict(a=np.array(3.0), b=[np.array(5)], c=np.array("x"))
+        assert jsonable(np.array(5)) == 5
+        assert jsonable(obj) == dict(a=3.0, b=[5], c="x")
+        assert yamlstr(dict(a=np.array(5))) == "got:\n     a: 5\n"
@@ -6,12 +6,25 @@ from nvm import nvm  # noqa: F401
 
 from nvm.aux_str import clean_str
 from nvm.aux_str import CLEAN_STR_MAPPINGS_TINY
+from nvm.aux_str import CLEAN_STR_MAPPINGS_LARGE
+from nvm.aux_str import CLEAN_STR_MAPPINGS_HUGE
+from nvm.aux_str import compile_clean_str
+from nvm.aux_str import CleanStrCache
 from nvm.aux_str import REGEX_ABC_DASH_XYZ_ASTERISK as re0
 
 from nvm.aux_str import is_ascii
 from nvm.aux_str import is_ascii_alt
 
 
+def clean_str_sequential(text, mappings):
+    """Reference implementation of clean_str (one re.sub per rule)."""
+    for item in mappings:
+        for key, val in item.items():
+            for pattern in val:
+                text = re.sub(pattern, key, text)
+    return re.sub(r"\s\s+", " ", text).strip()
+
+
 class TestAuxStr:
     def test_clean_str_one(self):
         text_dirty = "  one two  three\t \n\n\r four...  "
@@ -69,3 +82,127 @@ class TestAuxStr:
         assert is_ascii_alt("abc 123")
         assert not is_ascii_alt("abc 123 ×")
         assert not is_ascii_alt("abc 123 ")
+
+    def test_compile_clean_str_same_as_clean_str(self):
+        texts = [
+            "  one two  three\t \n\n\r four...  ",
+            "ABCEFG",
+            "a–b — c d",
+        ]
+        for mappings in [
+            CLEAN_STR_MAPPINGS_TINY,
+            CLEAN_STR_MAPPINGS_LARGE,
+            [{"a": list("ABC"), "e": list("EFG")}],
+            [{"": [re.compile(r"[abc]", re.I)]}],
+        ]:
+            cleaner = compile_clean_str(mappings)
+            for text in texts:
+                assert cleaner(text) == clean_str(text, mappings=mappings)
+            assert cleaner.batch(texts) == [
+                clean_str(text, mappings=mappings) for text in texts
+            ]
+
+    def test_compile_clean_str_cache(self):
+        cleaner = compile_clean_str(cache=2, max_entry_len=10)
+        assert cleaner.batch(["N/A", " N/A", "N/A", "N/A "]) == ["N/A"] * 4
+        info = cleaner.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+        assert info.hit_rate == 0.25
+        assert cleaner("x" * 11 + "\t") == "x" * 11
+        assert cleaner.cache_info().skipped == 1
+        cleaner.cache_clear()
+        assert cleaner.cache_info().currsize == 0
+
+    def test_compile_clean_str_shared_cache(self):
+        cache = CleanStrCache()
+        cleaner0 = compile_clean_str([{"a": ["b"]}], cache=cache)
+        cleaner1 = compile_clean_str([{"c": ["b"]}], cache=cache)
+        assert cleaner0("b") == "a"
+        assert cleaner1("b") == "c"
+        assert cache.info().misses == 2
+
+    def test_compile_clean_str_offsets(self):
+        text = "  one\t\ttwo — three  "
+        spans = [(0, 3), (4, 7), (8, 9), (10, -1)]
+        cleaner = compile_clean_str(cache=True)
+        for _ in range(2):  # second round served from cache
+            clean, offsets = cleaner.clean_with_offsets(text)
+            assert clean == clean_str(text)
+            assert len(offsets) == len(clean) + 1
+            raw = [text[slice(offsets[a], offsets[b])] for a, b in spans]
+            assert raw == ["one", "two", "—", "three"]
+
+    def test_compile_clean_str_offsets_template(self):
+        mappings = [{r"<\1>": [re.compile(r"(\d+)")]}]
+        clean, offsets = compile_clean_str(mappings).clean_with_offsets("a 12 b")
+        assert clean == clean_str("a 12 b", mappings=mappings) == "a <12> b"
+        assert list(offsets) == [0, 1, 2, 2, 2, 2, 4, 5, 6]
+
+    def test_clean_str_mappings_huge(self):
+        text_dirty = "«Ｆｕｌｌ»\u200b\u202eﬁle\u2010name\u2009—\u00ad№\u00a01"
+        text_clean = clean_str(text_dirty, mappings=CLEAN_STR_MAPPINGS_HUGE)
+        assert text_clean == '"Full" file-name -No 1'
+        assert is_ascii(text_clean)
+
+    def test_clean_str_mappings_huge_same_as_sequential(self):
+        text_dirty = "  “x”\u2003y\t\uff3c ﬁ\u00a0&nbsp;\u2212z\u2028 ①½ "
+        assert clean_str(
+            text_dirty, mappings=CLEAN_STR_MAPPINGS_HUGE
+        ) == clean_str_sequential(text_dirty, CLEAN_STR_MAPPINGS_HUGE)
+
+    def test_compile_clean_str_merged_rules_same_as_sequential(self):
+        mappings = [
+            {"b": ["a"], "c": ["b"], "\\\\": ["c"]},
+            {"": [re.compile("x")]},
+            {"xy": ["d"], "z": ["x", "y"], "-": ["z", "—"]},
+        ]
+        text_dirty = "abcdxyz—\\"
+        text_clean = compile_clean_str(mappings)(text_dirty)
+        assert text_clean == clean_str_sequential(text_dirty, mappings)
+        assert text_clean == "\\\\\\" + "-----" + "\\"
+
+    def test_compile_clean_str_offsets_translate(self):
+        text = " ﬁle\u200b\u200dx "
+        clean, offsets = compile_clean_str(CLEAN_STR_MAPPINGS_HUGE).clean_with_offsets(
+            text
+        )
+        assert clean == "file x"
+        assert list(offsets) == [1, 1, 2, 3, 4, 6, 7]
+
+    def test_compile_clean_str_stats(self):
+        mappings = [{"a": ["A", "B"]}, {"-": ["—"]}, {"": ["Z"]}]
+        cleaner = compile_clean_str(mappings, stats=True)
+        texts = ["AAB — x", "A  b"]
+        assert cleaner.batch(texts) == [clean_str(t, mappings) for t in texts]
+        stats = cleaner.stats()
+        assert [row["pattern"] for row in stats] == ["A", "B", "—", "Z", r"\s\s+"]
+        assert [row["hits"] for row in stats] == [3, 1, 1, 0, 1]
+        assert [row["bytes_changed"] for row in stats] == [3, 1, 3, 0, 2]
+        assert stats[-1]["mapping"] is None
+        assert abs(sum(row["time_share"] for row in stats) - 1.0) < 1e-9
+        assert cleaner.used_mappings() == [{"a": ["A", "B"]}, {"-": ["—"]}]
+        cleaner.reset_stats()
+        assert all(row["hits"] == 0 for row in cleaner.stats())
+
+    def test_compile_clean_str_stats_disabled(self):
+        with pytest.raises(RuntimeError):
+            compile_clean_str().stats()
+
+    def test_clean_str_mappings_modified_in_place(self):
+        mappings = [{"X": ["a"]}]
+        assert clean_str("abc", mappings) == "Xbc"
+        mappings.append({"Z": ["c"]})
+        assert clean_str("abc", mappings) == "XbZ"
+        mappings[0]["X"].append("b")
+        assert clean_str("abc", mappings) == "XXZ"
+
+    def test_clean_str_builtin_mappings_not_compared(self, monkeypatch):
+        from nvm.aux_str import CLEAN_STR_MAPPINGS_LARGE
+        from nvm.aux_str import clean_str_compiled
+
+        text = "  one two  three\t \n\n\r four...  "
+        expected = clean_str(text, CLEAN_STR_MAPPINGS_LARGE)
+        entry = clean_str_compiled._RECENTLY_COMPILED[id(CLEAN_STR_MAPPINGS_LARGE)]
+        assert entry[1] is None
+        monkeypatch.setattr(clean_str_compiled, "CompiledCleanStr", None)
+        assert clean_str(text, CLEAN_STR_MAPPINGS_LARGE) == expected
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import subprocess
+import sys
+import pytest  # noqa: F401
+
+
+def run_python(code):
+    """Run code in a fresh interpreter (clean ``sys.modules``)."""
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+class TestImport:
+    def test_import_nvm_skips_heavy_modules(self):
+        code = (
+            "import sys, nvm; "
+            "print(sorted(m for m in ('sklearn', 'IPython') if m in sys.modules))"
+        )
+        assert run_python(code).strip() == "[]"
+
+    def test_wine_df_is_lazy(self):
+        code = (
+            "import sys; from nvm.aux_pandas import wine_df; "
+            "print(wine_df.shape, 'sklearn' in sys.modules)"
+        )
+        assert run_python(code).strip() == "(178, 14) True"
+
+    def test_disp_df_prints_outside_ipython(self, capsys):
+        import pandas as pd
+        from nvm.aux_pandas import disp_df, repr_df
+
+        df0 = pd.DataFrame(dict(a=[1, 2]))
+        disp_df(df0)
+        assert capsys.readouterr().out == repr_df(df0) + "\n"
+
+    def test_import_nvm_is_lazy(self):
+        code = (
+            "import sys, nvm; "
+            "print(sorted(m for m in ('spacy', 'pandas') if m in sys.modules))"
+        )
+        assert run_python(code).strip() == "[]"
+
+    def test_lazy_attributes(self):
+        import nvm
+        from nvm.aux_str import clean_str
+        from nvm.aux_srsly import jsonable
+
+        assert nvm.clean_str is clean_str
+        assert nvm.jsonable is jsonable
+        assert nvm.ddf is nvm.disp_df
+        assert "Log0" in dir(nvm)
+        with pytest.raises(AttributeError):
+            nvm.no_such_attribute
+
+    def test_spacy_factories_registered_on_first_touch(self):
+        code = (
+            "import nvm, sys; "
+            "print('spacy' in sys.modules); "
+            "nvm.aux_spacy; "
+            "from spacy.language import Language; "
+            "print(Language.has_factory('get_doc_word_count'))"
+        )
+        assert run_python(code).split() == ["False", "True"]
+
+    def test_import_nvm_spawns_no_subprocess(self):
+        code = (
+            "import sys\n"
+            "spawned = []\n"
+            "def hook(event, args):\n"
+            "    if event.startswith(('subprocess.', 'os.system', 'os.posix_spawn',"
+            " 'os.spawn', 'os.exec', 'os.fork')):\n"
+            "        spawned.append(event)\n"
+            "sys.addaudithook(hook)\n"
+            "import nvm\n"
+            "print(spawned)\n"
+        )
+        assert run_python(code).strip() == "[]"
+
+    def test_version_is_memoized(self):
+        code = (
+            "import nvm, nvm._version as v\n"
+            "get_versions, calls = v.get_versions, []\n"
+            "v.get_versions = lambda: calls.append(1) or get_versions()\n"
+            "assert nvm.__version__ == nvm.__version_dict__['version']\n"
+            "assert nvm.get_module_version() == nvm.__version__\n"
+            "print(len(calls))\n"
+        )
+        assert run_python(code).strip() == "1"
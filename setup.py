@@ -81,6 +81,19 @@ setup(
         "console_scripts": [
             "nvm=nvm.cli.nvm:main",
         ],
+        "spacy_factories": [
+            "get_doc_word_count="
+            "nvm.aux_spacy.factories.get_doc_word_count:get_doc_word_count_component",
+            "get_doc_basic_metrics="
+            "nvm.aux_spacy.factories.get_doc_basic_metrics:get_doc_basic_metrics_component",
+            "get_doc_count_of_dict_items="
+            "nvm.aux_spacy.factories.get_doc_count_of_dict_items:"
+            "get_doc_count_of_dict_items_component",
+            "get_doc_sentences_as_list="
+            "nvm.aux_spacy.factories.get_doc_sentences:get_doc_sentences_as_list_component",
+            "get_doc_summary_dict="
+            "nvm.aux_spacy.factories.get_doc_summary_dict:get_doc_summary_dict_component",
+        ],
     },
     install_requires=requirements,
     setup_requires=setup_requirements,